@@ -0,0 +1,99 @@
+"""
+Time the playtime analytics over a large synthetic session log: the initial
+load into columns, one dashboard's worth of statistics with numpy and with
+plain Python, and a cached re-open.
+
+Run with: python -m benchmarks.bench_analytics [--sessions N] [--games N]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, create_engine
+
+from gacha_hub.core.analytics import PlaytimeAnalytics, _load_numpy
+from gacha_hub.database.migrations import migrate
+from gacha_hub.database.models import Game, PlaySession
+
+# Games spread over a few reset timezones, so sessions are moved to local days
+_ZONES = ("UTC", "Asia/Shanghai", "America/New_York", "Europe/Berlin")
+
+
+def _populate(engine, sessions: int, games: int) -> datetime:
+    rng = random.Random(11)
+    now = datetime.utcnow().replace(microsecond=0)
+    with engine.begin() as connection:
+        connection.execute(
+            Game.__table__.insert(),
+            [{"name": f"Game {i}", "executable_path": f"game{i}.exe", "total_playtime": 0, "created_at": now,
+              "daily_reset_time": "04:00", "reset_timezone": _ZONES[i % len(_ZONES)]}
+             for i in range(games)],
+        )
+        batch = []
+        for i in range(sessions):
+            started = now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+            duration = rng.randint(60, 4 * 3600)
+            batch.append({"game_id": 1 + i % games, "started_at": started,
+                          "ended_at": started + timedelta(seconds=duration), "duration": duration})
+            if len(batch) == 50_000:
+                connection.execute(PlaySession.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(PlaySession.__table__.insert(), batch)
+    return now
+
+
+def _dashboard(analytics: PlaytimeAnalytics) -> None:
+    """The statistics one dashboard open asks for"""
+    analytics.totals_by_game()
+    analytics.share_by_game()
+    analytics.weekday_heatmap()
+    analytics.weekday_heatmap(game_id=1)
+    analytics.streaks()
+    analytics.streaks(game_id=1)
+    analytics.rolling_average(window=7, days=90)
+
+
+def run(sessions: int = 1_000_000, games: int = 50, repeats: int = 20) -> dict:
+    """Benchmark loading, computing and re-reading the analytics"""
+    backends = [False] + ([True] if _load_numpy() is not None else [])
+    result = {"sessions": sessions, "games": games}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'analytics.db'}")
+        migrate(engine)
+        _populate(engine, sessions, games)
+
+        with Session(engine) as session:
+            for use_numpy in backends:
+                name = "numpy" if use_numpy else "python"
+                analytics = PlaytimeAnalytics(session, use_numpy=use_numpy)
+                start = time.perf_counter()
+                analytics.refresh()
+                result[f"{name}_load_seconds"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                _dashboard(analytics)
+                result[f"{name}_dashboard_ms"] = (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    _dashboard(analytics)
+                result[f"{name}_cached_dashboard_ms"] = (time.perf_counter() - start) / repeats * 1000
+        engine.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--games", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sessions, args.games), indent=2))
+
+
+if __name__ == "__main__":
+    main()
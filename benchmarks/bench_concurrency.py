@@ -0,0 +1,108 @@
+"""
+Mixed concurrent reads and writes against the tuned engine (WAL, pooled
+sessions, BEGIN IMMEDIATE writers) and a plain default SQLite engine.
+
+Run with: python -m benchmarks.bench_concurrency [--readers N] [--writers N] [--seconds S]
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlmodel import create_engine
+
+from gacha_hub.core.sessions import SessionLog
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.engine import create_db_engine, create_session_factory, session_scope
+from gacha_hub.database.migrations import migrate
+from gacha_hub.database.models import Game
+
+
+def _plain_engine(db_path: Path):
+    """What the package used before: default journal, no pool tuning"""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    migrate(engine)
+    return engine
+
+
+def _measure(factory, games: int, readers: int, writers: int, seconds: float) -> dict:
+    with session_scope(factory) as session:
+        session.add_all(Game(name=f"Game {i}", executable_path=f"game{i}.exe") for i in range(games))
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def reader():
+        reads = 0
+        while time.monotonic() < deadline:
+            try:
+                with session_scope(factory) as session:
+                    SessionLog(session).get_weekly_playtime()
+                    StatsManager(session).get_overview(range(1, games + 1))
+                reads += 1
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+        with lock:
+            counts["reads"] += reads
+
+    def writer(index: int):
+        writes, own = 0, []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with session_scope(factory, write=True) as session:
+                    game_id = 1 + (index + writes) % games
+                    StatsManager(session).update_playtime(game_id, 5)
+                    ended = datetime.utcnow()
+                    SessionLog(session).record_session(game_id, ended - timedelta(minutes=5), ended)
+                writes += 1
+                own.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    counts["errors"] += 1
+        with lock:
+            counts["writes"] += writes
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return {
+        "reads_per_sec": counts["reads"] / seconds,
+        "writes_per_sec": counts["writes"] / seconds,
+        "errors": counts["errors"],
+        "write_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None,
+    }
+
+
+def run(readers: int = 4, writers: int = 2, seconds: float = 3.0, games: int = 50) -> dict:
+    """Benchmark both engines under the same mixed load"""
+    result = {"readers": readers, "writers": writers, "seconds": seconds}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (("plain", _plain_engine), ("tuned", create_db_engine)):
+            engine = make(Path(tmp) / f"{name}.db")
+            result[name] = _measure(create_session_factory(engine), games, readers, writers, seconds)
+            engine.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.readers, args.writers, args.seconds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
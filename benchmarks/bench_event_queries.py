@@ -0,0 +1,107 @@
+"""
+Time the active-event and daily-task queries on a large synthetic history,
+before and after the index migration.
+
+Run with: python -m benchmarks.bench_event_queries [--events N] [--games N]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.schema import CreateTable
+from sqlmodel import Session, SQLModel, create_engine
+
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.migrations import migrate
+from gacha_hub.database.models import DailyTask, Event, Game
+
+
+def _populate(engine, events: int, games: int, tasks_per_game: int) -> None:
+    """Create an unindexed schema and fill it with `events` events spread over years"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            connection.exec_driver_sql(str(CreateTable(table).compile(engine)))
+        connection.execute(
+            Game.__table__.insert(),
+            [{"name": f"Game {i}", "executable_path": f"game{i}.exe", "total_playtime": 0, "created_at": now}
+             for i in range(games)],
+        )
+        connection.execute(
+            DailyTask.__table__.insert(),
+            [{"game_id": 1 + i % games, "name": f"Task {i}", "completed": rng.random() < 0.5, "created_at": now}
+             for i in range(games * tasks_per_game)],
+        )
+        batch = []
+        for i in range(events):
+            # Most of the history ended long ago, a handful of events are live
+            start = now - timedelta(days=rng.uniform(-7, 5 * 365))
+            batch.append({
+                "game_id": 1 + i % games,
+                "name": f"Event {i}",
+                "start_date": start,
+                "end_date": start + timedelta(days=rng.uniform(1, 21)),
+                "created_at": now,
+            })
+            if len(batch) == 50_000:
+                connection.execute(Event.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(Event.__table__.insert(), batch)
+
+
+def _time_queries(engine, games: int, repeats: int) -> dict:
+    with Session(engine) as session:
+        stats = StatsManager(session)
+        start = time.perf_counter()
+        for i in range(repeats):
+            stats.get_active_events(1 + i % games)
+        events = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for i in range(repeats):
+            stats.get_daily_tasks(1 + i % games)
+        tasks = (time.perf_counter() - start) / repeats
+    return {"active_events_ms": events * 1000, "daily_tasks_ms": tasks * 1000}
+
+
+def run(events: int = 1_000_000, games: int = 50, tasks_per_game: int = 20, repeats: int = 20) -> dict:
+    """Benchmark the per-game queries with and without the migration's indexes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'events.db'}")
+        start = time.perf_counter()
+        _populate(engine, events, games, tasks_per_game)
+        populate = time.perf_counter() - start
+
+        before = _time_queries(engine, games, repeats)
+        start = time.perf_counter()
+        migrate(engine)
+        migration = time.perf_counter() - start
+        after = _time_queries(engine, games, repeats)
+        engine.dispose()
+
+    return {
+        "events": events,
+        "games": games,
+        "populate_seconds": populate,
+        "migration_seconds": migration,
+        "unindexed": before,
+        "indexed": after,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.events, args.games, repeats=args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
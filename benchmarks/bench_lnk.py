@@ -0,0 +1,59 @@
+"""
+Compare .lnk parses per second between gacha_hub.core.lnk and WScript.Shell.
+
+The COM column is only filled in on Windows with pywin32 installed.
+
+Run with: python -m benchmarks.bench_lnk [--repeats N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from gacha_hub.core.lnk import LnkError, parse_lnk, read_lnk
+
+CORPUS = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "lnk"
+
+
+def _rate(function, paths, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for path in paths:
+            function(path)
+    return repeats * len(paths) / (time.perf_counter() - start)
+
+
+def run(repeats: int = 2000, com_repeats: int = 50) -> dict:
+    """Benchmark native parsing from memory and from disk against COM"""
+    paths = []
+    for path in sorted(CORPUS.glob("*.lnk")):
+        try:
+            read_lnk(str(path))
+            paths.append(str(path))
+        except LnkError:
+            continue
+    contents = [Path(path).read_bytes() for path in paths]
+
+    result = {
+        "corpus_files": len(paths),
+        "native_in_memory_per_sec": _rate(parse_lnk, contents, repeats),
+        "native_from_disk_per_sec": _rate(read_lnk, paths, repeats),
+        "com_per_sec": None,
+    }
+    if sys.platform.startswith("win"):
+        from gacha_hub.core.shortcuts import _read_lnk_com
+        result["com_per_sec"] = _rate(_read_lnk_com, paths, com_repeats)
+        result["speedup_vs_com"] = result["native_from_disk_per_sec"] / result["com_per_sec"]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare building a hub overview with per-game lookups against the bulk
+StatsManager.get_overview query.
+
+Run with: python -m benchmarks.bench_overview [--games N]
+"""
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.migrations import migrate
+from gacha_hub.database.models import DailyTask, Event, Game
+
+
+def _populate(engine, games: int, tasks_per_game: int, events_per_game: int) -> None:
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(
+            Game.__table__.insert(),
+            [{"name": f"Game {i}", "executable_path": f"game{i}.exe", "total_playtime": 0, "created_at": now}
+             for i in range(games)],
+        )
+        connection.execute(
+            DailyTask.__table__.insert(),
+            [{"game_id": 1 + i % games, "name": f"Task {i}", "completed": False, "created_at": now}
+             for i in range(games * tasks_per_game)],
+        )
+        connection.execute(
+            Event.__table__.insert(),
+            [{"game_id": 1 + i % games, "name": f"Event {i}",
+              "start_date": now - timedelta(days=i % 60), "end_date": now + timedelta(days=14 - i % 60),
+              "created_at": now}
+             for i in range(games * events_per_game)],
+        )
+
+
+def _measure(engine, build) -> dict:
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with Session(engine) as session:
+            start = time.perf_counter()
+            build(StatsManager(session))
+            elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return {"queries": len(queries), "ms": elapsed * 1000}
+
+
+def run(games: int = 500, tasks_per_game: int = 10, events_per_game: int = 20) -> dict:
+    """Build the overview for `games` games both ways"""
+    game_ids = list(range(1, games + 1))
+
+    def per_game(stats):
+        return {
+            game_id: (stats.get_daily_tasks(game_id), stats.get_active_events(game_id))
+            for game_id in game_ids
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'overview.db'}")
+        migrate(engine)
+        _populate(engine, games, tasks_per_game, events_per_game)
+        result = {
+            "games": games,
+            "per_game": _measure(engine, per_game),
+            "bulk": _measure(engine, lambda stats: stats.get_overview(game_ids)),
+            "bulk_all_games": _measure(engine, lambda stats: stats.get_overview()),
+        }
+        engine.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.games), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare per-tick playtime commits with the PlaytimeBuffer write-behind path.
+
+Run with: python -m benchmarks.bench_playtime [--games N] [--ticks N]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from gacha_hub.core.stats import PlaytimeBuffer, StatsManager
+from gacha_hub.database.models import Game
+
+
+def _make_session(db_path: Path, games: int, commits: list) -> Session:
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(Game(name=f"Game {i}", executable_path=f"game{i}.exe") for i in range(games))
+    session.commit()
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    return session
+
+
+def run(games: int = 20, ticks: int = 50, max_pending: int = 256) -> dict:
+    """Time `ticks` heartbeats for `games` games with and without buffering"""
+    increments = games * ticks
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_commits: list = []
+        session = _make_session(Path(tmp) / "direct.db", games, direct_commits)
+        stats = StatsManager(session)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for game_id in range(1, games + 1):
+                stats.update_playtime(game_id, 5)
+        direct = time.perf_counter() - start
+        session.close()
+
+        buffered_commits: list = []
+        session = _make_session(Path(tmp) / "buffered.db", games, buffered_commits)
+        buffer = PlaytimeBuffer(session, max_pending=max_pending, flush_interval=3600)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for game_id in range(1, games + 1):
+                buffer.add(game_id, 5)
+        buffer.close()
+        buffered = time.perf_counter() - start
+        session.close()
+
+    return {
+        "increments": increments,
+        "direct": {"seconds": direct, "commits": len(direct_commits), "increments_per_sec": increments / direct},
+        "buffered": {"seconds": buffered, "commits": len(buffered_commits), "increments_per_sec": increments / buffered},
+        "speedup": direct / buffered,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--max-pending", type=int, default=256)
+    args = parser.parse_args()
+    print(json.dumps(run(args.games, args.ticks, args.max_pending), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare a game library held as dicts, the way the game list used to keep
+it, with the same library as GameRecords: retained memory measured with
+tracemalloc, and the time to serialize and read it back as JSON and as
+pickles (what the daemon's IPC sends).
+
+Run with: python -m benchmarks.bench_records [--games N]
+"""
+import argparse
+import gc
+import json
+import pickle
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from gacha_hub.core.records import GameRecord
+
+
+def _retained(build):
+    """Build a value under tracemalloc, returns it and the bytes it keeps allocated"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _ms(function, repeats: int) -> float:
+    """Best of `repeats` runs with the garbage collector off, as timeit does"""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def run(games: int = 50_000, repeats: int = 5) -> dict:
+    """Benchmark dict and GameRecord libraries of the same games"""
+    library = synthetic.make_games(games)
+    for game_id, game in enumerate(library, 1):
+        game["id"] = game_id
+    dict_json = json.dumps(library)
+    dicts, dict_bytes = _retained(lambda: json.loads(dict_json))
+    records, record_bytes = _retained(lambda: [GameRecord.from_dict(game) for game in json.loads(dict_json)])
+
+    row_json = json.dumps([record.to_row() for record in records])
+    dict_pickle = pickle.dumps(dicts, pickle.HIGHEST_PROTOCOL)
+    record_pickle = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+    return {
+        "games": games,
+        "dict_bytes_per_game": dict_bytes / games,
+        "record_bytes_per_game": record_bytes / games,
+        "memory_saved_ratio": 1 - record_bytes / dict_bytes,
+        "dict_json_dump_ms": _ms(lambda: json.dumps(dicts), repeats),
+        "record_json_dump_ms": _ms(lambda: json.dumps([record.to_row() for record in records]), repeats),
+        "dict_json_load_ms": _ms(lambda: json.loads(dict_json), repeats),
+        "record_json_load_ms": _ms(lambda: [GameRecord.from_row(row) for row in json.loads(row_json)], repeats),
+        "dict_json_bytes": len(dict_json),
+        "record_json_bytes": len(row_json),
+        "dict_pickle_bytes": len(dict_pickle),
+        "record_pickle_bytes": len(record_pickle),
+        "dict_unpickle_ms": _ms(lambda: pickle.loads(dict_pickle), repeats),
+        "record_unpickle_ms": _ms(lambda: pickle.loads(record_pickle), repeats),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.games, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare "hours this week per game" read from the WeeklyPlaytime rollup
+against aggregating the full PlaySession log, and time rollup maintenance.
+
+Run with: python -m benchmarks.bench_sessions [--sessions N] [--games N]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlmodel import Session, create_engine
+
+from gacha_hub.core.sessions import SessionLog, week_start
+from gacha_hub.database.migrations import migrate
+from gacha_hub.database.models import Game, PlaySession
+
+
+def _populate(engine, sessions: int, games: int) -> datetime:
+    rng = random.Random(7)
+    now = datetime.utcnow().replace(microsecond=0)
+    with engine.begin() as connection:
+        connection.execute(
+            Game.__table__.insert(),
+            [{"name": f"Game {i}", "executable_path": f"game{i}.exe", "total_playtime": 0, "created_at": now,
+              "daily_reset_time": "04:00", "reset_timezone": "UTC"}
+             for i in range(games)],
+        )
+        rows = []
+        for i in range(sessions):
+            started = now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+            duration = rng.randint(60, 4 * 3600)
+            rows.append({"game_id": 1 + i % games, "started_at": started,
+                         "ended_at": started + timedelta(seconds=duration), "duration": duration})
+        connection.execute(PlaySession.__table__.insert(), rows)
+    return now
+
+
+def run(sessions: int = 100_000, games: int = 50, repeats: int = 20, recorded: int = 500) -> dict:
+    """Benchmark rollup reads, rebuilds and incremental maintenance"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'sessions.db'}")
+        migrate(engine)
+        now = _populate(engine, sessions, games)
+
+        with Session(engine) as session:
+            log = SessionLog(session)
+            start = time.perf_counter()
+            log.rebuild_rollups()
+            rebuild = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                rollup = log.get_weekly_playtime(now.date())
+            rollup_ms = (time.perf_counter() - start) / repeats * 1000
+
+            # What the same question costs without rollups: sum the whole log
+            # per game (sessions are only clipped to the week by start time).
+            monday = datetime.combine(week_start(now.date()), datetime.min.time())
+            statement = (
+                select(PlaySession.game_id, func.sum(PlaySession.duration))
+                .where(PlaySession.started_at >= monday)
+                .group_by(PlaySession.game_id)
+            )
+            start = time.perf_counter()
+            for _ in range(repeats):
+                scanned = dict(session.execute(statement).all())
+            scan_ms = (time.perf_counter() - start) / repeats * 1000
+
+            start = time.perf_counter()
+            for i in range(recorded):
+                begin = now + timedelta(hours=i)
+                log.record_session(1 + i % games, begin, begin + timedelta(minutes=30))
+            record_per_sec = recorded / (time.perf_counter() - start)
+        engine.dispose()
+
+    return {
+        "sessions": sessions,
+        "games": games,
+        "rebuild_seconds": rebuild,
+        "weekly_from_rollup_ms": rollup_ms,
+        "weekly_from_log_ms": scan_ms,
+        "games_played_this_week": len(rollup),
+        "log_games_this_week": len(scanned),
+        "record_session_per_sec": record_per_sec,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--games", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sessions, args.games), indent=2))
+
+
+if __name__ == "__main__":
+    main()
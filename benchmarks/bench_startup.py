@@ -0,0 +1,102 @@
+"""
+Measure cold start: the imports needed before the main window can show,
+taken from python -X importtime, and the time until it is shown.
+
+The test suite runs this and fails when the import time goes over
+IMPORT_BUDGET_MS or a module in DEFERRED_MODULES is imported up front.
+
+Run with: python -m benchmarks.bench_startup [--repeats N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Cumulative import time of gacha_hub.main, in milliseconds
+IMPORT_BUDGET_MS = 600
+
+# Only needed once the window is up: loading the library, adding games, launching
+DEFERRED_MODULES = (
+    "sqlalchemy",
+    "sqlmodel",
+    "psutil",
+    "configparser",
+    "shlex",
+    "concurrent.futures",
+    "win32com",
+    "pythoncom",
+    "gacha_hub.core.shortcuts",
+    "gacha_hub.database.engine",
+    "gacha_hub.database.repository",
+)
+
+_SHOW_WINDOW = """
+import time
+start = time.perf_counter()
+import gacha_hub.main
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+window = gacha_hub.main.MainWindow(load=False)
+window.show()
+app.processEvents()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def measure_imports(module: str = "gacha_hub.main") -> dict:
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Returns:
+        dict: "total_ms" for the module and "modules" mapping every imported
+        module to (self_us, cumulative_us)
+    """
+    result = _python("-X", "importtime", "-c", f"import {module}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return {"total_ms": modules[module][1] / 1000, "modules": modules}
+
+
+def measure_first_show() -> float:
+    """Milliseconds from the first import until the main window has been shown"""
+    return float(_python("-c", _SHOW_WINDOW).stdout.strip().splitlines()[-1])
+
+
+def run(repeats: int = 5) -> dict:
+    """Benchmark startup imports and time to first show against the budget"""
+    imports = [measure_imports() for _ in range(repeats)]
+    modules = imports[-1]["modules"]
+    import_ms = statistics.median(result["total_ms"] for result in imports)
+    deferred = [name for name in DEFERRED_MODULES if name in modules]
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        "import_ms": import_ms,
+        "import_budget_ms": IMPORT_BUDGET_MS,
+        "first_show_ms": statistics.median(measure_first_show() for _ in range(repeats)),
+        "modules_imported": len(modules),
+        "slowest_self_ms": {name: self_us / 1000 for name, (self_us, _) in slowest},
+        "deferred_modules_imported": deferred,
+        "within_budget": import_ms <= IMPORT_BUDGET_MS and not deferred,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
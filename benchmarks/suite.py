@@ -0,0 +1,350 @@
+"""
+Run the benchmark suite over synthetic libraries and compare runs.
+
+Every case is timed at every scale on a library from benchmarks.synthetic,
+each timing being the median of --repeats runs. Results are written as
+JSON together with the commit and machine they came from, so a run on one
+commit can be checked against a run on another:
+
+    python -m benchmarks.suite run --output before.json
+    git checkout other-commit
+    python -m benchmarks.suite run --output after.json --compare before.json
+
+compare (also available on its own, python -m benchmarks.suite compare
+OLD NEW) lists every timing that got slower by more than --threshold and
+exits with status 1 if there is any.
+
+Run with: python -m benchmarks.suite run [--scales 100,1000,10000] [--cases PREFIX,...]
+    [--repeats N] [--output FILE] [--compare FILE] [--threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import synthetic
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SCALES = (100, 1_000, 10_000)
+
+# A timing is a regression when it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and slower by at least this many milliseconds, which keeps timer noise
+# on sub-millisecond cases out of the report
+MIN_REGRESSION_MS = 0.5
+
+# Games looked up one at a time in the per-game StatsManager cases
+SAMPLE_GAMES = 100
+
+SCHEMA_VERSION = 1
+
+
+class Library:
+    """A synthetic library on disk, built on first use of each part"""
+
+    def __init__(self, folder: Path, scale: int, seed: int, max_files: int):
+        self.folder = folder
+        self.scale = scale
+        self.seed = seed
+        self.max_files = max_files
+        self._games: Optional[List[dict]] = None
+        self._shortcuts: Optional[Path] = None
+        self._engine = None
+
+    @property
+    def games(self) -> List[dict]:
+        if self._games is None:
+            self._games = synthetic.make_games(self.scale, self.seed)
+        return self._games
+
+    @property
+    def shortcuts(self) -> Path:
+        if self._shortcuts is None:
+            self._shortcuts = self.folder / "shortcuts"
+            synthetic.write_shortcut_files(self._shortcuts, min(self.scale, self.max_files), self.seed)
+        return self._shortcuts
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from gacha_hub.database.engine import create_db_engine
+            self._engine = create_db_engine(self.folder / "hub.db")
+            synthetic.populate_database(self._engine, games=self.scale, rows=self.scale, seed=self.seed)
+        return self._engine
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+
+
+# Each case times one or more operations on a library and returns
+# {metric name: milliseconds}
+Case = Callable[[Library, int], Dict[str, float]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str):
+    def register(function: Case) -> Case:
+        CASES[name] = function
+        return function
+    return register
+
+
+def _median_ms(function: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+@case("persistence")
+def bench_persistence(library: Library, repeats: int) -> Dict[str, float]:
+    """Reading a legacy games.json of `scale` games, as the one-time import does"""
+    from gacha_hub.ui import persistence
+    path = library.folder / "games.json"
+    synthetic.write_games_json(path, library.games)
+    return {"load_games_ms": _median_ms(lambda: persistence.load_games(str(path)), repeats)}
+
+
+@case("shortcuts")
+def bench_shortcuts(library: Library, repeats: int) -> Dict[str, float]:
+    """Parsing the .url and .lnk files of a bulk import"""
+    from gacha_hub.core.shortcuts import collect_shortcuts, iter_shortcut_files, parse_url_file
+    folder = str(library.shortcuts)
+    urls = [path for path in iter_shortcut_files(folder) if path.endswith(".url")]
+    return {
+        "collect_shortcuts_ms": _median_ms(lambda: collect_shortcuts(folder), repeats),
+        "parse_url_file_ms": _median_ms(lambda: [parse_url_file(path) for path in urls], repeats),
+    }
+
+
+@case("icon_utils")
+def bench_icon_utils(library: Library, repeats: int) -> Dict[str, float]:
+    """extract_url_info over the library's .url files, skipped without PySide6"""
+    from gacha_hub.core.shortcuts import iter_shortcut_files
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtGui import QGuiApplication
+        from gacha_hub.ui.icon_utils import extract_url_info
+    except ImportError:
+        return {}
+    urls = [path for path in iter_shortcut_files(str(library.shortcuts)) if path.endswith(".url")]
+    app = QGuiApplication.instance() or QGuiApplication([])
+    return {"extract_url_info_ms": _median_ms(lambda: [extract_url_info(path, None, "") for path in urls], repeats)}
+
+
+@case("stats")
+def bench_stats(library: Library, repeats: int) -> Dict[str, float]:
+    """StatsManager's bulk and per-game queries, and a playtime write"""
+    from sqlmodel import Session
+    from gacha_hub.core.stats import StatsManager
+    sample = random.Random(library.seed).sample(range(1, library.scale + 1), min(SAMPLE_GAMES, library.scale))
+    with Session(library.engine) as session:
+        stats = StatsManager(session)
+        result = {
+            "get_overview_ms": _median_ms(stats.get_overview, repeats),
+            "get_daily_tasks_by_game_ms": _median_ms(stats.get_daily_tasks_by_game, repeats),
+            "get_active_events_by_game_ms": _median_ms(stats.get_active_events_by_game, repeats),
+            "get_daily_tasks_x100_ms": _median_ms(lambda: [stats.get_daily_tasks(game_id) for game_id in sample],
+                                                  repeats),
+            "get_active_events_x100_ms": _median_ms(lambda: [stats.get_active_events(game_id) for game_id in sample],
+                                                    repeats),
+            "update_playtime_x100_ms": _median_ms(lambda: [stats.update_playtime(game_id, 60) for game_id in sample],
+                                                  repeats),
+        }
+    return result
+
+
+@case("sessions")
+def bench_sessions(library: Library, repeats: int) -> Dict[str, float]:
+    """Session log rollup reads and a session write"""
+    from datetime import timedelta
+    from sqlmodel import Session
+    from gacha_hub.core.sessions import SessionLog
+    ended = datetime.utcnow()
+    with Session(library.engine) as session:
+        log = SessionLog(session)
+        return {
+            "get_weekly_playtime_ms": _median_ms(log.get_weekly_playtime, repeats),
+            "record_session_ms": _median_ms(
+                lambda: log.record_session(1, ended - timedelta(hours=30), ended), repeats),
+        }
+
+
+@case("tracker")
+def bench_tracker(library: Library, repeats: int) -> Dict[str, float]:
+    """GameTracker bookkeeping for `scale` processes (PIDs that do not exist)"""
+    from gacha_hub.core.tracker import GameTracker
+    # Above the Linux default pid_max, so none of these are running
+    pids = range(5_000_000, 5_000_000 + library.scale)
+    tracker = GameTracker()
+
+    def start_all():
+        for pid in pids:
+            tracker.start_tracking(pid, pid % 97)
+
+    def stop_all():
+        for pid in pids:
+            tracker.stop_tracking(pid)
+
+    start_ms = check_ms = stop_ms = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        start_all()
+        start_ms += time.perf_counter() - start
+        start = time.perf_counter()
+        for pid in pids:
+            tracker.is_process_running(pid)
+        check_ms += time.perf_counter() - start
+        start = time.perf_counter()
+        stop_all()
+        stop_ms += time.perf_counter() - start
+    return {
+        "start_tracking_ms": start_ms / repeats * 1000,
+        "is_process_running_ms": check_ms / repeats * 1000,
+        "stop_tracking_ms": stop_ms / repeats * 1000,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def machine_info() -> dict:
+    return {
+        "commit": _commit(),
+        "created": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(scales=DEFAULT_SCALES, cases: Optional[List[str]] = None, repeats: int = 5,
+        seed: int = synthetic.DEFAULT_SEED, max_files: int = synthetic.MAX_FILES) -> dict:
+    """
+    Time the selected cases at every scale.
+
+    Args:
+        scales: Library sizes to run at
+        cases: Name prefixes of the cases to run, None for all of them
+        repeats: Runs per timing, the median is reported
+
+    Returns:
+        dict: {"schema", "machine", "settings", "results": {case: {scale: {metric: ms}}}}
+    """
+    selected = [name for name in CASES if not cases or any(name.startswith(prefix) for prefix in cases)]
+    results: Dict[str, Dict[str, dict]] = {name: {} for name in selected}
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            library = Library(Path(tmp), scale, seed, max_files)
+            try:
+                for name in selected:
+                    try:
+                        results[name][str(scale)] = CASES[name](library, repeats)
+                    except Exception as e:
+                        # Recorded rather than raised, the other cases still run
+                        results[name][str(scale)] = {"error": repr(e)}
+            finally:
+                library.close()
+    return {
+        "schema": SCHEMA_VERSION,
+        "machine": machine_info(),
+        "settings": {"scales": list(scales), "repeats": repeats, "seed": seed, "max_files": max_files},
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Compare the timings two runs have in common.
+
+    Returns:
+        dict: "regressions" and "improvements", each a list of
+        {"case", "scale", "metric", "baseline_ms", "current_ms", "ratio"}
+    """
+    regressions, improvements = [], []
+    for name, by_scale in current["results"].items():
+        for scale, metrics in by_scale.items():
+            old_metrics = baseline["results"].get(name, {}).get(scale, {})
+            for metric, value in metrics.items():
+                old = old_metrics.get(metric)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or old <= 0:
+                    continue
+                entry = {"case": name, "scale": int(scale), "metric": metric,
+                         "baseline_ms": old, "current_ms": value, "ratio": value / old}
+                if value > old * (1 + threshold) and value - old >= MIN_REGRESSION_MS:
+                    regressions.append(entry)
+                elif value < old / (1 + threshold) and old - value >= MIN_REGRESSION_MS:
+                    improvements.append(entry)
+    return {
+        "baseline_commit": baseline.get("machine", {}).get("commit"),
+        "current_commit": current.get("machine", {}).get("commit"),
+        "threshold": threshold,
+        "regressions": regressions,
+        "improvements": improvements,
+    }
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the suite")
+    run_parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                            help="comma separated library sizes, up to 1000000")
+    run_parser.add_argument("--cases", help=f"comma separated case name prefixes, of {', '.join(CASES)}")
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    run_parser.add_argument("--max-files", type=int, default=synthetic.MAX_FILES)
+    run_parser.add_argument("--output", help="write the results to this file as well")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="results file to check for regressions against")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        scales = [int(scale) for scale in args.scales.split(",")]
+        cases = args.cases.split(",") if args.cases else None
+        current = run(scales, cases, args.repeats, args.seed, args.max_files)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+        if not args.compare:
+            print(json.dumps(current, indent=2))
+            return
+        baseline = _load(args.compare)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+    report = compare(baseline, current, args.threshold)
+    print(json.dumps(report, indent=2))
+    if report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Generate synthetic game libraries for the benchmarks.
+
+Everything is derived from a seed, so the same scale and seed give the same
+library on every machine and every commit. A library of scale N has N game
+list records (a mix of exe, shortcut and url games), N Event, DailyTask and
+PlaySession rows, and up to N .url and .lnk files to import.
+
+Run with: python -m benchmarks.synthetic OUT_DIR [--scale N] [--seed N] [--max-files N]
+"""
+import argparse
+import importlib.util
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GAME_TYPES = ("exe", "shortcut", "url")
+
+# The seed used when none is given
+DEFAULT_SEED = 1
+
+# Writing a million shortcut files measures the file system more than the
+# parsers, so by default only this many are written
+MAX_FILES = 10_000
+
+_BATCH = 50_000
+
+
+def _load_make_lnk():
+    """The .lnk builder that made the test corpus, tests/ is not a package"""
+    path = ROOT / "tests" / "fixtures" / "lnk" / "make_lnk.py"
+    spec = importlib.util.spec_from_file_location("make_lnk", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_games(count: int, seed: int = DEFAULT_SEED) -> List[dict]:
+    """
+    Game list records in the format of gacha_hub.core.shortcuts.
+
+    Returns:
+        list: `count` records with distinct unique_keys
+    """
+    rng = random.Random(seed)
+    games = []
+    for i in range(count):
+        game_type = GAME_TYPES[rng.randrange(len(GAME_TYPES))]
+        name = f"Game {i:07d}"
+        folder = f"C:\\Games\\{name}"
+        if game_type == "url":
+            url = f"https://play.example.com/{i}?server=os%20asia&lang=en"
+            games.append({"name": name, "path": f"{folder}.url", "icon_path": None, "type": "url",
+                          "launch_target": url, "unique_key": url, "exe": None, "args": None})
+        elif game_type == "shortcut":
+            exe, args = f"{folder}\\launcher.exe", f"--profile {rng.randrange(4)}"
+            games.append({"name": name, "path": f"{folder}.lnk", "icon_path": exe, "type": "shortcut",
+                          "launch_target": [exe, args], "unique_key": f"{exe} {args}", "exe": exe, "args": args})
+        else:
+            exe = f"{folder}\\{name}.exe"
+            games.append({"name": name, "path": exe, "icon_path": exe, "type": "exe",
+                          "launch_target": exe, "unique_key": exe, "exe": None, "args": None})
+    return games
+
+
+def write_games_json(path: Path, games: List[dict]) -> None:
+    """Write games the way the legacy games.json was written"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(games, f, ensure_ascii=False, indent=2)
+
+
+def write_shortcut_files(folder: Path, count: int, seed: int = DEFAULT_SEED) -> Dict[str, int]:
+    """
+    Write .url and .lnk files for a bulk import, spread over subfolders.
+
+    Returns:
+        dict: Number of files written per extension
+    """
+    make_lnk = _load_make_lnk()
+    rng = random.Random(seed)
+    written = {".url": 0, ".lnk": 0}
+    for i in range(count):
+        subfolder = folder / f"Group {i // 500:04d}"
+        subfolder.mkdir(parents=True, exist_ok=True)
+        if i % 2:
+            content = (
+                "[InternetShortcut]\n"
+                f"URL=https://play.example.com/{i}?server=os%20asia\n"
+                f"IconIndex={rng.randrange(3)}\n"
+            )
+            (subfolder / f"Game {i:07d}.url").write_text(content, encoding="utf-8")
+            written[".url"] += 1
+        else:
+            exe = f"C:\\Games\\Game {i:07d}\\launcher.exe"
+            data = make_lnk.build_lnk(local_path=exe, working_dir=f"C:\\Games\\Game {i:07d}",
+                                      arguments=f"--profile {rng.randrange(4)}", icon_location=exe)
+            (subfolder / f"Game {i:07d}.lnk").write_bytes(data)
+            written[".lnk"] += 1
+    return written
+
+
+def populate_database(engine, games: int, rows: int, seed: int = DEFAULT_SEED,
+                      now: Optional[datetime] = None) -> datetime:
+    """
+    Fill an empty, migrated database.
+
+    Args:
+        engine: Engine of the database
+        games: Game rows
+        rows: Rows each of Event, DailyTask and PlaySession, spread over the games
+        seed: Random seed
+        now: Naive UTC time the data is generated around
+
+    Returns:
+        datetime: now
+    """
+    from gacha_hub.database.models import DailyTask, Event, Game, PlaySession
+
+    rng = random.Random(seed)
+    now = now or datetime.utcnow().replace(microsecond=0)
+
+    def insert(connection, table, make_row, count):
+        for start in range(0, count, _BATCH):
+            connection.execute(table.insert(), [make_row(i) for i in range(start, min(count, start + _BATCH))])
+
+    def event(i):
+        start = now + timedelta(hours=rng.randint(-90 * 24, 30 * 24))
+        return {"game_id": 1 + i % games, "name": f"Event {i}", "start_date": start,
+                "end_date": start + timedelta(hours=rng.randint(1, 21 * 24)), "created_at": now}
+
+    def task(i):
+        completed = rng.random() < 0.3
+        return {"game_id": 1 + i % games, "name": f"Task {i}", "completed": completed,
+                "completed_at": now - timedelta(hours=rng.randint(0, 20)) if completed else None,
+                "created_at": now}
+
+    def play_session(i):
+        started = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+        duration = rng.randint(60, 4 * 3600)
+        return {"game_id": 1 + i % games, "started_at": started,
+                "ended_at": started + timedelta(seconds=duration), "duration": duration}
+
+    with engine.begin() as connection:
+        insert(connection, Game.__table__, lambda i: {
+            "name": f"Game {i:07d}", "executable_path": f"C:\\Games\\Game {i:07d}\\launcher.exe",
+            "total_playtime": rng.randint(0, 500 * 3600), "created_at": now,
+            "daily_reset_time": "04:00", "reset_timezone": "UTC",
+        }, games)
+        insert(connection, Event.__table__, event, rows)
+        insert(connection, DailyTask.__table__, task, rows)
+        insert(connection, PlaySession.__table__, play_session, rows)
+    return now
+
+
+def generate(out_dir: Path, scale: int, seed: int = DEFAULT_SEED, max_files: int = MAX_FILES) -> dict:
+    """Write a complete library of the given scale into out_dir"""
+    from gacha_hub.database.engine import create_db_engine
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    games = make_games(scale, seed)
+    write_games_json(out_dir / "games.json", games)
+    files = write_shortcut_files(out_dir / "shortcuts", min(scale, max_files), seed)
+    engine = create_db_engine(out_dir / "hub.db")
+    populate_database(engine, games=scale, rows=scale, seed=seed)
+    engine.dispose()
+    return {"scale": scale, "seed": seed, "games": len(games), "files": files, "rows_per_table": scale}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--scale", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--max-files", type=int, default=MAX_FILES)
+    args = parser.parse_args()
+    print(json.dumps(generate(args.out_dir, args.scale, args.seed, args.max_files), indent=2))
+
+
+if __name__ == "__main__":
+    main()
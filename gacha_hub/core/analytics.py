@@ -0,0 +1,373 @@
+import logging
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlmodel import Session
+from gacha_hub.core.daily_reset import load_timezone
+from gacha_hub.database.models import Game, PlaySession
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+# 1970-01-01 was a Thursday, this shifts day numbers so Monday is weekday 0
+_EPOCH_WEEKDAY = 3
+_EPOCH = date(1970, 1, 1)
+
+# Sessions newer than a given id, with the start as epoch seconds
+_LOAD_SQL = (
+    f"SELECT id, game_id, CAST(strftime('%s', started_at) AS INTEGER), duration "
+    f"FROM {PlaySession.__tablename__} WHERE id > ? ORDER BY id"
+)
+
+def _load_numpy():
+    """numpy if it is installed, it is an optional dependency ("analytics" extra)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def day_number(day: date) -> int:
+    """Days since 1970-01-01"""
+    return (day - _EPOCH).days
+
+def _utc_offset(tz, timestamp: int) -> int:
+    """Seconds a timezone is ahead of UTC at a moment given as epoch seconds"""
+    return int(datetime.fromtimestamp(timestamp, tz).utcoffset().total_seconds())
+
+def _day_offsets(tz, day: int) -> Tuple[int, int]:
+    """UTC offsets of a timezone at the first and last second of a UTC day, they differ on DST changes"""
+    return _utc_offset(tz, day * SECONDS_PER_DAY), _utc_offset(tz, day * SECONDS_PER_DAY + SECONDS_PER_DAY - 1)
+
+class Streaks(NamedTuple):
+    """Runs of consecutive days with at least one session"""
+    current: int  # ongoing run, 0 unless the last session was today or yesterday
+    longest: int
+    last_played: Optional[date]
+
+class SessionColumns:
+    """
+    The play session log as parallel typed arrays, one entry per session.
+
+    Start times are whole seconds since the epoch (UTC). The arrays hold
+    64 bit integers, so numpy can view them without copying.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.game_ids = array("q")
+        self.starts = array("q")
+        self.durations = array("q")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def last_id(self) -> int:
+        """Highest session id loaded, 0 when empty"""
+        return self.ids[-1] if self.ids else 0
+
+    def extend(self, rows: Iterable[Sequence[int]]) -> None:
+        """Append (id, game_id, start, duration) rows, ids must be increasing"""
+        rows = list(rows)
+        if not rows:
+            return
+        ids, game_ids, starts, durations = zip(*rows)
+        self.ids.extend(ids)
+        self.game_ids.extend(game_ids)
+        self.starts.extend(starts)
+        self.durations.extend(durations)
+
+    def clear(self) -> None:
+        for column in (self.ids, self.game_ids, self.starts, self.durations):
+            del column[:]
+
+class PlaytimeAnalytics:
+    """
+    Dashboard statistics computed over the whole play session log.
+
+    The log is append-only, so it is read into SessionColumns once and
+    afterwards only sessions with a higher id are fetched. Every statistic
+    is a single pass over the columns, vectorized with numpy when it is
+    installed and a plain loop otherwise. Results are cached until a new
+    session shows up, so opening the dashboard again costs one
+    SELECT max(id) and a read of the game timezones.
+
+    Sessions count towards the day and hour they started in, local to
+    their game's reset_timezone. Returned dicts and lists are shared with
+    the cache and must not be modified.
+    """
+
+    def __init__(self, session: Session, use_numpy: Optional[bool] = None, batch_size: int = 50_000):
+        """
+        Args:
+            session: Database session to read PlaySession rows from
+            use_numpy: Force the numpy (True) or pure Python (False) code,
+                defaults to numpy when it is installed
+            batch_size: Rows fetched per round trip while loading
+        """
+        self.session = session
+        self.batch_size = batch_size
+        self.columns = SessionColumns()
+        self.np = _load_numpy() if use_numpy is not False else None
+        if use_numpy and self.np is None:
+            raise ImportError("numpy is not installed")
+        self._results: Dict[tuple, object] = {}
+        self._zones: Dict[int, str] = {}  # game id -> reset timezone
+        # Session starts as seconds since the epoch on their game's local clock,
+        # converted up to the first len(self._local_starts) sessions
+        self._local_starts = array("q")
+
+    def refresh(self) -> int:
+        """
+        Load sessions recorded since the last call.
+
+        Returns:
+            int: Id of the latest session, the key the cached results belong to
+        """
+        latest = self.session.execute(select(func.max(PlaySession.id))).scalar() or 0
+        zones = dict(self.session.execute(select(Game.id, Game.reset_timezone)).all())
+        if zones != self._zones:
+            # A game moved to another timezone, its sessions fall on other days
+            self._zones = zones
+            del self._local_starts[:]
+            self._results.clear()
+        if latest == self.columns.last_id:
+            return latest
+        if latest < self.columns.last_id:
+            # The log was cleared or replaced, start over
+            self.columns.clear()
+            del self._local_starts[:]
+        self._results.clear()
+        # Straight from the sqlite3 cursor, SQLAlchemy's per-row processing
+        # more than doubled the time to load a million sessions
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.execute(_LOAD_SQL, (self.columns.last_id,))
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                self.columns.extend(rows)
+        finally:
+            cursor.close()
+        logger.debug("Loaded play sessions up to id %d (%d total)", latest, len(self.columns))
+        return latest
+
+    def totals_by_game(self) -> Dict[int, int]:
+        """Seconds played per game"""
+        return self._cached(("totals",), self._totals_by_game)
+
+    def share_by_game(self) -> Dict[int, float]:
+        """Fraction of all playtime per game, the values add up to 1"""
+        def compute():
+            totals = self.totals_by_game()
+            overall = sum(totals.values())
+            return {game_id: seconds / overall for game_id, seconds in totals.items()} if overall else {}
+        return self._cached(("share",), compute)
+
+    def weekday_heatmap(self, game_id: Optional[int] = None) -> List[List[int]]:
+        """
+        Seconds played per weekday and hour.
+
+        Args:
+            game_id: Only this game, defaults to all games
+
+        Returns:
+            list: 7 rows, Monday first, of 24 hourly totals
+        """
+        return self._cached(("heatmap", game_id), lambda: self._weekday_heatmap(game_id))
+
+    def streaks(self, game_id: Optional[int] = None, today: Optional[date] = None) -> Streaks:
+        """
+        Current and longest runs of days played.
+
+        Args:
+            game_id: Only this game, defaults to all games
+            today: Day the current streak is measured up to, defaults to today
+                in the game's timezone, or the local one for all games
+        """
+        today = today or self._today(game_id)
+        return self._cached(("streaks", game_id, today), lambda: self._streaks(game_id, today))
+
+    def rolling_average(self, window: int = 7, days: int = 30, game_id: Optional[int] = None,
+                        today: Optional[date] = None) -> List[Tuple[date, float]]:
+        """
+        Trailing average of seconds played per day.
+
+        Args:
+            window: Days averaged over, including the day itself
+            days: Number of days returned, ending today
+            game_id: Only this game, defaults to all games
+            today: Last day returned, defaults to today in the game's timezone,
+                or the local one for all games
+
+        Returns:
+            list: (day, average seconds per day) in date order
+        """
+        today = today or self._today(game_id)
+        key = ("rolling", window, days, game_id, today)
+        return self._cached(key, lambda: self._rolling_average(window, days, game_id, today))
+
+    def _cached(self, key: tuple, compute: Callable):
+        self.refresh()
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def _today(self, game_id: Optional[int]) -> date:
+        if game_id is None:
+            return date.today()
+        if game_id not in self._zones:
+            self.refresh()
+        return datetime.now(load_timezone(self._zones.get(game_id, "UTC"))).date()
+
+    def _local(self) -> array:
+        """Session starts on their game's local clock, converting sessions loaded since the last call"""
+        done = len(self._local_starts)
+        if done < len(self.columns):
+            if self.np is not None:
+                self._local_starts.frombytes(self._to_local_numpy(done).tobytes())
+            else:
+                self._local_starts.extend(self._to_local(done))
+        return self._local_starts
+
+    def _to_local(self, begin: int) -> Iterable[int]:
+        timezones: Dict[str, object] = {}
+        offsets: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        columns = self.columns
+        for game_id, start in zip(islice(columns.game_ids, begin, None), islice(columns.starts, begin, None)):
+            zone = self._zones.get(game_id, "UTC")
+            key = (zone, start // SECONDS_PER_DAY)
+            day = offsets.get(key)
+            if day is None:
+                if zone not in timezones:
+                    timezones[zone] = load_timezone(zone)
+                day = offsets[key] = _day_offsets(timezones[zone], key[1])
+            if day[0] == day[1]:
+                yield start + day[0]
+            else:
+                yield start + _utc_offset(timezones[zone], start)
+
+    def _to_local_numpy(self, begin: int):
+        np = self.np
+        game_ids = np.frombuffer(self.columns.game_ids, dtype=np.int64)[begin:]
+        starts = np.frombuffer(self.columns.starts, dtype=np.int64)[begin:]
+        local = starts.copy()
+        by_zone: Dict[str, List[int]] = {}
+        for game_id, zone in self._zones.items():
+            by_zone.setdefault(zone, []).append(game_id)
+        for zone, zone_game_ids in by_zone.items():
+            tz = load_timezone(zone)
+            if tz is timezone.utc or zone == "UTC":
+                continue
+            rows = np.flatnonzero(np.isin(game_ids, zone_game_ids))
+            days, inverse = np.unique(starts[rows] // SECONDS_PER_DAY, return_inverse=True)
+            first, last = np.array([_day_offsets(tz, day) for day in days.tolist()], dtype=np.int64).reshape(-1, 2).T
+            local[rows] += first[inverse]
+            # Sessions on a day the offset changed are looked up one by one
+            for row in rows[first[inverse] != last[inverse]].tolist():
+                local[row] = starts[row] + _utc_offset(tz, int(starts[row]))
+        return local
+
+    def _arrays(self, game_id: Optional[int]):
+        """numpy views of (game_ids, local starts, durations), filtered to one game if given"""
+        np = self.np
+        columns = self.columns
+        game_ids = np.frombuffer(columns.game_ids, dtype=np.int64)
+        starts = np.frombuffer(self._local(), dtype=np.int64)
+        durations = np.frombuffer(columns.durations, dtype=np.int64)
+        if game_id is not None:
+            mask = game_ids == game_id
+            return game_ids[mask], starts[mask], durations[mask]
+        return game_ids, starts, durations
+
+    def _rows(self, game_id: Optional[int]) -> Iterable[Tuple[int, int, int]]:
+        """(game_id, local start, duration) per session, filtered to one game if given"""
+        rows = zip(self.columns.game_ids, self._local(), self.columns.durations)
+        if game_id is None:
+            return rows
+        return (row for row in rows if row[0] == game_id)
+
+    def _totals_by_game(self) -> Dict[int, int]:
+        if not self.columns:
+            return {}
+        if self.np is not None:
+            np = self.np
+            game_ids = np.frombuffer(self.columns.game_ids, dtype=np.int64)
+            durations = np.frombuffer(self.columns.durations, dtype=np.int64)
+            unique_ids, inverse = np.unique(game_ids, return_inverse=True)
+            sums = np.bincount(inverse, weights=durations, minlength=len(unique_ids))
+            return dict(zip(unique_ids.tolist(), sums.astype(np.int64).tolist()))
+        totals: Dict[int, int] = {}
+        for game_id, duration in zip(self.columns.game_ids, self.columns.durations):
+            totals[game_id] = totals.get(game_id, 0) + duration
+        return dict(sorted(totals.items()))
+
+    def _weekday_heatmap(self, game_id: Optional[int]) -> List[List[int]]:
+        if self.np is not None:
+            np = self.np
+            _, starts, durations = self._arrays(game_id)
+            weekdays = (starts // SECONDS_PER_DAY + _EPOCH_WEEKDAY) % 7
+            hours = starts % SECONDS_PER_DAY // 3600
+            cells = np.bincount(weekdays * 24 + hours, weights=durations, minlength=7 * 24)
+            return cells.astype(np.int64).reshape(7, 24).tolist()
+        cells = [0] * (7 * 24)
+        for _, start, duration in self._rows(game_id):
+            weekday = (start // SECONDS_PER_DAY + _EPOCH_WEEKDAY) % 7
+            cells[weekday * 24 + start % SECONDS_PER_DAY // 3600] += duration
+        return [cells[row * 24:row * 24 + 24] for row in range(7)]
+
+    def _streaks(self, game_id: Optional[int], today: date) -> Streaks:
+        if self.np is not None:
+            np = self.np
+            _, starts, _ = self._arrays(game_id)
+            days = np.unique(starts // SECONDS_PER_DAY)
+            if not len(days):
+                return Streaks(0, 0, None)
+            # Positions where a run of consecutive days ends
+            ends = np.concatenate(([-1], np.flatnonzero(np.diff(days) != 1), [len(days) - 1]))
+            runs = np.diff(ends)
+            longest, last_run, last_day = int(runs.max()), int(runs[-1]), int(days[-1])
+        else:
+            days = sorted({start // SECONDS_PER_DAY for _, start, _ in self._rows(game_id)})
+            if not days:
+                return Streaks(0, 0, None)
+            longest = last_run = 1
+            for previous, day in zip(days, days[1:]):
+                last_run = last_run + 1 if day == previous + 1 else 1
+                longest = max(longest, last_run)
+            last_day = days[-1]
+        current = last_run if day_number(today) - last_day <= 1 else 0
+        return Streaks(current, longest, _EPOCH + timedelta(days=last_day))
+
+    def _rolling_average(self, window: int, days: int, game_id: Optional[int], today: date) -> List[Tuple[date, float]]:
+        if window < 1 or days < 1:
+            raise ValueError("window and days must be at least 1")
+        # Daily totals from the start of the first window to today
+        first = day_number(today) - (days - 1) - (window - 1)
+        span_days = days + window - 1
+        if self.np is not None:
+            np = self.np
+            _, starts, durations = self._arrays(game_id)
+            offsets = starts // SECONDS_PER_DAY - first
+            inside = (offsets >= 0) & (offsets < span_days)
+            daily = np.bincount(offsets[inside], weights=durations[inside], minlength=span_days)
+            cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+            averages = ((cumulative[window:] - cumulative[:-window]) / window).tolist()
+        else:
+            daily = [0] * span_days
+            for _, start, duration in self._rows(game_id):
+                offset = start // SECONDS_PER_DAY - first
+                if 0 <= offset < span_days:
+                    daily[offset] += duration
+            running = sum(daily[:window - 1])
+            averages = []
+            for i in range(window - 1, span_days):
+                running += daily[i]
+                averages.append(running / window)
+                running -= daily[i - window + 1]
+        start_day = _EPOCH + timedelta(days=first + window - 1)
+        return [(start_day + timedelta(days=i), average) for i, average in enumerate(averages)]
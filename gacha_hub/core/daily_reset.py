@@ -0,0 +1,172 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import case, or_, select
+from sqlmodel import Session
+from gacha_hub.database.models import Game, DailyTask
+
+logger = logging.getLogger(__name__)
+
+_RESET_TIME = re.compile(r"([01][0-9]|2[0-3]):([0-5][0-9])")
+
+# Each game in a reset UPDATE binds two parameters (IN list and CASE branch)
+RESET_CHUNK_SIZE = 300
+
+def parse_reset_time(reset_time: str) -> Tuple[int, int]:
+    """
+    Split a reset time into hour and minute.
+
+    Args:
+        reset_time: Local time as "HH:MM", 24-hour
+
+    Returns:
+        tuple: (hour, minute)
+
+    Raises:
+        ValueError: If reset_time is not a valid "HH:MM" time
+    """
+    match = _RESET_TIME.fullmatch(reset_time) if isinstance(reset_time, str) else None
+    if match is None:
+        raise ValueError(f"Invalid reset time {reset_time!r}, expected HH:MM")
+    return int(match.group(1)), int(match.group(2))
+
+def load_timezone(tz_name: str):
+    """
+    Look up a game's reset timezone.
+
+    Args:
+        tz_name: IANA timezone name
+
+    Returns:
+        tzinfo: The zone, UTC if the name is unknown
+    """
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        logger.warning("Unknown reset timezone %r, using UTC", tz_name)
+        return timezone.utc
+
+def reset_boundaries(reset_time: str, tz_name: str, now: datetime) -> Tuple[datetime, datetime]:
+    """
+    Get the daily reset boundaries around a moment.
+
+    Args:
+        reset_time: Local reset time as "HH:MM"
+        tz_name: IANA timezone name the reset time is in
+        now: Naive UTC datetime
+
+    Returns:
+        tuple: (last reset at or before now, next reset after now), both naive UTC
+
+    Raises:
+        ValueError: If reset_time is not a valid "HH:MM" time
+    """
+    tz = load_timezone(tz_name)
+    hour, minute = parse_reset_time(reset_time)
+    local_now = now.replace(tzinfo=timezone.utc).astimezone(tz)
+    last = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if last > local_now:
+        last -= timedelta(days=1)
+    # Day arithmetic on aware datetimes keeps the wall-clock time across DST changes
+    following = last + timedelta(days=1)
+    to_utc = lambda moment: moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return to_utc(last), to_utc(following)
+
+class DailyResetScheduler:
+    """
+    Roll over completed daily tasks when a game's server reset passes.
+
+    Nothing runs on a timer: apply() is called when tasks are read and only
+    touches games whose next reset boundary has passed since they were last
+    checked. All due games are reset with one set-based UPDATE that compares
+    completed_at against a per-game boundary, so the cost does not depend on
+    how many task rows there are.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._settings: Dict[int, Tuple[str, str]] = {}  # game_id -> (reset_time, timezone)
+        self._next_reset: Dict[int, datetime] = {}  # game_id -> next boundary, naive UTC
+
+    def invalidate(self, game_id: Optional[int] = None) -> None:
+        """Forget cached reset settings for one game, or all games"""
+        if game_id is None:
+            self._settings.clear()
+            self._next_reset.clear()
+        else:
+            self._settings.pop(game_id, None)
+            self._next_reset.pop(game_id, None)
+
+    def apply(self, game_ids: Optional[Iterable[int]] = None, now: Optional[datetime] = None) -> int:
+        """
+        Reset completed tasks whose game has passed its daily reset.
+
+        Args:
+            game_ids: Games about to be read, or None for every game
+            now: Naive UTC datetime, defaults to now
+
+        Returns:
+            int: Number of tasks reset
+        """
+        now = now or datetime.utcnow()
+        if game_ids is not None:
+            game_ids = list(game_ids)
+        self._load_settings(game_ids)
+        candidates = list(self._settings) if game_ids is None else game_ids
+
+        boundaries: Dict[int, datetime] = {}
+        for game_id in candidates:
+            next_reset = self._next_reset.get(game_id)
+            if game_id not in self._settings or (next_reset is not None and next_reset > now):
+                continue
+            reset_time, tz_name = self._settings[game_id]
+            try:
+                boundaries[game_id], self._next_reset[game_id] = reset_boundaries(reset_time, tz_name, now)
+            except ValueError as e:
+                logger.warning("Skipping daily reset of game %s: %s", game_id, e)
+                # Not retried until the settings change, see _load_settings
+                self._next_reset[game_id] = datetime.max
+        if not boundaries:
+            return 0
+
+        table = DailyTask.__table__
+        reset = 0
+        items = list(boundaries.items())
+        for start in range(0, len(items), RESET_CHUNK_SIZE):
+            chunk = dict(items[start:start + RESET_CHUNK_SIZE])
+            statement = (
+                table.update()
+                .where(
+                    table.c.completed.is_(True),
+                    table.c.game_id.in_(list(chunk)),
+                    or_(
+                        table.c.completed_at.is_(None),
+                        table.c.completed_at < case(chunk, value=table.c.game_id),
+                    ),
+                )
+                .values(completed=False, completed_at=None)
+            )
+            reset += self.session.execute(statement).rowcount
+        self.session.commit()
+        return reset
+
+    def _load_settings(self, game_ids: Optional[List[int]]) -> None:
+        """Fetch reset settings for games not cached yet"""
+        table = Game.__table__
+        statement = select(table.c.id, table.c.daily_reset_time, table.c.reset_timezone)
+        if game_ids is None:
+            # Reading every game's settings is O(games), not O(tasks)
+            statements = [statement]
+        else:
+            missing = [game_id for game_id in game_ids if game_id not in self._settings]
+            statements = [
+                statement.where(table.c.id.in_(missing[start:start + RESET_CHUNK_SIZE]))
+                for start in range(0, len(missing), RESET_CHUNK_SIZE)
+            ]
+        for chunk_statement in statements:
+            for game_id, reset_time, tz_name in self.session.execute(chunk_statement):
+                if self._settings.get(game_id) != (reset_time, tz_name):
+                    self._settings[game_id] = (reset_time, tz_name)
+                    self._next_reset.pop(game_id, None)
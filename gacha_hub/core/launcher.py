@@ -1,31 +1,94 @@
+import logging
+import os
+import shlex
 import subprocess
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from gacha_hub.core.metrics import span
+
+logger = logging.getLogger(__name__)
 
 class GameLauncher:
     @staticmethod
-    def launch_game(executable_path: str) -> Optional[subprocess.Popen]:
+    def popen_options() -> dict:
+        """
+        Platform specific Popen options that detach a game from the hub.
+
+        Windows games get their own console; elsewhere they start in a new
+        session so closing the hub's terminal doesn't take them down.
+        """
+        if sys.platform.startswith("win"):
+            return {"creationflags": subprocess.CREATE_NEW_CONSOLE}
+        return {"start_new_session": True}
+
+    @staticmethod
+    def launch_game(executable_path: str, args: Optional[List[str]] = None) -> Optional[subprocess.Popen]:
         """
         Launch a game executable and return the process object.
-        
+
         Args:
             executable_path: Path to the game executable
-            
+            args: Extra command line arguments
+
         Returns:
             subprocess.Popen object if successful, None if failed
         """
         try:
-            path = Path(executable_path)
-            if not path.exists():
-                raise FileNotFoundError(f"Game executable not found: {executable_path}")
-            
-            # Launch the game
-            process = subprocess.Popen(
-                [str(path)],
-                creationflags=subprocess.CREATE_NEW_CONSOLE
-            )
+            with span("launch"):
+                path = Path(executable_path)
+                if not executable_path or not path.is_file():
+                    raise FileNotFoundError(f"Game executable not found: {executable_path}")
+
+                # Launch the game
+                process = subprocess.Popen(
+                    [str(path)] + list(args or []),
+                    **GameLauncher.popen_options()
+                )
             return process
-            
+
         except Exception as e:
-            print(f"Error launching game: {e}")
-            return None 
\ No newline at end of file
+            logger.error("Error launching game: %s", e)
+            return None
+
+    @staticmethod
+    def launch_record(game: dict) -> Optional[subprocess.Popen]:
+        """
+        Launch a game list record (see GameRepository) by its type.
+
+        Args:
+            game: The game record
+
+        Returns:
+            subprocess.Popen for the started process, or None when the game
+            was handed to the shell (URLs and protocol shortcuts on Windows,
+            plain files opened with their default program)
+
+        Raises:
+            OSError: If the game could not be started
+        """
+        windows = sys.platform.startswith("win")
+        with span("launch"):
+            game_type = game.get("type")
+            if game_type == "url":
+                url = game["launch_target"]
+                if windows:
+                    os.startfile(url)
+                    return None
+                opener = "xdg-open" if sys.platform.startswith("linux") else "open"
+                return subprocess.Popen([opener, url], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, **GameLauncher.popen_options())
+            if game_type == "shortcut":
+                exe = game.get("exe")
+                if not exe:
+                    # Protocol shortcut, launch the .lnk file itself
+                    if not windows:
+                        raise FileNotFoundError(f"Shortcut has no target: {game.get('path')}")
+                    os.startfile(game["path"])
+                    return None
+                return subprocess.Popen([exe] + shlex.split(game.get("args") or ""), **GameLauncher.popen_options())
+            target = game.get("launch_target") or game.get("path")
+            if windows and game_type != "exe":
+                os.startfile(target)
+                return None
+            return subprocess.Popen([target], **GameLauncher.popen_options())
@@ -0,0 +1,211 @@
+import ntpath
+import os
+import struct
+from typing import NamedTuple, Optional, Tuple, Union
+
+# [MS-SHLLINK] ShellLinkHeader: size, CLSID, flags, attributes, three
+# FILETIMEs, file size, icon index, show command, hotkey and reserved fields
+_HEADER = struct.Struct("<I16sII8s8s8sIiIH10x")
+_HEADER_SIZE = 0x4C
+_LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 1 << 0
+HAS_LINK_INFO = 1 << 1
+HAS_NAME = 1 << 2
+HAS_RELATIVE_PATH = 1 << 3
+HAS_WORKING_DIR = 1 << 4
+HAS_ARGUMENTS = 1 << 5
+HAS_ICON_LOCATION = 1 << 6
+IS_UNICODE = 1 << 7
+FORCE_NO_LINK_INFO = 1 << 8
+HAS_EXP_STRING = 1 << 9
+HAS_EXP_ICON = 1 << 14
+
+# LinkInfoFlags
+_VOLUME_ID_AND_LOCAL_BASE_PATH = 1 << 0
+_COMMON_NETWORK_RELATIVE_LINK = 1 << 1
+
+# ExtraData blocks holding a path with environment variables, e.g. %ProgramFiles%
+_ENVIRONMENT_BLOCK = 0xA0000001
+_ICON_ENVIRONMENT_BLOCK = 0xA0000007
+
+# Non-Unicode strings are stored in the system code page
+ANSI_ENCODING = "mbcs" if os.name == "nt" else "cp1252"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class LnkError(ValueError):
+    """Raised for data that is not a well-formed shell link"""
+
+
+class ShellLink(NamedTuple):
+    target: str
+    arguments: str
+    icon_location: str
+    icon_index: int
+    working_dir: str
+    relative_path: str
+    description: str
+    flags: int
+
+
+def _u32(data: memoryview, offset: int) -> int:
+    if offset + 4 > len(data):
+        raise LnkError(f"Truncated shell link at offset {offset}")
+    return int.from_bytes(data[offset:offset + 4], "little")
+
+
+def _c_string(data: memoryview, offset: int, unicode: bool) -> str:
+    """Read a NUL-terminated string starting at offset"""
+    if offset >= len(data):
+        raise LnkError(f"String offset {offset} is outside the shell link")
+    raw = data[offset:].tobytes()
+    if unicode:
+        # The terminator has to start on a character boundary
+        end = raw.find(b"\0\0")
+        while end >= 0 and end % 2:
+            end = raw.find(b"\0\0", end + 1)
+        return raw[:end if end >= 0 else len(raw) & ~1].decode("utf-16-le", errors="replace")
+    end = raw.find(b"\0")
+    return raw[:end if end >= 0 else len(raw)].decode(ANSI_ENCODING, errors="replace")
+
+
+def _read_link_info(info: memoryview) -> str:
+    """Get the target path stored in a LinkInfo structure"""
+    header_size = _u32(info, 4)
+    flags = _u32(info, 8)
+    unicode = header_size >= 0x24
+    # Optional Unicode copies of both paths follow the ANSI offsets
+    suffix = ""
+    if unicode and _u32(info, 32):
+        suffix = _c_string(info, _u32(info, 32), True)
+    elif _u32(info, 24):
+        suffix = _c_string(info, _u32(info, 24), False)
+
+    if flags & _VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if unicode and _u32(info, 28):
+            return _c_string(info, _u32(info, 28), True) + suffix
+        return _c_string(info, _u32(info, 16), False) + suffix
+    if flags & _COMMON_NETWORK_RELATIVE_LINK:
+        network = info[_u32(info, 20):]
+        name_offset = _u32(network, 8)
+        if name_offset > 0x14:
+            share = _c_string(network, _u32(network, 20), True)
+        else:
+            share = _c_string(network, name_offset, False)
+        return share + "\\" + suffix if suffix else share
+    return ""
+
+
+def _read_string_data(data: memoryview, offset: int, unicode: bool) -> Tuple[str, int]:
+    """Read one counted StringData entry, returns the string and the next offset"""
+    if offset + 2 > len(data):
+        raise LnkError("Truncated string data")
+    count = int.from_bytes(data[offset:offset + 2], "little")
+    size = count * 2 if unicode else count
+    end = offset + 2 + size
+    if end > len(data):
+        raise LnkError("Truncated string data")
+    raw = data[offset + 2:end].tobytes()
+    return raw.decode("utf-16-le" if unicode else ANSI_ENCODING, errors="replace"), end
+
+
+def _read_environment_block(block: memoryview) -> str:
+    """Get the path from an EnvironmentVariableDataBlock or IconEnvironmentDataBlock"""
+    unicode_path = _c_string(block, 8 + 260, True) if len(block) >= 8 + 260 + 520 else ""
+    return unicode_path or _c_string(block, 8, False)
+
+
+def parse_lnk(data: Buffer) -> ShellLink:
+    """
+    Parse a shell link (.lnk) without COM.
+
+    Only the parts needed to launch the game are decoded: the target path
+    from LinkInfo (or its environment variable form), the argument, icon and
+    working directory strings. Environment variables in paths are expanded
+    for the current user, using Windows %VAR% syntax on every platform.
+    Targets that only exist as a shell item ID list, e.g. Store apps, come
+    back with an empty target.
+
+    Args:
+        data: The raw file contents
+
+    Returns:
+        ShellLink: The decoded fields
+
+    Raises:
+        LnkError: If the data is not a shell link or is truncated
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise LnkError("Too short for a shell link header")
+    header_size, clsid, flags, _, _, _, _, _, icon_index, _, _ = _HEADER.unpack_from(view)
+    if header_size != _HEADER_SIZE or clsid != _LINK_CLSID:
+        raise LnkError("Not a shell link")
+    unicode = bool(flags & IS_UNICODE)
+    offset = _HEADER.size
+
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        if offset + 2 > len(view):
+            raise LnkError("Truncated ID list")
+        offset += 2 + int.from_bytes(view[offset:offset + 2], "little")
+
+    target = ""
+    if flags & HAS_LINK_INFO:
+        info_size = _u32(view, offset)
+        if offset + info_size > len(view):
+            raise LnkError("Truncated link info")
+        if not flags & FORCE_NO_LINK_INFO:
+            target = _read_link_info(view[offset:offset + info_size])
+        offset += info_size
+
+    strings = {}
+    for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS, HAS_ICON_LOCATION):
+        if flags & flag:
+            strings[flag], offset = _read_string_data(view, offset, unicode)
+
+    icon_location = strings.get(HAS_ICON_LOCATION, "")
+    while offset + 8 <= len(view):
+        block_size = _u32(view, offset)
+        if block_size < 8 or offset + block_size > len(view):
+            break  # Terminal block
+        signature = _u32(view, offset + 4)
+        block = view[offset:offset + block_size]
+        if signature == _ENVIRONMENT_BLOCK and flags & HAS_EXP_STRING:
+            target = _read_environment_block(block) or target
+        elif signature == _ICON_ENVIRONMENT_BLOCK and flags & HAS_EXP_ICON:
+            icon_location = _read_environment_block(block) or icon_location
+        offset += block_size
+
+    return ShellLink(
+        target=ntpath.expandvars(target),
+        arguments=strings.get(HAS_ARGUMENTS, ""),
+        icon_location=ntpath.expandvars(icon_location),
+        icon_index=icon_index,
+        working_dir=ntpath.expandvars(strings.get(HAS_WORKING_DIR, "")),
+        relative_path=strings.get(HAS_RELATIVE_PATH, ""),
+        description=strings.get(HAS_NAME, ""),
+        flags=flags,
+    )
+
+
+def read_lnk(path: str) -> ShellLink:
+    """Read and parse a .lnk file, see parse_lnk()"""
+    with open(path, "rb") as f:
+        return parse_lnk(f.read())
+
+
+def resolve_target(link: ShellLink, lnk_path: str) -> Optional[str]:
+    """
+    Get the path a link points at, falling back to its relative path.
+
+    Returns:
+        str: The target, or None if it can only be resolved by the shell
+    """
+    if link.target:
+        return link.target
+    if link.relative_path:
+        return os.path.normpath(os.path.join(os.path.dirname(lnk_path), link.relative_path))
+    return None
@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+# Samples kept per span name; older ones are dropped
+DEFAULT_CAPACITY = 1024
+
+
+class SpanStats(NamedTuple):
+    """Summary of the recorded durations of one span, times in milliseconds"""
+    count: int
+    errors: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def _percentile(ordered: List[int], fraction: float) -> int:
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+
+class SpanRecorder:
+    """
+    In-process timing of named steps such as launching a game or saving.
+
+    Each span name keeps its last `capacity` durations, measured with
+    time.perf_counter_ns, in a ring buffer. Recording is a clock read and
+    a locked deque append, so it stays enabled in normal use; percentiles
+    are only computed when stats() is called. Safe to use from any thread.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.enabled = True
+        self._samples: Dict[str, Deque[int]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ns: int) -> None:
+        """Add one measured duration"""
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.capacity)
+            samples.append(duration_ns)
+
+    def record_error(self, name: str) -> None:
+        """Count a failed run of a span"""
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Time the body of a with block.
+
+        An exception leaving the block is counted as an error for the span
+        and re-raised; its duration is recorded either way.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException:
+            self.record_error(name)
+            raise
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording every call of a function, named after it by default"""
+        def decorate(function: Callable) -> Callable:
+            span_name = name or function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def stats(self, name: Optional[str] = None) -> Dict[str, SpanStats]:
+        """
+        Summarize the recorded spans.
+
+        Args:
+            name: Only this span, defaults to all of them
+
+        Returns:
+            dict: Span name -> SpanStats, spans without samples are left out
+        """
+        with self._lock:
+            names = [name] if name else sorted(self._samples)
+            snapshot = {span_name: list(self._samples.get(span_name, ())) for span_name in names}
+            errors = dict(self._errors)
+        result = {}
+        for span_name, samples in snapshot.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            to_ms = 1e-6
+            result[span_name] = SpanStats(
+                count=len(ordered),
+                errors=errors.get(span_name, 0),
+                mean=sum(ordered) / len(ordered) * to_ms,
+                p50=_percentile(ordered, 0.50) * to_ms,
+                p95=_percentile(ordered, 0.95) * to_ms,
+                p99=_percentile(ordered, 0.99) * to_ms,
+                max=ordered[-1] * to_ms,
+            )
+        return result
+
+    def report(self) -> str:
+        """Format stats() as a text table"""
+        lines = [f"{'span':<24} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for span_name, stats in self.stats().items():
+            lines.append(
+                f"{span_name:<24} {stats.count:>6} {stats.errors:>6} {stats.p50:>9.2f} "
+                f"{stats.p95:>9.2f} {stats.p99:>9.2f} {stats.max:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+
+# Shared recorder for the application
+recorder = SpanRecorder()
+span = recorder.span
+timed = recorder.timed
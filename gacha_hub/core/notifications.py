@@ -0,0 +1,232 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+from sqlmodel import Session, select
+from gacha_hub.database.models import Event
+
+logger = logging.getLogger(__name__)
+
+# Kinds of notices
+EVENT_STARTED = "started"
+EVENT_ENDING = "ending"  # warn_before ahead of the end
+EVENT_ENDED = "ended"
+
+# Longest single sleep of the scheduler thread, so a suspended machine or a
+# changed system clock is noticed within this many seconds
+MAX_SLEEP = 300.0
+
+class EventNotice(NamedTuple):
+    """An event boundary that has been reached"""
+    event_id: int
+    game_id: int
+    name: str
+    kind: str  # EVENT_STARTED, EVENT_ENDING or EVENT_ENDED
+    at: datetime  # when the boundary was due, naive UTC
+
+# Called as on_notice(notice) on the scheduler thread
+NoticeCallback = Callable[[EventNotice], None]
+
+class _Entry:
+    """One pending boundary in the heap, ordered by due time then insertion"""
+    __slots__ = ("when", "seq", "notice", "version")
+
+    def __init__(self, when: datetime, seq: int, notice: EventNotice, version: int):
+        self.when = when
+        self.seq = seq
+        self.notice = notice
+        self.version = version
+
+    def __lt__(self, other: "_Entry") -> bool:
+        if self.when != other.when:
+            return self.when < other.when
+        return self.seq < other.seq
+
+class EventScheduler:
+    """
+    Notify when events start, are about to end and end.
+
+    The upcoming boundaries of every event are kept in one min-heap, so
+    finding the next one is O(1) and taking a due one O(log n). The
+    scheduler thread sleeps until the earliest boundary rather than polling
+    the Event table. Adding or editing an event pushes its new boundaries
+    and marks the old ones stale by bumping the event's version; stale
+    entries are dropped as they surface, and the heap is rebuilt once they
+    make up more than half of it.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.utcnow,
+                 warn_before: Optional[timedelta] = timedelta(hours=24)):
+        """
+        Args:
+            clock: Returns the current naive UTC time
+            warn_before: How long before an event's end to send EVENT_ENDING,
+                None for no warning
+        """
+        self.clock = clock
+        self.warn_before = warn_before
+        self.wakeups = 0  # times the scheduler thread woke up
+        self._heap: List[_Entry] = []
+        self._versions: Dict[int, int] = {}  # event_id -> current version
+        self._pending: Dict[int, int] = {}  # event_id -> live entries in the heap
+        self._stale = 0
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.on_notice: Optional[NoticeCallback] = None
+
+    def load(self, session: Session) -> int:
+        """
+        Replace the schedule with every event that has not ended yet.
+
+        Returns:
+            int: Number of boundaries scheduled
+        """
+        now = self.clock()
+        # Plain rows rather than Event objects, which would all sit in the session
+        statement = select(Event.id, Event.game_id, Event.name, Event.start_date, Event.end_date)
+        events = session.exec(statement.where(Event.end_date > now)).all()
+        with self._cond:
+            self._heap = []
+            self._versions.clear()
+            self._pending.clear()
+            self._stale = 0
+            for event in events:
+                self._add_locked(event, now, push=self._heap.append)
+            heapq.heapify(self._heap)
+            self._cond.notify_all()
+            return len(self._heap)
+
+    def schedule(self, event: Event) -> None:
+        """Add a new event or take the changed dates of an edited one, O(log n)"""
+        now = self.clock()
+        with self._cond:
+            self._discard_locked(event.id)
+            self._add_locked(event, now, push=lambda entry: heapq.heappush(self._heap, entry))
+            self._cond.notify_all()
+
+    def unschedule(self, event_id: int) -> None:
+        """Drop a deleted event"""
+        with self._cond:
+            # The version is kept, SQLite may hand the id to a new event whose
+            # entries must not revive the deleted event's
+            self._discard_locked(event_id)
+
+    def __len__(self) -> int:
+        """Number of boundaries still to come"""
+        return len(self._heap) - self._stale
+
+    def next_due(self) -> Optional[datetime]:
+        """When the next boundary is due, or None if nothing is scheduled"""
+        with self._cond:
+            return self._next_due_locked()
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[EventNotice]:
+        """
+        Take every boundary due at or before now.
+
+        Each one is returned exactly once, in due order.
+        """
+        now = now or self.clock()
+        with self._cond:
+            return self._pop_due_locked(now)
+
+    def start(self, on_notice: NoticeCallback) -> None:
+        """Deliver notices to on_notice from a background thread"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self.on_notice = on_notice
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="EventScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._running = False
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _boundaries(self, event: Event):
+        yield event.start_date, EVENT_STARTED
+        if self.warn_before is not None:
+            warning = event.end_date - self.warn_before
+            if warning > event.start_date:
+                yield warning, EVENT_ENDING
+        yield event.end_date, EVENT_ENDED
+
+    def _add_locked(self, event: Event, now: datetime, push: Callable[[_Entry], None]) -> None:
+        version = self._versions.get(event.id, 0) + 1
+        self._versions[event.id] = version
+        count = 0
+        for when, kind in self._boundaries(event):
+            if when <= now:
+                continue
+            self._seq += 1
+            push(_Entry(when, self._seq, EventNotice(event.id, event.game_id, event.name, kind, when), version))
+            count += 1
+        if count:
+            self._pending[event.id] = count
+
+    def _discard_locked(self, event_id: int) -> None:
+        """Mark an event's queued entries stale, they are skipped when popped"""
+        self._stale += self._pending.pop(event_id, 0)
+        if event_id in self._versions:
+            self._versions[event_id] += 1
+        if self._stale > 64 and self._stale * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _is_live(self, entry: _Entry) -> bool:
+        return self._versions.get(entry.notice.event_id) == entry.version
+
+    def _drop_stale_top_locked(self) -> None:
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+            self._stale -= 1
+
+    def _next_due_locked(self) -> Optional[datetime]:
+        self._drop_stale_top_locked()
+        return self._heap[0].when if self._heap else None
+
+    def _pop_due_locked(self, now: datetime) -> List[EventNotice]:
+        due = []
+        heap = self._heap
+        while True:
+            self._drop_stale_top_locked()
+            if not heap or heap[0].when > now:
+                return due
+            entry = heapq.heappop(heap)
+            event_id = entry.notice.event_id
+            remaining = self._pending.get(event_id, 1) - 1
+            if remaining:
+                self._pending[event_id] = remaining
+            else:
+                self._pending.pop(event_id, None)
+            due.append(entry.notice)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                due = self._pop_due_locked(self.clock())
+                if not due:
+                    next_due = self._next_due_locked()
+                    timeout = MAX_SLEEP
+                    if next_due is not None:
+                        timeout = min(MAX_SLEEP, max(0.0, (next_due - self.clock()).total_seconds()))
+                    self._cond.wait(timeout)
+                    self.wakeups += 1
+                    continue
+            for notice in due:
+                try:
+                    self.on_notice(notice)
+                except Exception as e:
+                    logger.exception("Error in event notice callback: %s", e)
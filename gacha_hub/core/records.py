@@ -0,0 +1,167 @@
+from enum import Enum
+from typing import Any, Iterator, Mapping, Optional, Tuple, Union
+
+# Keys of a game record as used by the game list
+RECORD_FIELDS = ("name", "path", "icon_path", "type", "launch_target", "unique_key", "exe", "args")
+
+# Every slot of a GameRecord, in to_row() order
+ROW_FIELDS = ("id",) + RECORD_FIELDS
+_FIELD_SET = frozenset(ROW_FIELDS)
+
+class GameType(str, Enum):
+    """How a game is launched. A str, so it compares equal to the plain names and stores as them"""
+    EXE = "exe"  # an executable, run directly
+    SHORTCUT = "shortcut"  # a .lnk file, launch_target is (exe, args)
+    URL = "url"  # an internet shortcut, opened in the browser
+    FILE = "file"  # anything else, opened with its default program
+
+    @classmethod
+    def parse(cls, value: Union["GameType", str, None]) -> "GameType":
+        """
+        The type for a stored name, FILE for a missing one.
+
+        Raises:
+            ValueError: For an unknown name
+        """
+        if not value:
+            return cls.FILE
+        # A dict lookup, calling the Enum is several times slower
+        try:
+            return _TYPES[value]
+        except KeyError:
+            raise ValueError(f"Unknown game type: {value!r}") from None
+
+# Members hash like their names, so this finds a member by either
+_TYPES = {game_type.value: game_type for game_type in GameType}
+
+LaunchTarget = Union[str, Tuple[str, str], None]
+
+def _launch_target(game_type: GameType, value) -> LaunchTarget:
+    # JSON has no tuples, so shortcut targets come back from it as lists
+    if isinstance(value, (list, tuple)):
+        exe, args = (tuple(value) + ("", ""))[:2]
+        return (exe or "", args or "")
+    if game_type is GameType.SHORTCUT:
+        return (value or "", "")
+    return value
+
+class GameRecord:
+    """
+    One game of the library.
+
+    A slotted object rather than a dict: the field names live once on the
+    class instead of as a hash table in every record, the type is a shared
+    GameType member, and equal path, launch_target and unique_key strings
+    are kept as one object. For a large library that is a fraction of the
+    memory of dict records, see benchmarks/bench_records.py.
+
+    Records read like the dicts they replace, record["name"],
+    record.get("exe") and dict(record) all work, so code that takes game
+    dicts takes records too. to_row() and from_row() are the compact
+    serialized form, and are what pickling uses.
+    """
+    __slots__ = ROW_FIELDS
+
+    def __init__(self, name: str, path: Optional[str] = None, icon_path: Optional[str] = None,
+                 type: Union[GameType, str, None] = GameType.FILE, launch_target: LaunchTarget = None,
+                 unique_key: Optional[str] = None, exe: Optional[str] = None, args: Optional[str] = None,
+                 id: Optional[int] = None):
+        self.id = id
+        self.name = name
+        self.path = path
+        self.icon_path = icon_path
+        self.type = GameType.parse(type)
+        self.exe = exe
+        self.args = args
+        self._set_targets(launch_target, unique_key)
+
+    @classmethod
+    def from_dict(cls, game: Mapping[str, Any]) -> "GameRecord":
+        """Build a record from a game dict, such as an entry of games.json"""
+        get = game.get
+        return cls(get("name"), get("path"), get("icon_path"), get("type"), get("launch_target"),
+                   get("unique_key"), get("exe"), get("args"), get("id"))
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "GameRecord":
+        """Inverse of to_row(), also for rows that went through JSON"""
+        # Rows come from to_row(), so __init__'s normalizing is skipped
+        # apart from what JSON undoes
+        record = object.__new__(cls)
+        (record.id, record.name, record.path, record.icon_path, game_type, launch_target,
+         unique_key, record.exe, record.args) = row
+        record.type = GameType.parse(game_type)
+        if launch_target.__class__ is list:
+            launch_target = tuple(launch_target)
+        elif launch_target == record.path:
+            launch_target = record.path
+        record.launch_target = launch_target
+        record.unique_key = launch_target if unique_key == launch_target else unique_key
+        return record
+
+    def to_row(self) -> tuple:
+        """The fields as a tuple in ROW_FIELDS order, with the type as its plain name"""
+        return (self.id, self.name, self.path, self.icon_path, self.type.value, self.launch_target,
+                self.unique_key, self.exe, self.args)
+
+    def to_dict(self) -> dict:
+        """A plain dict with the type as its name, e.g. for json.dump"""
+        return dict(zip(ROW_FIELDS, self.to_row()))
+
+    def update(self, changes: Mapping[str, Any]) -> None:
+        """
+        Change fields in place, like dict.update.
+
+        Raises:
+            KeyError: For a name that is not a field
+        """
+        unknown = set(changes) - _FIELD_SET
+        if unknown:
+            raise KeyError(f"Not game record fields: {sorted(unknown)}")
+        for field, value in changes.items():
+            if field not in ("type", "launch_target", "unique_key"):
+                setattr(self, field, value)
+        if "type" in changes:
+            self.type = GameType.parse(changes["type"])
+        self._set_targets(changes.get("launch_target", self.launch_target),
+                          changes.get("unique_key", self.unique_key))
+
+    def _set_targets(self, launch_target: LaunchTarget, unique_key: Optional[str]) -> None:
+        launch_target = _launch_target(self.type, launch_target)
+        # Often all the same string, e.g. an exe's path
+        if launch_target == self.path:
+            launch_target = self.path
+        if unique_key == launch_target:
+            unique_key = launch_target
+        self.launch_target = launch_target
+        self.unique_key = unique_key
+
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return ROW_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ROW_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    __hash__ = None  # mutable
+
+    def __reduce__(self):
+        return (GameRecord.from_row, (self.to_row(),))
+
+    def __repr__(self) -> str:
+        return f"GameRecord(id={self.id!r}, name={self.name!r}, type={self.type.value!r})"
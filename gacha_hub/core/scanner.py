@@ -0,0 +1,161 @@
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from gacha_hub.core.metrics import span
+from gacha_hub.core.watcher import ProcessWatcher
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two scans
+DEFAULT_SCAN_INTERVAL = 5.0
+
+
+def normalize_exe_path(path: str) -> str:
+    """Normalize an executable path so library paths and process paths compare equal"""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def game_executables(game: dict) -> List[str]:
+    """
+    Executable paths a running game record can be recognized by.
+
+    Shortcuts are matched on their target exe, exe games on their launch
+    target. URLs and protocol shortcuts have no executable of their own.
+    """
+    game_type = game.get("type")
+    if game_type == "url":
+        return []
+    paths = [game.get("exe")]
+    launch_target = game.get("launch_target")
+    if isinstance(launch_target, str):
+        paths.append(launch_target)
+    if game_type == "exe":
+        paths.append(game.get("path"))
+    return [path for path in paths if path]
+
+
+def build_lookup(games: Iterable[dict]) -> Dict[str, int]:
+    """
+    Map normalized executable paths to game ids.
+
+    Symlinks in library paths are resolved here, once, because the paths
+    the OS reports for running processes are already resolved.
+    """
+    lookup: Dict[str, int] = {}
+    for game in games:
+        for path in game_executables(game):
+            for variant in {normalize_exe_path(path), normalize_exe_path(os.path.realpath(path))}:
+                lookup.setdefault(variant, game["id"])
+    return lookup
+
+
+class ProcessScanner:
+    """
+    Find library games that were started outside the hub.
+
+    Games started from Steam, a desktop shortcut or a launcher that re-execs
+    a child are not launched by us, so only their executable path gives them
+    away. Each scan lists processes with psutil.process_iter, which reuses
+    its cached Process objects for PIDs it has seen before, and compares
+    them with the previous scan. Only processes that are new since then
+    have their exe read and looked up in a table built by set_games(), so a
+    scan costs O(new processes) lookups instead of O(processes x games).
+
+    Matches are handed to the ProcessWatcher, which reports their exit like
+    that of a launched game. A game that already has a tracked process is
+    not tracked a second time.
+    """
+
+    def __init__(self, watcher: ProcessWatcher, games: Iterable[dict] = (),
+                 interval: float = DEFAULT_SCAN_INTERVAL):
+        self.watcher = watcher
+        self.interval = interval
+        self.last_new_count = 0  # processes inspected by the last scan
+        self._lookup = build_lookup(games)
+        self._snapshot: Dict[int, psutil.Process] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_games(self, games: Iterable[dict]) -> None:
+        """
+        Replace the games to look for.
+
+        The next scan inspects every process again, so a game that was
+        already running when it was added to the library is found too.
+        """
+        lookup = build_lookup(games)
+        # Swapped in one assignment, the scan thread only ever reads them
+        self._lookup = lookup
+        self._snapshot = {}
+
+    def scan(self) -> List[Tuple[int, int]]:
+        """
+        Look for newly started games once.
+
+        Returns:
+            list: (process_id, game_id) for every process that is now being watched
+        """
+        with span("scanner.scan"):
+            previous = self._snapshot
+            snapshot: Dict[int, psutil.Process] = {}
+            new = []
+            for process in psutil.process_iter():
+                snapshot[process.pid] = process
+                if previous.get(process.pid) is not process:
+                    new.append(process)
+            self._snapshot = snapshot
+            self.last_new_count = len(new)
+
+            lookup = self._lookup
+            if not lookup or not new:
+                return []
+            tracked = self.watcher.tracker.tracked_processes
+            running_games = {info['game_id'] for info in list(tracked.values())}
+            matches = []
+            for process in new:
+                if process.pid in tracked:
+                    continue
+                try:
+                    exe = process.exe()
+                except psutil.Error:
+                    continue
+                if not exe:
+                    continue
+                game_id = lookup.get(normalize_exe_path(exe))
+                if game_id is None or game_id in running_games:
+                    continue
+                if self.watcher.watch(process.pid, game_id):
+                    running_games.add(game_id)
+                    matches.append((process.pid, game_id))
+                    logger.info("Found running game %d (process %d, %s)", game_id, process.pid, exe)
+            return matches
+
+    def start(self) -> None:
+        """Scan now and then every `interval` seconds on a background thread"""
+        if self._thread is not None:
+            return
+        self.watcher.start()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ProcessScanner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scanning. Games found so far stay watched."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.scan()
+            except Exception as e:
+                logger.exception("Process scan failed: %s", e)
+            if self._stop_event.wait(self.interval):
+                return
@@ -0,0 +1,184 @@
+import argparse
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session
+from gacha_hub.database.models import DailyPlaytime, PlaySession, WeeklyPlaytime
+
+logger = logging.getLogger(__name__)
+
+def week_start(day: date) -> date:
+    """Get the Monday starting the week a day falls in"""
+    return day - timedelta(days=day.weekday())
+
+def split_by_day(started_at: datetime, ended_at: datetime) -> Iterator[Tuple[date, int]]:
+    """
+    Split a session into the seconds played on each UTC day.
+
+    Args:
+        started_at: Session start, naive UTC
+        ended_at: Session end, naive UTC
+
+    Yields:
+        tuple: (day, seconds played that day). The seconds add up to the
+        session's whole-second duration, the last day takes what
+        truncating the others left over.
+    """
+    remaining = int((ended_at - started_at).total_seconds())
+    current = started_at
+    while current < ended_at:
+        next_midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
+        if next_midnight >= ended_at:
+            yield current.date(), remaining
+            return
+        seconds = int((next_midnight - current).total_seconds())
+        remaining -= seconds
+        yield current.date(), seconds
+        current = next_midnight
+
+class SessionLog:
+    """
+    Append-only log of play sessions with incrementally maintained rollups.
+
+    Every recorded session also adds its seconds to DailyPlaytime and
+    WeeklyPlaytime in the same transaction, so per-day and per-week totals
+    are read straight from the rollups rather than summed over the log.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def record_session(self, game_id: int, started_at: datetime, ended_at: datetime) -> Optional[PlaySession]:
+        """
+        Append a finished session and update the rollups.
+
+        Matches GameTracker's on_session_end callback signature.
+
+        Args:
+            game_id: The game ID that was played
+            started_at: Session start, naive UTC
+            ended_at: Session end, naive UTC
+
+        Returns:
+            PlaySession: The stored session, or None if failed
+        """
+        try:
+            if ended_at < started_at:
+                raise ValueError(f"Session ends before it starts: {started_at} > {ended_at}")
+            play_session = PlaySession(
+                game_id=game_id,
+                started_at=started_at,
+                ended_at=ended_at,
+                duration=int((ended_at - started_at).total_seconds()),
+            )
+            self.session.add(play_session)
+            daily: Dict[Tuple[int, date], int] = defaultdict(int)
+            weekly: Dict[Tuple[int, date], int] = defaultdict(int)
+            for day, seconds in split_by_day(started_at, ended_at):
+                daily[game_id, day] += seconds
+                weekly[game_id, week_start(day)] += seconds
+            self._add_to_rollups(daily, weekly)
+            self.session.commit()
+            return play_session
+
+        except Exception as e:
+            logger.error("Error recording play session: %s", e)
+            self.session.rollback()
+            return None
+
+    def get_daily_playtime(self, day: date) -> Dict[int, int]:
+        """Get seconds played per game on a UTC day"""
+        statement = select(DailyPlaytime.game_id, DailyPlaytime.seconds).where(DailyPlaytime.day == day)
+        return dict(self.session.execute(statement).all())
+
+    def get_weekly_playtime(self, day: Optional[date] = None) -> Dict[int, int]:
+        """
+        Get seconds played per game in a week.
+
+        Args:
+            day: Any day in the week, defaults to today (UTC)
+
+        Returns:
+            dict: game_id -> seconds, only games played that week
+        """
+        start = week_start(day or datetime.utcnow().date())
+        statement = select(WeeklyPlaytime.game_id, WeeklyPlaytime.seconds).where(WeeklyPlaytime.week_start == start)
+        return dict(self.session.execute(statement).all())
+
+    def get_sessions(self, game_id: int, since: Optional[datetime] = None) -> List[PlaySession]:
+        """Get a game's sessions in start order, optionally only those started since a moment"""
+        statement = select(PlaySession).where(PlaySession.game_id == game_id)
+        if since is not None:
+            statement = statement.where(PlaySession.started_at >= since)
+        return list(self.session.scalars(statement.order_by(PlaySession.started_at)))
+
+    def rebuild_rollups(self, batch_size: int = 10_000) -> int:
+        """
+        Recompute the daily and weekly rollups from the session log.
+
+        Use this to backfill rollups for sessions recorded before they
+        existed, or to repair them.
+
+        Returns:
+            int: Number of sessions processed
+        """
+        daily: Dict[Tuple[int, date], int] = defaultdict(int)
+        weekly: Dict[Tuple[int, date], int] = defaultdict(int)
+        statement = select(PlaySession.game_id, PlaySession.started_at, PlaySession.ended_at)
+        processed = 0
+        for game_id, started_at, ended_at in self.session.execute(statement.execution_options(yield_per=batch_size)):
+            for day, seconds in split_by_day(started_at, ended_at):
+                daily[game_id, day] += seconds
+                weekly[game_id, week_start(day)] += seconds
+            processed += 1
+
+        self.session.execute(delete(DailyPlaytime))
+        self.session.execute(delete(WeeklyPlaytime))
+        self._add_to_rollups(daily, weekly)
+        self.session.commit()
+        return processed
+
+    def _add_to_rollups(self, daily: Dict[Tuple[int, date], int], weekly: Dict[Tuple[int, date], int]) -> None:
+        """Upsert seconds into the rollup tables"""
+        for model, period, totals in (
+            (DailyPlaytime, "day", daily),
+            (WeeklyPlaytime, "week_start", weekly),
+        ):
+            if not totals:
+                continue
+            table = model.__table__
+            rows = [{"game_id": game_id, period: key, "seconds": seconds} for (game_id, key), seconds in totals.items()]
+            statement = sqlite_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.game_id, table.c[period]],
+                set_={"seconds": table.c.seconds + statement.excluded.seconds},
+            )
+            self.session.execute(statement, rows)
+
+def main() -> None:
+    """Command line entry point: python -m gacha_hub.core.sessions rebuild [--db PATH]"""
+    from dotenv import load_dotenv
+    from sqlmodel import create_engine
+    from gacha_hub.database.migrations import migrate
+    from gacha_hub.utils import get_database_path
+
+    parser = argparse.ArgumentParser(description="Play session log maintenance")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute daily/weekly rollups")
+    parser.add_argument("--db", help="SQLite database file, defaults to DB_PATH from .env")
+    args = parser.parse_args()
+
+    load_dotenv()
+    db_path = args.db or get_database_path()
+    if not db_path:
+        parser.error("no database given and DB_PATH is not set")
+    engine = create_engine(f"sqlite:///{db_path}")
+    migrate(engine)
+    with Session(engine) as session:
+        processed = SessionLog(session).rebuild_rollups()
+    print(f"Rebuilt rollups from {processed} sessions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import configparser
+import logging
+import os
+import shlex
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+from gacha_hub.core.lnk import HAS_LINK_TARGET_ID_LIST, LnkError, read_lnk, resolve_target
+
+logger = logging.getLogger(__name__)
+
+# File types the bulk import picks up
+SHORTCUT_EXTENSIONS = (".lnk", ".url", ".desktop", ".exe")
+
+# Icon files that can be shown without extracting anything first
+ICON_EXTENSIONS = (".ico", ".exe", ".dll")
+
+# Desktop entry Exec field codes, see the freedesktop.org Desktop Entry spec
+_FIELD_CODES = ("%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m")
+
+_com_state = threading.local()
+
+def _ensure_com() -> None:
+    """Initialize COM once for the calling thread"""
+    if not getattr(_com_state, "initialized", False):
+        import pythoncom
+        pythoncom.CoInitialize()
+        _com_state.initialized = True
+
+def _usable_icon(path: Optional[str]) -> Optional[str]:
+    if path and os.path.splitext(path)[1].lower() in ICON_EXTENSIONS and os.path.exists(path):
+        return path
+    return None
+
+def _read_ini(path: str, section: str) -> Optional[configparser.SectionProxy]:
+    # Internet shortcuts often hold percent-encoded URLs, so no interpolation
+    config = configparser.ConfigParser(interpolation=None, strict=False)
+    config.optionxform = str
+    config.read(path, encoding="utf-8")
+    return config[section] if section in config else None
+
+def _record(path: str, name: str, game_type: str, launch_target, unique_key: str,
+            icon_path: Optional[str] = None, exe: Optional[str] = None, args: Optional[str] = None) -> dict:
+    return {
+        "name": name,
+        "path": path,
+        "icon_path": icon_path,
+        "type": game_type,
+        "launch_target": launch_target,
+        "unique_key": unique_key,
+        "exe": exe,
+        "args": args,
+    }
+
+def _base_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+def parse_url_file(path: str) -> Optional[dict]:
+    """
+    Read an internet shortcut (.url).
+
+    Args:
+        path: Path to the .url file
+
+    Returns:
+        dict: Game list record, or None if the file has no URL
+    """
+    section = _read_ini(path, "InternetShortcut")
+    url = section.get("URL") if section is not None else None
+    if not url:
+        return None
+    icon_file = section.get("IconFile")
+    if icon_file:
+        icon_file = os.path.expandvars(icon_file)
+    unique_key = f"{url}|{icon_file}" if icon_file else url
+    return _record(path, _base_name(path), "url", url, unique_key, icon_path=_usable_icon(icon_file))
+
+def parse_desktop_file(path: str) -> Optional[dict]:
+    """
+    Read a freedesktop.org desktop entry (.desktop).
+
+    Applications become shortcut records with exe and args split out of
+    Exec, Link entries become url records.
+
+    Args:
+        path: Path to the .desktop file
+
+    Returns:
+        dict: Game list record, or None if the entry can't be launched
+    """
+    section = _read_ini(path, "Desktop Entry")
+    if section is None or section.get("Hidden", "false").lower() == "true":
+        return None
+    name = section.get("Name") or _base_name(path)
+    icon = section.get("Icon")
+    icon_path = icon if icon and os.path.isabs(icon) and os.path.exists(icon) else None
+    entry_type = section.get("Type", "Application")
+    if entry_type == "Link":
+        url = section.get("URL")
+        return _record(path, name, "url", url, url, icon_path=icon_path) if url else None
+    if entry_type != "Application" or not section.get("Exec"):
+        return None
+    try:
+        command = shlex.split(section["Exec"])
+    except ValueError:
+        return None
+    command = [part.replace("%%", "%") for part in command if part not in _FIELD_CODES]
+    if not command:
+        return None
+    exe, args = command[0], shlex.join(command[1:])
+    return _record(path, name, "shortcut", (exe, args), f"{exe} {args}".strip(),
+                   icon_path=icon_path, exe=exe, args=args)
+
+def _read_lnk_com(path: str) -> Tuple[str, str, str]:
+    """Ask WScript.Shell for a link's target, arguments and icon file"""
+    import win32com.client
+    _ensure_com()
+    shortcut = win32com.client.Dispatch("WScript.Shell").CreateShortcut(path)
+    icon_location = shortcut.IconLocation.split(",")[0] if shortcut.IconLocation else ""
+    return shortcut.Targetpath, shortcut.Arguments, icon_location
+
+def parse_lnk_file(path: str) -> Optional[dict]:
+    """
+    Read a Windows shell link (.lnk).
+
+    The file is parsed directly, see gacha_hub.core.lnk. On Windows, links
+    the parser can't resolve (malformed files, or targets stored only as a
+    shell item ID list) fall back to WScript.Shell, with COM initialized
+    once per thread.
+
+    Args:
+        path: Path to the .lnk file
+
+    Returns:
+        dict: Game list record
+    """
+    use_com = sys.platform.startswith("win")
+    try:
+        link = read_lnk(path)
+        target = resolve_target(link, path)
+        if target is None and use_com and link.flags & HAS_LINK_TARGET_ID_LIST:
+            target, arguments, icon_location = _read_lnk_com(path)
+        else:
+            arguments, icon_location = link.arguments, link.icon_location
+    except LnkError:
+        if not use_com:
+            raise
+        target, arguments, icon_location = _read_lnk_com(path)
+    target = target or ""
+    icon_path = _usable_icon(icon_location) or _usable_icon(target) or path
+    if not target and not arguments:
+        # Protocol shortcut, launched through the .lnk file itself
+        return _record(path, _base_name(path), "shortcut", ("", ""), path, icon_path=icon_path, exe="", args="")
+    unique_key = f"{target} {arguments}".strip()
+    return _record(path, _base_name(path), "shortcut", (target, arguments), unique_key,
+                   icon_path=icon_path, exe=target, args=arguments)
+
+def parse_exe_file(path: str) -> dict:
+    """Build the game list record for a plain executable"""
+    return _record(path, _base_name(path), "exe", path, path, icon_path=path)
+
+_PARSERS = {
+    ".url": parse_url_file,
+    ".desktop": parse_desktop_file,
+    ".lnk": parse_lnk_file,
+    ".exe": parse_exe_file,
+}
+
+def parse_shortcut(path: str) -> Optional[dict]:
+    """
+    Build a game list record from any supported file.
+
+    Returns:
+        dict: Game list record, or None if the file is unsupported or unreadable
+    """
+    parser = _PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is None:
+        return None
+    try:
+        return parser(path)
+    except Exception as e:
+        logger.warning("Failed to read shortcut %s: %s", path, e)
+        return None
+
+def iter_shortcut_files(folder: str, recursive: bool = True) -> Iterator[str]:
+    """Yield supported files under a folder, without following directory links"""
+    pending = [os.fspath(folder)]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError as e:
+            logger.warning("Failed to scan %s: %s", current, e)
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in SHORTCUT_EXTENSIONS:
+                        yield entry.path
+                except OSError:
+                    continue
+
+def collect_shortcuts(folder: str, is_duplicate: Optional[Callable[[str], bool]] = None,
+                      recursive: bool = True, max_workers: Optional[int] = None) -> List[dict]:
+    """
+    Parse every shortcut under a folder on a worker pool.
+
+    Results are deduplicated by unique_key in one pass, keeping the first
+    file in path order.
+
+    Args:
+        folder: Folder to scan, e.g. a Start Menu or desktop folder
+        is_duplicate: Returns True for unique keys already in the library
+        recursive: Whether to descend into subfolders
+        max_workers: Worker thread count, defaults to ThreadPoolExecutor's
+
+    Returns:
+        list: New game list records in path order
+    """
+    paths = sorted(iter_shortcut_files(folder, recursive))
+    initializer = _ensure_com if sys.platform.startswith("win") else None
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as pool:
+        parsed = list(pool.map(parse_shortcut, paths))
+
+    records = []
+    seen = set()
+    for record in parsed:
+        if record is None or not record["launch_target"]:
+            continue
+        unique_key = record["unique_key"]
+        if unique_key in seen or (is_duplicate and is_duplicate(unique_key)):
+            continue
+        seen.add(unique_key)
+        records.append(record)
+    return records
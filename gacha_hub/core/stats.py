@@ -1,11 +1,174 @@
+import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy import bindparam, case
 from sqlmodel import Session, select
-from database.models import Game, DailyTask, Event
+from gacha_hub.core.daily_reset import DailyResetScheduler, parse_reset_time
+from gacha_hub.core.notifications import EventScheduler
+from gacha_hub.database.models import Game, DailyTask, Event
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's default limit of 999 bound parameters per statement
+MAX_IN_PARAMS = 500
+
+class GameOverview(NamedTuple):
+    """Daily tasks and active events for one game"""
+    tasks: List[DailyTask]
+    events: List[Event]
+
+class PlaytimeBuffer:
+    """
+    Write-behind buffer for playtime increments.
+
+    Increments are combined per game in memory and written as a single
+    executemany UPDATE, so a heartbeat reporting every few seconds costs one
+    transaction per flush instead of one per tick. A flush happens once
+    max_pending increments are queued, when an add arrives after
+    flush_interval seconds, and on flush()/close(). After start() a
+    background thread also flushes every flush_interval seconds, so a
+    quiet buffer does not hold increments indefinitely.
+    """
+
+    def __init__(self, session: Session, max_pending: int = 64, flush_interval: float = 30.0):
+        self.session = session
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, list] = {}  # game_id -> [seconds, last_played]
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time uses the session
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Flush on a background thread every flush_interval seconds.
+
+        The flushes then use the session from that thread, so give the
+        buffer a session nothing else uses.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PlaytimeBuffer", daemon=True)
+        self._thread.start()
+
+    def add(self, game_id: int, additional_time: int, played_at: Optional[datetime] = None) -> None:
+        """
+        Queue additional playtime for a game.
+
+        Args:
+            game_id: The game ID to update
+            additional_time: Time to add in seconds
+            played_at: When the time was played, defaults to now
+        """
+        played_at = played_at or datetime.utcnow()
+        with self._lock:
+            self._merge(game_id, additional_time, played_at)
+            self._pending_count += 1
+            due = (
+                self._pending_count >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Number of increments waiting to be written"""
+        return self._pending_count
+
+    def flush(self) -> int:
+        """
+        Write all queued increments in one transaction.
+
+        Returns:
+            int: Number of games updated
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            count, self._pending_count = self._pending_count, 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        table = Game.__table__
+        new_last_played = bindparam("b_last_played")
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                total_playtime=table.c.total_playtime + bindparam("b_delta"),
+                # Never move last_played backwards if a newer write got there first
+                last_played=case(
+                    (table.c.last_played.is_(None), new_last_played),
+                    (table.c.last_played < new_last_played, new_last_played),
+                    else_=table.c.last_played,
+                ),
+            )
+        )
+        params = [
+            {"b_id": game_id, "b_delta": seconds, "b_last_played": last_played}
+            for game_id, (seconds, last_played) in pending.items()
+        ]
+        try:
+            self.session.execute(statement, params)
+            self.session.commit()
+            return len(pending)
+        except Exception as e:
+            logger.error("Error flushing playtime: %s", e)
+            self.session.rollback()
+            with self._lock:
+                for game_id, (seconds, last_played) in pending.items():
+                    self._merge(game_id, seconds, last_played)
+                self._pending_count += count
+            return 0
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the flush thread and flush any remaining increments, call at shutdown"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            remaining = self._last_flush + self.flush_interval - time.monotonic()
+            if remaining > 0:
+                if self._stop_event.wait(remaining):
+                    return
+                continue
+            self.flush()
+
+    def _merge(self, game_id: int, seconds: int, played_at: datetime) -> None:
+        entry = self._pending.get(game_id)
+        if entry is None:
+            self._pending[game_id] = [seconds, played_at]
+            return
+        entry[0] += seconds
+        if played_at > entry[1]:
+            entry[1] = played_at
 
 class StatsManager:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, event_scheduler: Optional[EventScheduler] = None):
+        """
+        Args:
+            session: Database session
+            event_scheduler: Kept up to date as events are added, edited and removed
+        """
         self.session = session
+        self.playtime_buffer = PlaytimeBuffer(session)
+        self.daily_resets = DailyResetScheduler(session)
+        self.event_scheduler = event_scheduler
     
     def update_playtime(self, game_id: int, additional_time: int) -> bool:
         """
@@ -29,11 +192,20 @@ class StatsManager:
             return True
             
         except Exception as e:
-            print(f"Error updating playtime: {e}")
+            logger.error("Error updating playtime: %s", e)
             return False
     
+    def queue_playtime(self, game_id: int, additional_time: int) -> None:
+        """Add playtime through the write-behind buffer, see PlaytimeBuffer"""
+        self.playtime_buffer.add(game_id, additional_time)
+
+    def flush_playtime(self) -> int:
+        """Write any buffered playtime, returns the number of games updated"""
+        return self.playtime_buffer.flush()
+    
     def get_daily_tasks(self, game_id: int) -> List[DailyTask]:
-        """Get all daily tasks for a game"""
+        """Get all daily tasks for a game, rolling over any past their daily reset"""
+        self.daily_resets.apply([game_id])
         statement = select(DailyTask).where(DailyTask.game_id == game_id)
         return list(self.session.exec(statement))
     
@@ -50,9 +222,114 @@ class StatsManager:
             return True
             
         except Exception as e:
-            print(f"Error completing daily task: {e}")
+            logger.error("Error completing daily task: %s", e)
+            return False
+    
+    def set_daily_reset(self, game_id: int, reset_time: str, timezone: str) -> bool:
+        """
+        Set when a game's daily tasks reset.
+        
+        Args:
+            game_id: The game ID to update
+            reset_time: Local reset time as "HH:MM"
+            timezone: IANA timezone name, e.g. "Asia/Shanghai"
+            
+        Returns:
+            bool: True if update successful, False for an unknown game or a
+            malformed reset time
+        """
+        try:
+            parse_reset_time(reset_time)
+        except ValueError as e:
+            logger.error("Error setting daily reset: %s", e)
+            return False
+        try:
+            game = self.session.get(Game, game_id)
+            if not game:
+                return False
+            
+            game.daily_reset_time = reset_time
+            game.reset_timezone = timezone
+            self.session.commit()
+            self.daily_resets.invalidate(game_id)
+            return True
+            
+        except Exception as e:
+            logger.error("Error setting daily reset: %s", e)
             return False
     
+    def add_event(self, game_id: int, name: str, start_date: datetime, end_date: datetime,
+                  description: Optional[str] = None) -> Optional[Event]:
+        """
+        Add a limited-time event.
+
+        Args:
+            game_id: The game the event belongs to
+            name: Event name
+            start_date: Start, naive UTC
+            end_date: End, naive UTC
+
+        Returns:
+            Event: The stored event, or None if failed
+        """
+        try:
+            if end_date < start_date:
+                raise ValueError(f"Event ends before it starts: {start_date} > {end_date}")
+            event = Event(game_id=game_id, name=name, start_date=start_date, end_date=end_date,
+                          description=description)
+            self.session.add(event)
+            self.session.commit()
+            if self.event_scheduler is not None:
+                self.event_scheduler.schedule(event)
+            return event
+
+        except Exception as e:
+            logger.error("Error adding event: %s", e)
+            self.session.rollback()
+            return None
+
+    def update_event(self, event_id: int, **changes) -> bool:
+        """
+        Change fields of an event, e.g. an extended end_date.
+
+        Returns:
+            bool: True if update successful
+        """
+        try:
+            event = self.session.get(Event, event_id)
+            if not event:
+                return False
+            for field, value in changes.items():
+                if field == "id" or not hasattr(Event, field):
+                    raise ValueError(f"Unknown event field: {field}")
+                setattr(event, field, value)
+            self.session.commit()
+            if self.event_scheduler is not None:
+                self.event_scheduler.schedule(event)
+            return True
+
+        except Exception as e:
+            logger.error("Error updating event: %s", e)
+            self.session.rollback()
+            return False
+
+    def remove_event(self, event_id: int) -> bool:
+        """Delete an event and cancel its notifications"""
+        try:
+            event = self.session.get(Event, event_id)
+            if not event:
+                return False
+            self.session.delete(event)
+            self.session.commit()
+            if self.event_scheduler is not None:
+                self.event_scheduler.unschedule(event_id)
+            return True
+
+        except Exception as e:
+            logger.error("Error removing event: %s", e)
+            self.session.rollback()
+            return False
+
     def get_active_events(self, game_id: int) -> List[Event]:
         """Get all active events for a game"""
         now = datetime.utcnow()
@@ -61,4 +338,71 @@ class StatsManager:
             Event.start_date <= now,
             Event.end_date >= now
         )
-        return list(self.session.exec(statement)) 
\ No newline at end of file
+        return list(self.session.exec(statement))
+    
+    def get_daily_tasks_by_game(self, game_ids: Optional[Iterable[int]] = None) -> Dict[int, List[DailyTask]]:
+        """
+        Get daily tasks for many games at once, rolling over any past their
+        daily reset first.
+        
+        Args:
+            game_ids: Games to fetch, or None for every game
+            
+        Returns:
+            dict: game_id -> tasks. Every requested game_id is present, games
+            without tasks map to an empty list.
+        """
+        if game_ids is not None:
+            game_ids = list(game_ids)
+        self.daily_resets.apply(game_ids)
+        return self._group_by_game(select(DailyTask), DailyTask.game_id, game_ids)
+    
+    def get_active_events_by_game(self, game_ids: Optional[Iterable[int]] = None) -> Dict[int, List[Event]]:
+        """
+        Get active events for many games at once.
+        
+        Args:
+            game_ids: Games to fetch, or None for every game
+            
+        Returns:
+            dict: game_id -> active events. Every requested game_id is present,
+            games without active events map to an empty list.
+        """
+        now = datetime.utcnow()
+        statement = select(Event).where(Event.start_date <= now, Event.end_date >= now)
+        return self._group_by_game(statement, Event.game_id, game_ids)
+    
+    def get_overview(self, game_ids: Optional[Iterable[int]] = None) -> Dict[int, GameOverview]:
+        """
+        Get daily tasks and active events for many games in two queries.
+        
+        Args:
+            game_ids: Games to fetch, or None for every game with tasks or events
+            
+        Returns:
+            dict: game_id -> GameOverview
+        """
+        if game_ids is not None:
+            game_ids = list(game_ids)
+        tasks = self.get_daily_tasks_by_game(game_ids)
+        events = self.get_active_events_by_game(game_ids)
+        return {
+            game_id: GameOverview(tasks.get(game_id, []), events.get(game_id, []))
+            for game_id in (game_ids if game_ids is not None else sorted(tasks.keys() | events.keys()))
+        }
+    
+    def _group_by_game(self, statement, game_id_column, game_ids: Optional[Iterable[int]]) -> Dict[int, list]:
+        """Run statement once per chunk of game ids and group the rows by game"""
+        if game_ids is None:
+            grouped: Dict[int, list] = {}
+            for row in self.session.exec(statement):
+                grouped.setdefault(row.game_id, []).append(row)
+            return grouped
+        
+        ids = list(dict.fromkeys(game_ids))
+        grouped = {game_id: [] for game_id in ids}
+        for start in range(0, len(ids), MAX_IN_PARAMS):
+            chunk = ids[start:start + MAX_IN_PARAMS]
+            for row in self.session.exec(statement.where(game_id_column.in_(chunk))):
+                grouped[row.game_id].append(row)
+        return grouped
@@ -0,0 +1,107 @@
+import logging
+import subprocess
+import threading
+from typing import Callable, Dict, Optional
+
+from gacha_hub.core.launcher import GameLauncher
+from gacha_hub.core.tracker import GameTracker, SessionCallback
+from gacha_hub.core.watcher import ProcessWatcher
+
+logger = logging.getLogger(__name__)
+
+# Called as on_exit(game_id, elapsed_seconds, returncode)
+GameExitCallback = Callable[[int, float, Optional[int]], None]
+
+
+class ProcessSupervisor:
+    """
+    Own the processes of launched games until they exit.
+
+    Launched processes are handed to a GameTracker through a ProcessWatcher,
+    whose thread reports each exit. The supervisor then reaps the child, so
+    no zombies are left behind, and passes the session length to on_exit.
+    Helper processes that only open a URL are reaped without being tracked.
+    """
+
+    def __init__(
+        self,
+        on_exit: Optional[GameExitCallback] = None,
+        on_session_end: Optional[SessionCallback] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.on_exit = on_exit
+        self.tracker = GameTracker(on_session_end)
+        self.watcher = ProcessWatcher(self.tracker, self._on_process_exit, poll_interval)
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the watcher thread, called by launch() as needed"""
+        self.watcher.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop supervising. Games that are still running keep running."""
+        self.watcher.stop(timeout)
+
+    def launch(self, game: dict) -> Optional[subprocess.Popen]:
+        """
+        Launch a game record and supervise its process.
+
+        Args:
+            game: Game record with an "id"
+
+        Returns:
+            subprocess.Popen for the game, or None if it was handed to the shell
+
+        Raises:
+            OSError: If the game could not be started
+        """
+        process = GameLauncher.launch_record(game)
+        if process is None:
+            return None
+        if game.get("type") == "url":
+            # The opener exits as soon as the browser has the URL
+            threading.Thread(target=process.wait, name="UrlOpenerReaper", daemon=True).start()
+            return process
+        self.adopt(process, game["id"])
+        return process
+
+    def adopt(self, process: subprocess.Popen, game_id: int) -> bool:
+        """
+        Supervise an already started process.
+
+        Returns:
+            bool: True if the process is now being watched
+        """
+        self.start()
+        with self._lock:
+            self._processes[process.pid] = process
+        if not self.watcher.watch(process.pid, game_id):
+            if process.pid in self.tracker.tracked_processes:
+                # Already found by a ProcessScanner, still reap it when it exits
+                return True
+            with self._lock:
+                self._processes.pop(process.pid, None)
+            return False
+        return True
+
+    @property
+    def running_count(self) -> int:
+        """Number of supervised games still running"""
+        return self.watcher.watched_count
+
+    def _on_process_exit(self, process_id: int, game_id: int, elapsed: float, returncode: Optional[int]) -> None:
+        """Runs on the watcher thread"""
+        with self._lock:
+            process = self._processes.pop(process_id, None)
+        if process is not None:
+            if returncode is not None:
+                # The watcher reaped it already, waiting again would report 0
+                process.returncode = returncode
+            try:
+                returncode = process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                logger.warning("Game process %d exited but could not be reaped", process_id)
+        logger.info("Game %d exited after %.1fs with code %s", game_id, elapsed, returncode)
+        if self.on_exit:
+            self.on_exit(game_id, elapsed, returncode)
@@ -1,11 +1,18 @@
+import logging
 import psutil
 import time
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Called as on_session_end(game_id, started_at, ended_at) with naive UTC datetimes
+SessionCallback = Callable[[int, datetime, datetime], None]
+
 class GameTracker:
-    def __init__(self):
+    def __init__(self, on_session_end: Optional[SessionCallback] = None):
         self.tracked_processes: Dict[int, dict] = {}
+        self.on_session_end = on_session_end
     
     def start_tracking(self, process_id: int, game_id: int) -> bool:
         """
@@ -25,18 +32,22 @@ class GameTracker:
             self.tracked_processes[process_id] = {
                 'game_id': game_id,
                 'start_time': time.time(),
+                'started_at': datetime.utcnow(),
+                'create_time': self._get_create_time(process_id),
                 'last_check': datetime.utcnow()
             }
             return True
             
         except Exception as e:
-            print(f"Error starting process tracking: {e}")
+            logger.error("Error starting process tracking: %s", e)
             return False
     
     def stop_tracking(self, process_id: int) -> Optional[float]:
         """
         Stop tracking a process and return the elapsed time.
         
+        The finished session is passed to on_session_end, if set.
+        
         Args:
             process_id: The process ID to stop tracking
             
@@ -49,15 +60,42 @@ class GameTracker:
                 
             process_info = self.tracked_processes.pop(process_id)
             elapsed_time = time.time() - process_info['start_time']
+            if self.on_session_end:
+                try:
+                    self.on_session_end(process_info['game_id'], process_info['started_at'], datetime.utcnow())
+                except Exception as e:
+                    logger.exception("Error recording play session: %s", e)
             return elapsed_time
             
         except Exception as e:
-            print(f"Error stopping process tracking: {e}")
+            logger.error("Error stopping process tracking: %s", e)
             return None
     
     def is_process_running(self, process_id: int) -> bool:
-        """Check if a process is still running"""
+        """
+        Check if a process is still running.
+
+        For tracked processes the create time recorded by start_tracking is
+        compared against the live process, so a reused PID is reported as
+        no longer running.
+        """
+        try:
+            if not psutil.pid_exists(process_id):
+                return False
+            process = psutil.Process(process_id)
+            if process.status() == psutil.STATUS_ZOMBIE:
+                return False
+            info = self.tracked_processes.get(process_id)
+            if info is None or info.get('create_time') is None:
+                return True
+            return process.create_time() == info['create_time']
+        except Exception:
+            return False
+
+    @staticmethod
+    def _get_create_time(process_id: int) -> Optional[float]:
+        """Return the create time of a process, or None if it is not accessible"""
         try:
-            return psutil.pid_exists(process_id)
+            return psutil.Process(process_id).create_time()
         except Exception:
-            return False 
\ No newline at end of file
+            return None 
\ No newline at end of file
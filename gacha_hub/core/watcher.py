@@ -0,0 +1,208 @@
+import logging
+import os
+import select
+import threading
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from gacha_hub.core.tracker import GameTracker
+
+logger = logging.getLogger(__name__)
+
+# Called as on_exit(process_id, game_id, elapsed_seconds, returncode). The
+# returncode is only known when the watcher reaped the process itself.
+ExitCallback = Callable[[int, int, float, Optional[int]], None]
+
+
+def _pidfd_supported() -> bool:
+    """Check whether this platform can wait on pidfds with epoll"""
+    if not hasattr(os, "pidfd_open") or not hasattr(select, "epoll"):
+        return False
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+        return True
+    except OSError:
+        return False
+
+
+class ProcessWatcher:
+    """
+    Report exits of tracked game processes from one background thread.
+
+    On Linux every watched process gets a pidfd registered with a single epoll
+    instance, so the thread sleeps until a process actually exits. Elsewhere
+    all processes share one psutil.wait_procs call with a common timeout.
+    Either way the PID's create time is checked, so a reused PID counts as
+    an exit of the original process. psutil.wait_procs reaps children it
+    sees exit, their exit code is passed on to on_exit.
+    """
+
+    def __init__(
+        self,
+        tracker: Optional[GameTracker] = None,
+        on_exit: Optional[ExitCallback] = None,
+        poll_interval: float = 1.0,
+        use_pidfd: Optional[bool] = None,
+    ):
+        self.tracker = tracker or GameTracker()
+        self.on_exit = on_exit
+        self.poll_interval = poll_interval
+        self.use_pidfd = _pidfd_supported() if use_pidfd is None else use_pidfd
+        self._lock = threading.Lock()
+        # Guards starting and stopping, and the wake pipe they open and close
+        self._state_lock = threading.RLock()
+        self._incoming: List[int] = []
+        self._wake_event = threading.Event()
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        """Start the watcher thread, safe to call from several threads"""
+        with self._state_lock:
+            if self._thread is not None:
+                return
+            with self._lock:
+                # Processes still tracked from before a stop() are watched again
+                queued = set(self._incoming)
+                self._incoming.extend(pid for pid in list(self.tracker.tracked_processes) if pid not in queued)
+            self._running = True
+            if self.use_pidfd:
+                self._wake_r, self._wake_w = os.pipe()
+                target = self._run_epoll
+            else:
+                target = self._run_wait_procs
+            self._thread = threading.Thread(target=target, name="ProcessWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the watcher thread. Processes still running stay tracked."""
+        with self._state_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._running = False
+            self._wake()
+        # Joined without the lock, exit callbacks may call watch()
+        thread.join(timeout)
+        with self._state_lock:
+            if self._thread is not thread:
+                return  # stopped by another caller meanwhile
+            if thread.is_alive():
+                # Still polling the wake pipe, closing it could hand its fd number to another file
+                logger.warning("Process watcher did not stop within %s seconds", timeout)
+            else:
+                for fd in (self._wake_r, self._wake_w):
+                    if fd is not None:
+                        os.close(fd)
+            self._thread = None
+            self._wake_r = self._wake_w = None
+
+    def watch(self, process_id: int, game_id: int) -> bool:
+        """
+        Start tracking a process and get notified when it exits.
+
+        Args:
+            process_id: The process ID to watch
+            game_id: The game ID in our database
+
+        Returns:
+            bool: True if the process is now being watched
+        """
+        if not self.tracker.start_tracking(process_id, game_id):
+            return False
+        with self._lock:
+            self._incoming.append(process_id)
+        self._wake()
+        return True
+
+    @property
+    def watched_count(self) -> int:
+        """Number of processes currently tracked"""
+        return len(self.tracker.tracked_processes)
+
+    def _wake(self) -> None:
+        with self._state_lock:
+            if self._wake_w is not None:
+                try:
+                    os.write(self._wake_w, b"\0")
+                except OSError:
+                    pass
+        self._wake_event.set()
+
+    def _take_incoming(self) -> List[int]:
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+        return incoming
+
+    def _finish(self, process_id: int, returncode: Optional[int] = None) -> None:
+        info = self.tracker.tracked_processes.get(process_id)
+        if info is None:
+            return
+        elapsed = self.tracker.stop_tracking(process_id)
+        if self.on_exit is None or elapsed is None:
+            return
+        try:
+            self.on_exit(process_id, info['game_id'], elapsed, returncode)
+        except Exception as e:
+            logger.exception("Error in process exit callback: %s", e)
+
+    def _run_epoll(self) -> None:
+        epoll = select.epoll()
+        epoll.register(self._wake_r, select.EPOLLIN)
+        pidfds: Dict[int, int] = {}
+        try:
+            while self._running:
+                for process_id in self._take_incoming():
+                    try:
+                        fd = os.pidfd_open(process_id)
+                    except OSError:
+                        self._finish(process_id)
+                        continue
+                    # The PID may have been reused before the pidfd was opened
+                    if not self.tracker.is_process_running(process_id):
+                        os.close(fd)
+                        self._finish(process_id)
+                        continue
+                    pidfds[fd] = process_id
+                    epoll.register(fd, select.EPOLLIN)
+                for fd, _ in epoll.poll():
+                    if fd == self._wake_r:
+                        os.read(fd, 4096)
+                        continue
+                    process_id = pidfds.pop(fd)
+                    epoll.unregister(fd)
+                    os.close(fd)
+                    self._finish(process_id)
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+            epoll.close()
+
+    def _run_wait_procs(self) -> None:
+        processes: Dict[int, psutil.Process] = {}
+        while self._running:
+            for process_id in self._take_incoming():
+                info = self.tracker.tracked_processes.get(process_id)
+                try:
+                    process = psutil.Process(process_id)
+                except psutil.Error:
+                    self._finish(process_id)
+                    continue
+                if info and info.get('create_time') not in (None, process.create_time()):
+                    self._finish(process_id)
+                    continue
+                processes[process_id] = process
+            if not processes:
+                self._wake_event.wait()
+                self._wake_event.clear()
+                continue
+            gone, alive = psutil.wait_procs(list(processes.values()), timeout=self.poll_interval)
+            # is_running() compares create times, which catches reused PIDs
+            gone.extend(p for p in alive if not p.is_running())
+            for process in gone:
+                processes.pop(process.pid, None)
+                # Set by wait_procs, which has already reaped a child of ours
+                self._finish(process.pid, getattr(process, "returncode", None))
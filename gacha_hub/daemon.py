@@ -0,0 +1,459 @@
+"""
+Headless tracking daemon.
+
+Runs the launcher, the process watcher and scanner and the playtime writes
+without Qt, so games stay tracked when the window is closed. GUI clients
+attach over a local socket (a Unix socket, or a named pipe on Windows) and
+several of them can share one daemon.
+
+Run with: python -m gacha_hub.daemon [--db PATH] [--address PATH]
+
+Messages are dicts sent with multiprocessing.connection, games in them are
+GameRecords, which pickle as plain tuples. A request has an "op" and gets
+one reply with "ok" and, if that is False, an "error":
+
+    {"op": "ping"}                  -> {"ok": True, "pid": ..., "running": [...], "games": n}
+    {"op": "launch", "game": {...}} -> {"ok": True, "pid": process id, 0 if handed to the shell}
+    {"op": "set_games", "games": [...]} -> {"ok": True, "games": n}
+    {"op": "subscribe"}             -> {"ok": True}, then events on the same connection
+    {"op": "unsubscribe"}           -> {"ok": True}, then the daemon closes the connection
+    {"op": "shutdown"}              -> {"ok": True}
+
+Events are {"event": EVENT_LAUNCHED or EVENT_SESSION_ENDED, "game_id": ...},
+session ends also carry "seconds". Sessions are written to the database by
+the daemon, clients only show them.
+"""
+import argparse
+import logging
+import os
+import secrets
+import signal
+import socket
+import sys
+import threading
+from datetime import datetime
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from gacha_hub.core.records import GameRecord
+from gacha_hub.core.scanner import DEFAULT_SCAN_INTERVAL, ProcessScanner
+from gacha_hub.core.supervisor import ProcessSupervisor
+from gacha_hub.utils import get_app_data_dir
+
+# The database layer is imported on the loader thread once the socket is
+# listening, so clients can connect before SQLAlchemy has loaded.
+
+logger = logging.getLogger(__name__)
+
+EVENT_LAUNCHED = "launched"
+EVENT_SESSION_ENDED = "session_ended"
+
+SOCKET_NAME = "daemon.sock"
+PIPE_NAME = r"\\.\pipe\GachaGameHub"
+KEY_NAME = "daemon.key"
+
+
+class DaemonError(Exception):
+    """The daemon refused a request"""
+
+
+def default_address() -> str:
+    """Where the daemon listens: a named pipe on Windows, a socket in the app data dir elsewhere"""
+    if os.name == "nt":
+        return f"{PIPE_NAME}-{os.getenv('USERNAME', 'user')}"
+    return str(get_app_data_dir() / SOCKET_NAME)
+
+
+def _key_path(address: str) -> Path:
+    if os.name == "nt":
+        return get_app_data_dir() / KEY_NAME
+    return Path(address).with_name(KEY_NAME)
+
+
+def read_authkey(address: Optional[str] = None) -> Optional[bytes]:
+    """The key clients authenticate with, None if no daemon has written one"""
+    try:
+        return _key_path(address or default_address()).read_bytes()
+    except OSError:
+        return None
+
+
+def _write_authkey(address: str) -> bytes:
+    """A fresh key readable only by the current user"""
+    path = _key_path(address)
+    key = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(key)
+    return key
+
+
+class _Peer:
+    """One client connection, sends from the handler and the event threads are serialized"""
+    __slots__ = ("connection", "lock", "subscribed")
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.lock = threading.Lock()
+        self.subscribed = False
+
+    def send(self, message: dict) -> bool:
+        try:
+            with self.lock:
+                self.connection.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def disconnect(self) -> None:
+        """Make the serving thread's recv() return, it then closes the connection"""
+        if os.name == "nt":
+            self.connection.close()
+            return
+        try:
+            with socket.socket(fileno=os.dup(self.connection.fileno())) as sock:
+                sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class TrackingDaemon:
+    """
+    Launch and track games for any number of attached clients.
+
+    The listener thread accepts connections and serves each one on its own
+    thread. Launched games go to a ProcessSupervisor and games started by
+    other means are found by a ProcessScanner, both as in the GUI. Finished
+    sessions are added to the session log and the game's total playtime,
+    then announced to every subscribed client.
+    """
+
+    def __init__(self, address: Optional[str] = None, db_path: Optional[Union[str, Path]] = None,
+                 scan_interval: float = DEFAULT_SCAN_INTERVAL, poll_interval: float = 1.0):
+        """
+        Args:
+            address: Socket path or pipe name, defaults to default_address()
+            db_path: Database file, see create_db_engine()
+            scan_interval: Seconds between scans for games started elsewhere,
+                0 to not scan
+            poll_interval: Passed to the ProcessWatcher
+        """
+        self.address = address or default_address()
+        self.db_path = db_path
+        self.scan_interval = scan_interval
+        self.supervisor = ProcessSupervisor(
+            on_exit=self._on_exit, on_session_end=self._record_session, poll_interval=poll_interval,
+        )
+        self.scanner = ProcessScanner(self.supervisor.watcher, interval=scan_interval)
+        self.games = 0  # games the scanner looks for
+        self._listener: Optional[Listener] = None
+        self._authkey = b""
+        self._peers: List[_Peer] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._stopped = threading.Event()
+        self._database_ready = threading.Event()
+        self._session_factory = None
+        self._engine = None
+
+    def start(self) -> None:
+        """Listen and serve clients on background threads"""
+        with self._lock:
+            if self._running:
+                return
+            self._listen()
+            self._running = True
+        threading.Thread(target=self._accept_loop, name="DaemonListener", daemon=True).start()
+        threading.Thread(target=self._open_database, name="DaemonLoader", daemon=True).start()
+        logger.info("Daemon listening on %s", self.address)
+
+    def serve_forever(self) -> None:
+        """Start and block until stop() or a shutdown request"""
+        self.start()
+        self._stopped.wait()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the library is loaded and sessions can be recorded"""
+        return self._database_ready.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop serving. Games that are still running keep running, but are no longer tracked."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            peers, self._peers = self._peers, []
+        # Wake the listener thread out of accept(). Without a key the client
+        # does not wait for the handshake, in case the thread already left.
+        try:
+            Client(self.address).close()
+        except OSError:
+            pass
+        self._listener.close()
+        for peer in peers:
+            peer.disconnect()
+        self.scanner.stop(timeout)
+        self.supervisor.stop(timeout)
+        if self._engine is not None:
+            self._engine.dispose()
+        if os.name != "nt":
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+        self._stopped.set()
+        logger.info("Daemon stopped")
+
+    def _listen(self) -> None:
+        if os.name != "nt" and os.path.exists(self.address):
+            if ping(self.address) is not None:
+                raise DaemonError(f"A daemon is already listening on {self.address}")
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.address)
+        self._authkey = _write_authkey(self.address)
+        self._listener = Listener(self.address, authkey=self._authkey)
+        if os.name != "nt":
+            os.chmod(self.address, 0o600)
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                if not self._running:
+                    return
+                # Failed handshake, e.g. a client with a stale key
+                logger.warning("Rejected daemon client: %s", e)
+                continue
+            if not self._running:
+                connection.close()
+                return
+            peer = _Peer(connection)
+            with self._lock:
+                self._peers.append(peer)
+            threading.Thread(target=self._serve, args=(peer,), name="DaemonClient", daemon=True).start()
+
+    def _serve(self, peer: _Peer) -> None:
+        try:
+            while True:
+                try:
+                    request = peer.connection.recv()
+                except (EOFError, OSError):
+                    return
+                reply = self._handle(peer, request)
+                if not peer.send(reply):
+                    return
+                op = request.get("op") if isinstance(request, dict) else None
+                if op == "unsubscribe":
+                    return
+                if op == "shutdown":
+                    self.stop(timeout=5)
+                    return
+        finally:
+            with self._lock:
+                if peer in self._peers:
+                    self._peers.remove(peer)
+            peer.connection.close()
+
+    def _handle(self, peer: _Peer, request: dict) -> dict:
+        op = request.get("op") if isinstance(request, dict) else None
+        try:
+            if op == "ping":
+                running = [{"pid": pid, "game_id": info["game_id"], "started_at": info["started_at"]}
+                           for pid, info in list(self.supervisor.tracker.tracked_processes.items())]
+                return {"ok": True, "pid": os.getpid(), "running": running, "games": self.games}
+            if op == "launch":
+                game = request["game"]
+                process = self.supervisor.launch(game)
+                self._broadcast({"event": EVENT_LAUNCHED, "game_id": game["id"]})
+                return {"ok": True, "pid": process.pid if process is not None else 0}
+            if op == "set_games":
+                self._set_games(request["games"])
+                return {"ok": True, "games": self.games}
+            if op == "subscribe":
+                peer.subscribed = True
+                return {"ok": True}
+            if op in ("unsubscribe", "shutdown"):
+                return {"ok": True}
+            return {"ok": False, "error": f"Unknown request: {op!r}"}
+        except (KeyError, TypeError) as e:
+            return {"ok": False, "error": f"Malformed {op} request: {e!r}"}
+        except OSError as e:
+            logger.error("Launch failed for %s: %s", request.get("game"), e)
+            return {"ok": False, "error": str(e)}
+
+    def _set_games(self, games: List[dict]) -> None:
+        self.games = len(games)
+        if self.scan_interval <= 0:
+            return
+        self.scanner.set_games(games)
+        self.scanner.start()
+
+    def _broadcast(self, event: dict) -> None:
+        with self._lock:
+            peers = [peer for peer in self._peers if peer.subscribed]
+        for peer in peers:
+            peer.send(event)
+
+    def _open_database(self) -> None:
+        """Runs on the loader thread: open the database and scan for the library's games"""
+        try:
+            from gacha_hub.database.engine import create_db_engine, create_session_factory
+            from gacha_hub.database.repository import GameRepository
+            self._engine = create_db_engine(self.db_path)
+            self._session_factory = create_session_factory(self._engine)
+            repository = GameRepository(self._engine)
+            games = repository.all()
+            repository.close()
+            # A client may have sent its own list in the meantime
+            if not self.games:
+                self._set_games(games)
+            logger.info("Daemon loaded %d games", len(games))
+        except Exception as e:
+            logger.exception("Daemon could not open the database: %s", e)
+        finally:
+            self._database_ready.set()
+
+    def _record_session(self, game_id: int, started_at: datetime, ended_at: datetime) -> None:
+        """Runs on the watcher thread"""
+        from gacha_hub.core.sessions import SessionLog
+        from gacha_hub.core.stats import StatsManager
+        from gacha_hub.database.engine import session_scope
+        if not self._database_ready.wait(30) or self._session_factory is None:
+            logger.error("Dropped session of game %d, the database is not open", game_id)
+            return
+        with session_scope(self._session_factory, write=True) as session:
+            if SessionLog(session).record_session(game_id, started_at, ended_at) is not None:
+                StatsManager(session).update_playtime(game_id, int((ended_at - started_at).total_seconds()))
+
+    def _on_exit(self, game_id: int, elapsed: float, returncode: Optional[int]) -> None:
+        self._broadcast({"event": EVENT_SESSION_ENDED, "game_id": game_id, "seconds": elapsed})
+
+
+class DaemonClient:
+    """
+    A connection to a running TrackingDaemon.
+
+    Requests are thread-safe. Events need a connection of their own, one
+    that only calls subscribe() and then reads events().
+    """
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, address: Optional[str] = None) -> Optional["DaemonClient"]:
+        """Attach to the daemon, or None if none is running"""
+        address = address or default_address()
+        authkey = read_authkey(address)
+        if authkey is None:
+            return None
+        try:
+            return cls(Client(address, authkey=authkey))
+        except (OSError, EOFError) as e:
+            logger.debug("No daemon on %s: %s", address, e)
+            return None
+        except Exception as e:
+            # AuthenticationError, the key belongs to an earlier daemon
+            logger.warning("Could not attach to the daemon on %s: %s", address, e)
+            return None
+
+    def request(self, op: str, **arguments) -> dict:
+        """
+        Send a request and wait for its reply.
+
+        Raises:
+            DaemonError: If the daemon refused it
+            EOFError, OSError: If the daemon went away
+        """
+        with self._lock:
+            self.connection.send({"op": op, **arguments})
+            reply = self.connection.recv()
+        if not reply.get("ok"):
+            raise DaemonError(reply.get("error", "request failed"))
+        return reply
+
+    def ping(self) -> dict:
+        return self.request("ping")
+
+    def launch(self, game: dict) -> int:
+        """Launch a game record, returns its process id or 0 if it was handed to the shell"""
+        return self.request("launch", game=GameRecord.from_dict(game))["pid"]
+
+    def set_games(self, games: List[dict]) -> int:
+        """Replace the games the daemon scans for"""
+        return self.request("set_games", games=[GameRecord.from_dict(game) for game in games])["games"]
+
+    def shutdown(self) -> None:
+        """Stop the daemon"""
+        self.request("shutdown")
+
+    def subscribe(self) -> None:
+        """Have events sent to this connection, read them with events()"""
+        self.request("subscribe")
+
+    def events(self) -> Iterator[dict]:
+        """Yield events after subscribe() until unsubscribe() or the daemon stops"""
+        while True:
+            try:
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                return
+            if "event" in message:
+                yield message
+
+    def unsubscribe(self) -> None:
+        """End events() from another thread, the daemon then closes the connection"""
+        try:
+            self.connection.send({"op": "unsubscribe"})
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def ping(address: Optional[str] = None) -> Optional[dict]:
+    """The daemon's ping reply, None if no daemon is running"""
+    client = DaemonClient.connect(address)
+    if client is None:
+        return None
+    try:
+        return client.ping()
+    except (EOFError, OSError, DaemonError):
+        return None
+    finally:
+        client.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: python -m gacha_hub.daemon"""
+    from dotenv import load_dotenv
+    from gacha_hub.logging_setup import setup_logging
+
+    parser = argparse.ArgumentParser(description="Track game playtime without the window")
+    parser.add_argument("--db", help="SQLite database file, defaults to DB_PATH from .env")
+    parser.add_argument("--address", help="Socket path or pipe name to listen on")
+    parser.add_argument("--scan-interval", type=float, default=DEFAULT_SCAN_INTERVAL,
+                        help="Seconds between scans for games started elsewhere, 0 to not scan")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    setup_logging()
+    daemon = TrackingDaemon(args.address, args.db, args.scan_interval)
+    try:
+        daemon.start()
+    except DaemonError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=daemon.stop).start())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
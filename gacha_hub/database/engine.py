@@ -0,0 +1,134 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, create_engine
+from gacha_hub.database.migrations import migrate
+from gacha_hub.utils import get_app_data_dir, get_database_path
+
+DEFAULT_DB_NAME = "gacha_hub.db"
+
+# Applied to every new connection. WAL lets readers carry on while one
+# writer commits, and with WAL synchronous=NORMAL only fsyncs at checkpoints
+# without risking corruption. mmap serves reads from the page cache instead
+# of read() calls. busy_timeout makes a second writer wait for the lock
+# rather than fail with "database is locked".
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 256 * 1024 * 1024),
+    ("busy_timeout", 5000),
+)
+
+# Prepared statements kept per connection by sqlite3 (its default is 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Connections kept open for the GUI, the writer and the tracker threads
+POOL_SIZE = 5
+
+# Execution option asking for BEGIN IMMEDIATE, see session_scope()
+_IMMEDIATE = "sqlite_begin_immediate"
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_lock = threading.Lock()
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+def _on_begin(connection) -> None:
+    # Otherwise the sqlite3 module's own handling applies: reads run outside
+    # a transaction and a deferred BEGIN is sent right before the first write
+    if connection.get_execution_options().get(_IMMEDIATE, False):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def create_db_engine(db_path: Optional[Union[str, Path]] = None, pool_size: int = POOL_SIZE) -> Engine:
+    """
+    Create the engine for the application database and bring its schema up to date.
+
+    Connections are pooled and tuned with SQLITE_PRAGMAS, so several threads
+    can each use their own session at the same time.
+
+    Args:
+        db_path: SQLite file to use. Defaults to DB_PATH from the environment,
+            or gacha_hub.db in the app data directory.
+        pool_size: Connections kept open in the pool
+    """
+    db_path = db_path or get_database_path() or get_app_data_dir() / DEFAULT_DB_NAME
+    connect_args = {"check_same_thread": False, "cached_statements": STATEMENT_CACHE_SIZE}
+    pool_args = {}
+    if str(db_path) != ":memory:":
+        pool_args = {"pool_size": pool_size, "max_overflow": pool_size}
+    engine = create_engine(f"sqlite:///{db_path}", connect_args=connect_args, **pool_args)
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "begin", _on_begin)
+    migrate(engine)
+    return engine
+
+def create_session_factory(engine: Engine) -> sessionmaker:
+    """
+    Session factory for an engine.
+
+    Sessions are not thread-safe, open one per thread and unit of work.
+    Objects stay readable after commit, since they often outlive it.
+    """
+    return sessionmaker(engine, class_=Session, expire_on_commit=False)
+
+def get_engine() -> Engine:
+    """The application's engine, created from DB_PATH on first use"""
+    global _engine
+    with _lock:
+        if _engine is None:
+            _engine = create_db_engine()
+        return _engine
+
+def get_session_factory() -> sessionmaker:
+    """Session factory for get_engine()"""
+    global _session_factory
+    engine = get_engine()
+    with _lock:
+        if _session_factory is None:
+            _session_factory = create_session_factory(engine)
+        return _session_factory
+
+@contextmanager
+def session_scope(factory: Optional[sessionmaker] = None, write: bool = False) -> Iterator[Session]:
+    """
+    Run a unit of work in its own session, committing on success.
+
+    Args:
+        factory: Session factory, defaults to get_session_factory()
+        write: Take the write lock when the transaction starts (BEGIN
+            IMMEDIATE). Use it when the work reads before it writes, so a
+            concurrent writer makes it wait instead of failing mid-way.
+    """
+    factory = factory or get_session_factory()
+    if write:
+        session = factory(bind=factory.kw["bind"].execution_options(**{_IMMEDIATE: True}))
+    else:
+        session = factory()
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def dispose_engine() -> None:
+    """Close the application's pooled connections, call at shutdown"""
+    global _engine, _session_factory
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
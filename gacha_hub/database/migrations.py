@@ -0,0 +1,92 @@
+from typing import Callable, List
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import Table
+from sqlmodel import SQLModel
+from gacha_hub.database import models
+
+def _add_query_indexes(connection: Connection) -> None:
+    """Add the per-game and active-window indexes on Event and DailyTask"""
+    for table in (models.Event.__table__, models.DailyTask.__table__):
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+def _add_missing_columns(connection: Connection, table: Table) -> None:
+    """ALTER TABLE in any columns the model has but the database lacks"""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(connection.dialect)}"
+        default = column.default.arg if column.default is not None and column.default.is_scalar else None
+        if default is not None:
+            ddl += " DEFAULT " + repr(default)
+        elif not column.nullable:
+            raise ValueError(f"Cannot add NOT NULL column {table.name}.{column.name} without a default")
+        connection.exec_driver_sql(ddl)
+
+def _add_daily_reset_settings(connection: Connection) -> None:
+    """Add the per-game daily reset time and timezone"""
+    _add_missing_columns(connection, models.Game.__table__)
+
+def _add_play_sessions(connection: Connection) -> None:
+    """Add the session log and its daily/weekly rollup tables"""
+    for model in (models.PlaySession, models.DailyPlaytime, models.WeeklyPlaytime):
+        model.__table__.create(connection, checkfirst=True)
+
+def _add_library_fields(connection: Connection) -> None:
+    """Add the game list fields so the library can live in the database"""
+    table = models.Game.__table__
+    _add_missing_columns(connection, table)
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+def _autoincrement_game_ids(connection: Connection) -> None:
+    """Rebuild the game table with AUTOINCREMENT, SQLite cannot add it in place"""
+    sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'game'").scalar()
+    if "AUTOINCREMENT" in sql.upper():
+        return
+    table = models.Game.__table__
+    columns = ", ".join(column.name for column in table.columns)
+    # The copy's indexes take the old names, and follow it through the rename
+    for index in table.indexes:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+    table.to_metadata(MetaData(), name="game_new").create(connection)
+    connection.exec_driver_sql(f"INSERT INTO game_new ({columns}) SELECT {columns} FROM game")
+    connection.exec_driver_sql("DROP TABLE game")
+    connection.exec_driver_sql("ALTER TABLE game_new RENAME TO game")
+
+# Each step must be idempotent: fresh databases get the full schema from
+# create_all first and then run every step on top of it.
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _add_query_indexes,
+    _add_daily_reset_settings,
+    _add_play_sessions,
+    _add_library_fields,
+    _autoincrement_game_ids,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version(connection: Connection) -> int:
+    """Read the schema version stored in PRAGMA user_version"""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+def migrate(engine: Engine) -> int:
+    """
+    Create missing tables and apply pending migrations.
+
+    Args:
+        engine: Engine for the SQLite database to upgrade
+
+    Returns:
+        int: The schema version after migrating
+    """
+    with engine.begin() as connection:
+        version = get_schema_version(connection)
+        SQLModel.metadata.create_all(connection)
+        for step in MIGRATIONS[version:]:
+            step(connection)
+        if version != SCHEMA_VERSION:
+            connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return SCHEMA_VERSION
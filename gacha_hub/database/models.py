@@ -1,16 +1,37 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 class Game(SQLModel, table=True):
+    # AUTOINCREMENT so the id of a removed game is never handed out again
+    __table_args__ = (
+        Index("ix_game_unique_key", "unique_key", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    executable_path: str
+    executable_path: str  # the file the game was added from
     total_playtime: int = Field(default=0)  # in seconds
     last_played: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    daily_reset_time: str = Field(default="04:00")  # HH:MM, local to reset_timezone
+    reset_timezone: str = Field(default="UTC")  # IANA name, e.g. "Asia/Shanghai"
+    # Library fields used by the game list, see GameRepository
+    game_type: str = Field(default="exe")  # "exe", "shortcut", "url" or "file"
+    launch_target: Optional[str] = None
+    unique_key: Optional[str] = None
+    icon_path: Optional[str] = None
+    exe: Optional[str] = None
+    args: Optional[str] = None
+    position: int = Field(default=0)  # display order in the game list
 
 class DailyTask(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_dailytask_game_completed", "game_id", "completed"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     game_id: int = Field(foreign_key="game.id")
     name: str
@@ -19,10 +40,42 @@ class DailyTask(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class Event(SQLModel, table=True):
+    # end_date comes before start_date so active-window lookups are a range
+    # scan over events that have not ended yet, however much history piles up.
+    __table_args__ = (
+        Index("ix_event_game_end", "game_id", "end_date", "start_date"),
+        Index("ix_event_end_start", "end_date", "start_date"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     game_id: int = Field(foreign_key="game.id")
     name: str
     start_date: datetime
     end_date: datetime
     description: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow) 
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PlaySession(SQLModel, table=True):
+    """One tracked run of a game. Rows are only ever appended."""
+    __table_args__ = (
+        Index("ix_playsession_game_started", "game_id", "started_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    game_id: int = Field(foreign_key="game.id")
+    started_at: datetime
+    ended_at: datetime
+    duration: int  # in seconds
+
+class DailyPlaytime(SQLModel, table=True):
+    """Playtime per game per UTC day, maintained from PlaySession"""
+    # The period leads the primary key so "everything on a day" is a range scan
+    day: date = Field(primary_key=True)
+    game_id: int = Field(foreign_key="game.id", primary_key=True)
+    seconds: int = Field(default=0)
+
+class WeeklyPlaytime(SQLModel, table=True):
+    """Playtime per game per UTC week starting on Monday, maintained from PlaySession"""
+    week_start: date = Field(primary_key=True)
+    game_id: int = Field(foreign_key="game.id", primary_key=True)
+    seconds: int = Field(default=0)
@@ -0,0 +1,256 @@
+import logging
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterable, List, Mapping, Optional
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Engine
+from gacha_hub.core.metrics import timed
+from gacha_hub.core.records import GameRecord, GameType
+from gacha_hub.database.models import DailyPlaytime, DailyTask, Event, Game, PlaySession, WeeklyPlaytime
+from gacha_hub.utils import DebouncedWriter
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows belong to one game, deleted along with it
+GAME_CHILD_TABLES = tuple(model.__table__ for model in (DailyTask, Event, PlaySession, DailyPlaytime, WeeklyPlaytime))
+
+def _record_from_row(row) -> GameRecord:
+    """Build a game list record from a game table row"""
+    launch_target = row.launch_target
+    if row.game_type == GameType.SHORTCUT:
+        launch_target = (row.exe or "", row.args or "")
+    return GameRecord(row.name, row.executable_path, row.icon_path, row.game_type, launch_target,
+                      row.unique_key, row.exe, row.args, row.id)
+
+def _row_from_record(game: GameRecord, position: int) -> dict:
+    """Build game table values from a game list record"""
+    launch_target = game.launch_target
+    if isinstance(launch_target, tuple):
+        launch_target = launch_target[0] or None
+    return {
+        "id": game.id,
+        "name": game.name,
+        "executable_path": game.path or "",
+        "icon_path": game.icon_path,
+        "game_type": game.type.value,
+        "launch_target": launch_target,
+        "unique_key": game.unique_key,
+        "exe": game.exe,
+        "args": game.args,
+        "position": position,
+    }
+
+class GameRepository:
+    """
+    The game library, backed by the game table.
+
+    Every game is loaded once into an identity map keyed by id and by
+    unique_key, so reads never touch the database. Adding games inserts them
+    straight away, so the database hands out their ids. Other writes update
+    the map straight away and are queued for a background DebouncedWriter,
+    which applies each batch in a single transaction. If a batch fails the
+    map no longer matches the database: flush() then returns False and
+    reload() re-reads it. Games are GameRecords, which read like the game
+    list dicts plus "id"; the same record is returned for every lookup, so
+    treat them as read-only and go through update().
+    """
+
+    def __init__(self, engine: Engine, delay: float = 0.5):
+        self.engine = engine
+        self.write_failed = False
+        self._load()
+        self._writer = DebouncedWriter(self._write, delay=delay, name="GameRepository", on_error=self._on_write_error)
+
+    @timed("repository.load")
+    def _load(self) -> None:
+        self._by_id: Dict[int, GameRecord] = {}
+        self._by_key: Dict[str, GameRecord] = {}
+        self._order: List[int] = []
+        self._positions: Dict[int, int] = {}
+        table = Game.__table__
+        statement = select(table).order_by(table.c.position, table.c.id)
+        with self.engine.connect() as connection:
+            for row in connection.execute(statement):
+                game = _record_from_row(row)
+                self._by_id[row.id] = game
+                if game.unique_key:
+                    self._by_key[game.unique_key] = game
+                self._order.append(row.id)
+                self._positions[row.id] = row.position
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def all(self) -> List[GameRecord]:
+        """All games in display order"""
+        return [self._by_id[game_id] for game_id in self._order]
+
+    def at(self, index: int) -> GameRecord:
+        """The game at a position in display order"""
+        return self._by_id[self._order[index]]
+
+    def index_of(self, game_id: int) -> int:
+        """Position of a game in display order"""
+        return self._order.index(game_id)
+
+    def rows_of(self, game_ids: Iterable[int]) -> Dict[int, int]:
+        """Positions in display order of several games in one pass, unknown ids are left out"""
+        wanted = set(game_ids)
+        return {game_id: row for row, game_id in enumerate(self._order) if game_id in wanted}
+
+    def get(self, game_id: int) -> Optional[GameRecord]:
+        return self._by_id.get(game_id)
+
+    def get_by_key(self, unique_key: str) -> Optional[GameRecord]:
+        return self._by_key.get(unique_key)
+
+    def add(self, game: Mapping) -> GameRecord:
+        """
+        Add a game at the end of the list.
+
+        Args:
+            game: Game list dict or record, any id it has is ignored
+
+        Returns:
+            GameRecord: The stored record, with the id the database gave it
+
+        Raises:
+            ValueError: If a game with the same unique_key already exists
+        """
+        return self.add_many([game])[0]
+
+    def add_many(self, games: Iterable[Mapping]) -> List[GameRecord]:
+        """Add several games in one transaction, see add()"""
+        games = list(games)
+        keys = [game.get("unique_key") for game in games if game.get("unique_key")]
+        duplicates = [key for key in keys if key in self._by_key]
+        if duplicates or len(set(keys)) != len(keys):
+            raise ValueError(f"Duplicate games: {duplicates or keys}")
+        records = [GameRecord.from_dict(game) for game in games]
+        start = self._positions[self._order[-1]] + 1 if self._order else 0
+        # Queued deletes go first, a removed game's unique_key may be re-added
+        self._writer.flush()
+        self._insert(records, start)
+        for position, record in enumerate(records, start):
+            self._by_id[record.id] = record
+            if record.unique_key:
+                self._by_key[record.unique_key] = record
+            self._order.append(record.id)
+            self._positions[record.id] = position
+        return records
+
+    def update(self, game_id: int, **changes) -> GameRecord:
+        """Change fields of a game, e.g. update(game_id, name="New name")"""
+        record = self._by_id[game_id]
+        old_key = record.unique_key
+        record.update(changes)
+        if record.unique_key != old_key:
+            self._by_key.pop(old_key, None)
+            if record.unique_key:
+                self._by_key[record.unique_key] = record
+        self._writer.submit(("update", _row_from_record(record, self._positions[game_id])))
+        return record
+
+    def remove(self, game_id: int) -> Optional[GameRecord]:
+        """
+        Remove a game along with its sessions, playtime, tasks and events.
+
+        Returns:
+            Optional[GameRecord]: The removed record, None if the id is unknown
+        """
+        record = self._by_id.pop(game_id, None)
+        if record is None:
+            return None
+        self._by_key.pop(record.unique_key, None)
+        self._order.remove(game_id)
+        # Positions only need to stay ordered, so the gap is left as is
+        del self._positions[game_id]
+        self._writer.submit(("delete", {"id": game_id}))
+        return record
+
+    def move(self, game_id: int, index: int) -> None:
+        """Move a game to a new index in the display order"""
+        old_index = self._order.index(game_id)
+        self._order.pop(old_index)
+        self._order.insert(index, game_id)
+        self._renumber(min(old_index, index), max(old_index, index) + 1)
+
+    def reorder(self, game_ids: List[int]) -> None:
+        """Replace the display order, game_ids must contain every game once"""
+        if len(game_ids) != len(self._order) or set(game_ids) != self._by_id.keys():
+            raise ValueError("reorder() needs every game id exactly once")
+        changed = [i for i, game_id in enumerate(game_ids) if self._order[i] != game_id]
+        self._order = list(game_ids)
+        if changed:
+            self._renumber(changed[0], changed[-1] + 1)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write all queued changes.
+
+        Returns:
+            bool: False on timeout, or if a write failed since the last
+            reload(), in which case the in-memory games are out of date
+        """
+        return self._writer.flush(timeout) and not self.write_failed
+
+    def reload(self) -> None:
+        """Drop the in-memory games and read them again from the database"""
+        self._writer.flush()
+        self._load()
+        self.write_failed = False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write all queued changes and stop the writer thread"""
+        self._writer.close(timeout)
+
+    def _renumber(self, start: int, end: int) -> None:
+        """Give the games in _order[start:end] increasing positions"""
+        if start >= end:
+            return
+        lower = self._positions[self._order[start - 1]] + 1 if start > 0 else 0
+        if end < len(self._order) and self._positions[self._order[end]] - lower < end - start:
+            # Not enough room between the neighbours, renumber to the end
+            end = len(self._order)
+        for offset, game_id in enumerate(self._order[start:end]):
+            self._positions[game_id] = lower + offset
+            self._writer.submit(("position", {"id": game_id, "position": lower + offset}))
+
+    @timed("repository.insert")
+    def _insert(self, records: List[GameRecord], start: int) -> None:
+        """Insert new games at increasing positions from start and set their ids"""
+        table = Game.__table__
+        now = datetime.utcnow()
+        with self.engine.begin() as connection:
+            for position, record in enumerate(records, start):
+                values = _row_from_record(record, position)
+                del values["id"]
+                result = connection.execute(table.insert(), dict(values, created_at=now))
+                record.id = result.inserted_primary_key[0]
+
+    def _on_write_error(self, operations: list, error: Exception) -> None:
+        """Runs on the writer thread when a batch fails"""
+        logger.error("Failed to write %d game changes, the library needs a reload: %s",
+                     len(operations), error, exc_info=error)
+        self.write_failed = True
+
+    @timed("repository.write")
+    def _write(self, operations: list) -> None:
+        """Runs on the writer thread: apply a batch of operations in one transaction"""
+        table = Game.__table__
+        by_id = table.c.id == bindparam("b_id")
+        with self.engine.begin() as connection:
+            # Consecutive operations of the same kind go out as one executemany
+            for kind, group in groupby(operations, key=lambda operation: operation[0]):
+                rows = [values for _, values in group]
+                if kind == "delete":
+                    game_ids = [{"b_id": row["id"]} for row in rows]
+                    for child in GAME_CHILD_TABLES:
+                        connection.execute(child.delete().where(child.c.game_id == bindparam("b_id")), game_ids)
+                    connection.execute(table.delete().where(by_id), game_ids)
+                else:
+                    # "update" and "position" set the given columns by id
+                    columns = [column for column in rows[0] if column != "id"]
+                    statement = table.update().where(by_id).values(
+                        {column: bindparam("b_" + column) for column in columns})
+                    connection.execute(statement, [{"b_" + key: value for key, value in row.items()} for row in rows])
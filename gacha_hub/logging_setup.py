@@ -0,0 +1,83 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional, Union
+from gacha_hub.utils import get_app_data_dir
+
+# Environment variable (e.g. in .env) holding the log level name
+LOG_LEVEL_ENV = "LOG_LEVEL"
+DEFAULT_LEVEL = logging.INFO
+
+LOG_FORMAT = "%(asctime)s %(levelname)-8s %(threadName)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def get_log_level(value: Optional[str] = None) -> int:
+    """Parse a level name such as "DEBUG", falling back to LOG_LEVEL and then INFO"""
+    name = (value or os.getenv(LOG_LEVEL_ENV) or "").strip().upper()
+    level = logging.getLevelName(name) if name else DEFAULT_LEVEL
+    return level if isinstance(level, int) else DEFAULT_LEVEL
+
+def get_log_dir() -> Path:
+    return get_app_data_dir() / "logs"
+
+def setup_logging(level: Union[int, str, None] = None, log_dir: Optional[Path] = None,
+                  max_bytes: int = 1_000_000, backup_count: int = 3) -> QueueListener:
+    """
+    Send the gacha_hub loggers to a rotating log file without blocking callers.
+
+    Records go onto an in-memory queue and a QueueListener thread does the
+    file I/O, so logging from the GUI thread costs a queue put. Warnings and
+    errors are echoed to stderr as well. Calling it again returns the
+    running listener.
+
+    Args:
+        level: Level for the gacha_hub loggers, defaults to LOG_LEVEL from the environment
+        log_dir: Folder for gacha_hub.log, defaults to the app data logs folder
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated files kept
+
+    Returns:
+        QueueListener: The running listener
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    log_dir = Path(log_dir) if log_dir else get_log_dir()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(log_dir / "gacha_hub.log", maxBytes=max_bytes,
+                                       backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    console_handler.setFormatter(formatter)
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = QueueHandler(records)
+    _listener = QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+
+    logger = logging.getLogger("gacha_hub")
+    logger.setLevel(level if isinstance(level, int) else get_log_level(level))
+    logger.addHandler(_queue_handler)
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging() -> None:
+    """Write out queued records and detach the handlers set up by setup_logging()"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    atexit.unregister(shutdown_logging)
+    logging.getLogger("gacha_hub").removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
@@ -1,22 +1,28 @@
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
+from gacha_hub.logging_setup import setup_logging
 from gacha_hub.ui.main_window import MainWindow
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
 def main():
     # Load environment variables
     load_dotenv()
+    setup_logging()
     
     # Initialize Qt Application
     app = QApplication(sys.argv)
     
-    # Create and show main window
-    window = MainWindow()
+    # Create and show main window, the library is opened once it is up
+    window = MainWindow(load=False)
     window.show()
+    QTimer.singleShot(0, window.load_library)
+    # Queued after the load, picks up games started outside the hub
+    QTimer.singleShot(0, window.start_process_scanner)
     
     # Start event loop
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,133 @@
+from typing import TYPE_CHECKING, Dict, Set
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from .icon_loader import IconLoader
+
+if TYPE_CHECKING:
+    from gacha_hub.database.repository import GameRepository
+
+class GameListModel(QAbstractListModel):
+    """
+    List model over a GameRepository.
+
+    Rows are read straight from the repository's identity map, nothing is
+    copied. Icons are requested from the IconLoader the first time a row
+    is painted, so only visible games cost anything.
+    """
+
+    def __init__(self, repository: "GameRepository", icon_loader: IconLoader, placeholder_icon, default_icon_path, parent=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.icon_loader = icon_loader
+        self.placeholder_icon = placeholder_icon
+        self.default_icon_path = default_icon_path
+        self.icon_loader.iconReady.connect(self._on_icon_ready)
+        self._icon_requests: Dict[str, Set[int]] = {}  # icon path -> ids of the games waiting for it
+        self._icons_ready: Set[int] = set()  # ids of games whose icon arrived since the last refresh
+        # Icons that finish together are announced with one dataChanged per run of rows
+        self._icon_refresh = QTimer(self)
+        self._icon_refresh.setSingleShot(True)
+        self._icon_refresh.setInterval(30)
+        self._icon_refresh.timeout.connect(self._refresh_icons)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.repository)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        game = self.repository.at(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return game["name"]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(game.get("icon_path"), game["id"])
+        if role == Qt.ItemDataRole.UserRole:
+            return game["id"]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return game.get("path")
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def game_at(self, index):
+        """The game record shown at a model index"""
+        return self.repository.at(index.row())
+
+    def add_game(self, game):
+        """Append a game to the repository and the list, returns the stored record"""
+        return self.add_games([game])[0]
+
+    def add_games(self, games):
+        """Append several games in one insert, returns the stored records"""
+        games = list(games)
+        if not games:
+            return []
+        # Stored first, the view only hears about rows the repository accepted
+        records = self.repository.add_many(games)
+        row = len(self.repository) - len(records)
+        self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+        self.endInsertRows()
+        return records
+
+    def remove_game(self, row):
+        """Remove the game at a row, returns the removed record"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        try:
+            return self.repository.remove(self.repository.at(row)["id"])
+        finally:
+            self.endRemoveRows()
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        if source_parent.isValid() or destination_parent.isValid() or count <= 0:
+            return False
+        if not self.beginMoveRows(source_parent, source_row, source_row + count - 1, destination_parent, destination_child):
+            return False
+        game_ids = [self.repository.at(source_row + offset)["id"] for offset in range(count)]
+        # destination_child counts rows before the moved ones are taken out
+        target = destination_child if destination_child < source_row else destination_child - count
+        moves = list(enumerate(game_ids))
+        if target > source_row:
+            # Moving down, place the last row first so earlier ones don't shift it
+            moves.reverse()
+        for offset, game_id in moves:
+            self.repository.move(game_id, target + offset)
+        self.endMoveRows()
+        return True
+
+    def reload(self):
+        """Re-read everything from the repository"""
+        self.beginResetModel()
+        self.endResetModel()
+
+    def _icon_for(self, icon_path, game_id):
+        if not icon_path or icon_path == self.default_icon_path:
+            return self.placeholder_icon
+        icon = self.icon_loader.cached(icon_path)
+        if icon is None:
+            self._icon_requests.setdefault(icon_path, set()).add(game_id)
+            self.icon_loader.request(icon_path)
+            return self.placeholder_icon
+        return icon
+
+    def _on_icon_ready(self, icon_path, icon):
+        game_ids = self._icon_requests.pop(icon_path, None)
+        if not game_ids:
+            return
+        self._icons_ready |= game_ids
+        if not self._icon_refresh.isActive():
+            self._icon_refresh.start()
+
+    def _refresh_icons(self):
+        game_ids, self._icons_ready = self._icons_ready, set()
+        # Ids rather than rows were kept, rows may have moved since
+        rows = sorted(self.repository.rows_of(game_ids).values())
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                self.dataChanged.emit(self.index(rows[start]), self.index(rows[i - 1]), [Qt.ItemDataRole.DecorationRole])
+                start = i
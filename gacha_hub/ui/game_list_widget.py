@@ -1,26 +1,62 @@
-from PySide6.QtWidgets import QListWidget, QListWidgetItem
-from PySide6.QtCore import Qt, QTimer, QPoint, Signal
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+from PySide6.QtCore import Qt, QTimer, QPoint, QModelIndex, Signal
 
-class RemovableListWidget(QListWidget):
-    longPressed = Signal(QListWidgetItem)
-    itemClickedForDelete = Signal(QListWidgetItem)
+SHAKE_DEGREES = 2
+SHAKE_INTERVAL_MS = 100
+
+class ShakeDelegate(QStyledItemDelegate):
+    """Draws rows tilted back and forth while the view is in delete mode"""
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.paint_count = 0
+
+    def paint(self, painter, option, index):
+        self.paint_count += 1
+        if not self.view.delete_mode:
+            super().paint(painter, option, index)
+            return
+        # Neighbouring rows tilt in opposite directions and flip every frame
+        angle = SHAKE_DEGREES if (index.row() + self.view.shake_frame) % 2 else -SHAKE_DEGREES
+        center = option.rect.center()
+        painter.save()
+        painter.translate(center)
+        painter.rotate(angle)
+        painter.translate(-center)
+        super().paint(painter, option, index)
+        painter.restore()
+
+class RemovableListView(QListView):
+    longPressed = Signal(QModelIndex)
+    itemClickedForDelete = Signal(QModelIndex)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._long_press_timer = QTimer(self)
         self._long_press_timer.setSingleShot(True)
         self._long_press_timer.timeout.connect(self._on_long_press)
-        self._pressed_item = None
+        self._pressed_index = QModelIndex()
         self._pressed_pos = QPoint()
         self.delete_mode = False
-        self._shake_timers = []
-        self.setDragDropMode(QListWidget.NoDragDrop)
+        # One clock drives the shake for every row; each tick repaints the
+        # viewport, and the view only paints the rows that are visible
+        self.shake_frame = 0
+        self._shake_clock = QTimer(self)
+        self._shake_clock.setInterval(SHAKE_INTERVAL_MS)
+        self._shake_clock.timeout.connect(self._next_shake_frame)
+        self.shake_delegate = ShakeDelegate(self)
+        self.setItemDelegate(self.shake_delegate)
+        # Every row has the same height, so the view can lay out and scroll
+        # large libraries in one pass without measuring each item
+        self.setUniformItemSizes(True)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.NoDragDrop)
         self.setDragEnabled(False)
 
     def mousePressEvent(self, event):
-        item = self.itemAt(event.pos())
-        if item:
-            self._pressed_item = item
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            self._pressed_index = index
             self._pressed_pos = event.pos()
             if not self.delete_mode:
                 self._long_press_timer.start(1500)  # 1.5 seconds
@@ -29,18 +65,18 @@ class RemovableListWidget(QListWidget):
     def mouseReleaseEvent(self, event):
         self._long_press_timer.stop()
         if self.delete_mode:
-            item = self.itemAt(event.pos())
-            if item:
-                self.itemClickedForDelete.emit(item)
-        self._pressed_item = None
+            index = self.indexAt(event.pos())
+            if index.isValid():
+                self.itemClickedForDelete.emit(index)
+        self._pressed_index = QModelIndex()
         # Disable drag after reordering
-        self.setDragDropMode(QListWidget.NoDragDrop)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.NoDragDrop)
         self.setDragEnabled(False)
         super().mouseReleaseEvent(event)
 
     def _on_long_press(self):
-        if self._pressed_item and not self.delete_mode:
-            self.longPressed.emit(self._pressed_item)
+        if self._pressed_index.isValid() and not self.delete_mode:
+            self.longPressed.emit(self._pressed_index)
 
     def set_delete_mode(self, enabled):
         self.delete_mode = enabled
@@ -52,39 +88,58 @@ class RemovableListWidget(QListWidget):
 
     def enable_reorder_mode(self):
         if not self.delete_mode:
-            self.setDragDropMode(QListWidget.InternalMove)
+            self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
             self.setDragEnabled(True)
             self.setDefaultDropAction(Qt.MoveAction)
 
+    def dropEvent(self, event):
+        if event.source() is not self or self.model() is None:
+            super().dropEvent(event)
+            return
+        if not self.selectedIndexes():
+            event.ignore()
+            return
+        target = self.indexAt(event.position().toPoint())
+        destination = target.row() if target.isValid() else self.model().rowCount()
+        if target.isValid() and event.position().y() > self.visualRect(target).center().y():
+            destination += 1
+        self.move_selected_rows(destination)
+        # The model has already moved the rows; a MoveAction would make the
+        # view remove the source rows afterwards
+        event.setDropAction(Qt.CopyAction)
+        event.accept()
+
+    def move_selected_rows(self, destination):
+        """
+        Move the selected rows, in order, to sit before row `destination`.
+
+        The selection need not be contiguous: a single run of rows is moved
+        with one moveRows, otherwise each row is moved on its own.
+        """
+        model = self.model()
+        rows = sorted({index.row() for index in self.selectedIndexes()})
+        if not rows:
+            return
+        if rows[-1] - rows[0] + 1 == len(rows):
+            model.moveRows(QModelIndex(), rows[0], len(rows), QModelIndex(), destination)
+            return
+        # Rows above the destination go last-first, each just above the one
+        # moved before it; rows below go first-first, each just below the last
+        insert_at = destination
+        for row in reversed([row for row in rows if row < destination]):
+            model.moveRows(QModelIndex(), row, 1, QModelIndex(), insert_at)
+            insert_at -= 1
+        for offset, row in enumerate(row for row in rows if row >= destination):
+            model.moveRows(QModelIndex(), row, 1, QModelIndex(), destination + offset)
+
     def start_shake(self):
-        for i in range(self.count()):
-            item_widget = self.itemWidget(self.item(i))
-            if not item_widget:
-                item_widget = self.visualItemRect(self.item(i))
-            timer = QTimer(self)
-            timer.timeout.connect(lambda i=i: self._shake_item(i))
-            timer.start(80 + (i % 3) * 20)
-            self._shake_timers.append(timer)
+        self.shake_frame = 0
+        self._shake_clock.start()
 
     def stop_shake(self):
-        for timer in self._shake_timers:
-            timer.stop()
-        self._shake_timers.clear()
+        self._shake_clock.stop()
         self.viewport().update()
 
-    def _shake_item(self, i):
-        self.viewport().update(self.visualItemRect(self.item(i)))
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if self.delete_mode:
-            from PySide6.QtGui import QPainter
-            painter = QPainter(self.viewport())
-            for i in range(self.count()):
-                rect = self.visualItemRect(self.item(i))
-                offset = 2 * ((i % 2) * 2 - 1)
-                painter.save()
-                painter.translate(rect.center())
-                painter.rotate(offset)
-                painter.translate(-rect.center())
-                painter.restore() 
\ No newline at end of file
+    def _next_shake_frame(self):
+        self.shake_frame += 1
+        self.viewport().update()
@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QIcon, QImage, QImageReader, QPixmap
+from gacha_hub.core.metrics import timed
+from gacha_hub.utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+ICON_SIZE = 64
+
+# Extensions QIcon can show but QImageReader cannot decode off the GUI thread
+NATIVE_ICON_EXTENSIONS = ('.exe', '.dll', '.lnk')
+
+# Cached icons are stored as raw ARGB32 pixels so loading them needs no decoding
+_CACHE_MAGIC = b"GHI1"
+_CACHE_HEADER = struct.Struct("<4sIII")  # magic, width, height, bytes per line
+_CACHE_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+def icon_cache_key(path: str) -> Optional[str]:
+    """Cache key for an icon file: its path, mtime and size. None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class IconDiskCache:
+    """Decoded, scaled icons on disk, keyed by icon_cache_key"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_app_data_dir() / "icon_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key: str) -> Optional[QImage]:
+        try:
+            with open(self.cache_dir / key, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _CACHE_HEADER.size:
+            return None
+        magic, width, height, bytes_per_line = _CACHE_HEADER.unpack_from(data)
+        pixels = data[_CACHE_HEADER.size:]
+        if magic != _CACHE_MAGIC or len(pixels) != bytes_per_line * height:
+            return None
+        # copy() detaches the image from the Python buffer it wraps
+        return QImage(pixels, width, height, bytes_per_line, _CACHE_FORMAT).copy()
+
+    def store(self, key: str, image: QImage) -> None:
+        header = _CACHE_HEADER.pack(_CACHE_MAGIC, image.width(), image.height(), image.bytesPerLine())
+        tmp_path = self.cache_dir / (key + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(bytes(image.constBits()))
+            os.replace(tmp_path, self.cache_dir / key)
+        except OSError as e:
+            logger.warning("Failed to cache icon %s: %s", key, e)
+
+class _IconTask(QRunnable):
+    def __init__(self, loader: "IconLoader", path: str):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+
+    def run(self):
+        self.loader._finished.emit(self.path, self.loader._resolve(self.path))
+
+class IconLoader(QObject):
+    """
+    Resolve icons on a worker thread pool.
+
+    request() returns immediately; iconReady fires on the GUI thread once the
+    icon is decoded. Workers only touch QImage, the QPixmap/QIcon conversion
+    happens on the GUI thread. Decoded images go to an IconDiskCache so later
+    launches skip decoding entirely.
+    """
+
+    iconReady = Signal(str, QIcon)
+    _finished = Signal(str, QImage)
+
+    def __init__(self, cache_dir: Optional[Path] = None, parent: Optional[QObject] = None, max_threads: Optional[int] = None):
+        super().__init__(parent)
+        self.disk_cache = IconDiskCache(cache_dir)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._icons: Dict[str, QIcon] = {}
+        self._pending: Set[str] = set()
+        self._failed: Set[str] = set()
+        # Counted on the worker threads, so only change them under _stats_lock
+        self.decoded = 0
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+        self._finished.connect(self._on_finished, Qt.ConnectionType.QueuedConnection)
+
+    def cached(self, path: str) -> Optional[QIcon]:
+        """Get an already resolved icon without scheduling any work"""
+        return self._icons.get(path)
+
+    def request(self, path: str) -> None:
+        """Resolve an icon in the background, iconReady fires when done"""
+        if not path or path in self._pending or path in self._failed:
+            return
+        if path in self._icons:
+            self.iconReady.emit(path, self._icons[path])
+            return
+        self._pending.add(path)
+        self.pool.start(_IconTask(self, path))
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Block until all queued work has finished, mainly for tests"""
+        return self.pool.waitForDone(timeout_ms)
+
+    @timed("icon.resolve")
+    def _resolve(self, path: str) -> QImage:
+        """Runs on a worker thread: read from the disk cache or decode and cache"""
+        key = icon_cache_key(path)
+        if key is None:
+            return QImage()
+        image = self.disk_cache.load(key)
+        if image is not None:
+            with self._stats_lock:
+                self.cache_hits += 1
+            return image
+        reader = QImageReader(path)
+        image = reader.read()
+        if image.isNull():
+            return image
+        with self._stats_lock:
+            self.decoded += 1
+        if image.width() > ICON_SIZE or image.height() > ICON_SIZE:
+            image = image.scaled(ICON_SIZE, ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        image = image.convertToFormat(_CACHE_FORMAT)
+        self.disk_cache.store(key, image)
+        return image
+
+    def _on_finished(self, path: str, image: QImage):
+        self._pending.discard(path)
+        if not image.isNull():
+            icon = QIcon(QPixmap.fromImage(image))
+        elif os.path.splitext(path)[1].lower() in NATIVE_ICON_EXTENSIONS and os.path.exists(path):
+            icon = QIcon(path)
+        else:
+            # Remember the failure so repaints don't keep retrying it
+            self._failed.add(path)
+            return
+        self._icons[path] = icon
+        self.iconReady.emit(path, icon)
@@ -0,0 +1,171 @@
+import logging
+import threading
+from typing import Iterable, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from gacha_hub.core.records import GameRecord
+from gacha_hub.core.scanner import ProcessScanner
+from gacha_hub.core.supervisor import ProcessSupervisor
+
+logger = logging.getLogger(__name__)
+
+class _LaunchTask(QRunnable):
+    def __init__(self, service: "LaunchService", game: dict):
+        super().__init__()
+        self.service = service
+        self.game = game
+
+    def run(self):
+        game_id = self.game["id"]
+        try:
+            process_id = self.service._spawn(self.game)
+        except Exception as e:
+            logger.error("Launch failed for %s: %s", self.game, e)
+            self.service.launchFailed.emit(game_id, str(e))
+            return
+        self.service.launched.emit(game_id, process_id)
+
+class LaunchService(QObject):
+    """
+    Launch games off the GUI thread and report when they exit.
+
+    Spawning runs on a small thread pool, the started process goes to a
+    ProcessSupervisor, and its watcher thread reports the exit. Signals are
+    emitted from those threads and delivered queued on the GUI thread.
+    Games started outside the hub are picked up by a ProcessScanner once
+    start_scanning() is called, and end in sessionEnded the same way.
+    """
+
+    launched = Signal(int, int)  # game id, process id (0 if handed to the shell)
+    launchFailed = Signal(int, str)  # game id, error message
+    sessionEnded = Signal(int, float)  # game id, session length in seconds
+
+    # Sessions are only reported, the owner of the service records them
+    records_sessions = False
+
+    def __init__(self, parent: Optional[QObject] = None, poll_interval: float = 1.0):
+        super().__init__(parent)
+        self.supervisor = ProcessSupervisor(on_exit=self._on_exit, poll_interval=poll_interval)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.scanner = ProcessScanner(self.supervisor.watcher)
+
+    def launch(self, game: dict) -> None:
+        """Start a game record in the background, returns immediately"""
+        self.pool.start(_LaunchTask(self, GameRecord.from_dict(game)))
+
+    def start_scanning(self, games: Iterable[dict], interval: Optional[float] = None) -> None:
+        """Watch for library games started outside the hub, scanning every `interval` seconds"""
+        if interval is not None:
+            self.scanner.interval = interval
+        self.scanner.set_games(games)
+        self.scanner.start()
+
+    def update_games(self, games: Iterable[dict]) -> None:
+        """Tell the scanner about a changed library"""
+        self.scanner.set_games(games)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Block until queued launches have been spawned, mainly for tests"""
+        return self.pool.waitForDone(timeout_ms)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Finish pending launches and stop supervising; running games keep running"""
+        self.scanner.stop(timeout)
+        self.pool.waitForDone(-1 if timeout is None else int(timeout * 1000))
+        self.supervisor.stop(timeout)
+
+    def _spawn(self, game: dict) -> int:
+        """Runs on the pool, returns the process id or 0 if the game was handed to the shell"""
+        process = self.supervisor.launch(game)
+        return process.pid if process is not None else 0
+
+    def _on_exit(self, game_id: int, elapsed: float, returncode: Optional[int]) -> None:
+        self.sessionEnded.emit(game_id, elapsed)
+
+class DaemonLaunchService(QObject):
+    """
+    The LaunchService interface, backed by a running tracking daemon.
+
+    Launches and scanning happen in the daemon (see gacha_hub.daemon), which
+    also records the sessions, so games stay tracked after the window
+    closes. A thread listens for the daemon's events and re-emits them as
+    signals.
+    """
+
+    launched = Signal(int, int)
+    launchFailed = Signal(int, str)
+    sessionEnded = Signal(int, float)
+
+    # The daemon writes finished sessions to the database itself
+    records_sessions = True
+
+    def __init__(self, client, events, parent: Optional[QObject] = None):
+        """
+        Args:
+            client: DaemonClient for requests
+            events: A second DaemonClient, used only for events
+        """
+        super().__init__(parent)
+        self.client = client
+        self.events = events
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._listener = threading.Thread(target=self._listen, name="DaemonEvents", daemon=True)
+        self._listener.start()
+
+    @classmethod
+    def attach(cls, parent: Optional[QObject] = None) -> Optional["DaemonLaunchService"]:
+        """Attach to the daemon, or None if none is running"""
+        from gacha_hub.daemon import DaemonClient
+        client = DaemonClient.connect()
+        if client is None:
+            return None
+        events = DaemonClient.connect()
+        if events is None:
+            client.close()
+            return None
+        try:
+            events.subscribe()
+        except Exception as e:
+            logger.warning("Could not subscribe to the daemon: %s", e)
+            client.close()
+            events.close()
+            return None
+        logger.info("Attached to the tracking daemon")
+        return cls(client, events, parent)
+
+    def launch(self, game: dict) -> None:
+        self.pool.start(_LaunchTask(self, GameRecord.from_dict(game)))
+
+    def start_scanning(self, games: Iterable[dict], interval: Optional[float] = None) -> None:
+        """The daemon scans on its own schedule, it only needs the library"""
+        self.update_games(games)
+
+    def update_games(self, games: Iterable[dict]) -> None:
+        try:
+            self.client.set_games(list(games))
+        except Exception as e:
+            logger.error("Could not send the library to the daemon: %s", e)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        return self.pool.waitForDone(timeout_ms)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Detach from the daemon, which keeps tracking running games"""
+        self.pool.waitForDone(-1 if timeout is None else int(timeout * 1000))
+        self.events.unsubscribe()
+        self._listener.join(timeout)
+        self.events.close()
+        self.client.close()
+
+    def _spawn(self, game: dict) -> int:
+        return self.client.launch(game)
+
+    def _listen(self) -> None:
+        from gacha_hub.daemon import EVENT_SESSION_ENDED
+        try:
+            for event in self.events.events():
+                if event["event"] == EVENT_SESSION_ENDED:
+                    self.sessionEnded.emit(event["game_id"], event["seconds"])
+        except Exception as e:
+            logger.warning("Lost the connection to the daemon: %s", e)
@@ -1,92 +1,46 @@
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QPushButton, QFileDialog, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QAbstractItemView, QPushButton, QFileDialog, QMessageBox
 )
-from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QPropertyAnimation, QEasingCurve
+from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QPropertyAnimation, QEasingCurve, QRunnable, QThreadPool
 from PySide6.QtGui import QIcon
+import logging
 import os
-import sys
-import configparser
-from gacha_hub.core.launcher import GameLauncher
-import shlex
-from .game_list_widget import RemovableListWidget
-from .icon_utils import get_valid_icon, extract_shortcut_info, extract_url_info
-from gacha_hub.ui.persistence import save_games, load_games, get_save_path
-
-if sys.platform.startswith("win"):
-    import pythoncom
-    import win32com.client
-
-def get_valid_icon(path, default_icon):
-    if path and os.path.exists(path):
-        ext = os.path.splitext(path)[1].lower()
-        if ext in ['.ico', '.exe', '.dll']:
-            icon = QIcon(path)
-            if not icon.isNull():
-                return icon
-    return QIcon(default_icon)
-
-def extract_shortcut_info(lnk_path, default_icon):
-    pythoncom.CoInitialize()
-    shell = win32com.client.Dispatch("WScript.Shell")
-    shortcut = shell.CreateShortcut(lnk_path)
-    target = shortcut.Targetpath
-    arguments = shortcut.Arguments
-    icon_location = shortcut.IconLocation.split(",")[0] if shortcut.IconLocation else ""
-    name = os.path.splitext(os.path.basename(lnk_path))[0]
-    icon = None
-    if icon_location and os.path.exists(icon_location):
-        ext = os.path.splitext(icon_location)[1].lower()
-        if ext in ['.ico', '.exe', '.dll']:
-            icon = QIcon(icon_location)
-    if (not icon or icon.isNull()) and target and os.path.exists(target):
-        ext = os.path.splitext(target)[1].lower()
-        if ext in ['.ico', '.exe', '.dll']:
-            icon = QIcon(target)
-    if (not icon or icon.isNull()) and os.path.exists(lnk_path):
-        icon = QIcon(lnk_path)
-    if not icon or icon.isNull():
-        icon = QIcon(default_icon)
-    # If both target and arguments are empty, treat as protocol shortcut
-    if not target and not arguments:
-        unique_key = lnk_path
-        return name, "", "", icon, unique_key
-    unique_key = f"{target} {arguments}".strip()
-    return name, target, arguments, icon, unique_key
-
-def extract_url_info(url_path, browser_icon, default_icon):
-    config = configparser.ConfigParser()
-    config.read(url_path, encoding="utf-8")
-    url = None
-    name = os.path.splitext(os.path.basename(url_path))[0]
-    icon = None
-    icon_file = None
-    icon_index = 0
-    if "InternetShortcut" in config:
-        section = config["InternetShortcut"]
-        url = section.get("URL", None)
-        icon_file = section.get("IconFile", None)
-        icon_index = int(section.get("IconIndex", 0))
-    if not url:
-        print(f"[DEBUG] Could not find URL in {url_path}. Config sections: {config.sections()}")
-        print(f"[DEBUG] Config content: {dict(config.items('InternetShortcut')) if 'InternetShortcut' in config else {}}")
-    if icon_file:
-        icon_file = os.path.expandvars(icon_file)
-    if icon_file and os.path.exists(icon_file):
-        ext = os.path.splitext(icon_file)[1].lower()
-        if ext in ['.ico', '.exe', '.dll']:
-            icon = QIcon(icon_file)
-    if not icon or icon.isNull():
-        if browser_icon and os.path.exists(browser_icon):
-            icon = QIcon(browser_icon)
-    if not icon or icon.isNull():
-        icon = QIcon(default_icon)
-    if url:
-        unique_key = f"{url}|{icon_file}" if icon_file else url
-    else:
-        unique_key = url_path
-    return name, url, icon, unique_key
+from .game_list_widget import RemovableListView
+from .game_list_model import GameListModel
+from .icon_loader import IconLoader
+from gacha_hub.core.metrics import recorder, span
+from gacha_hub.ui.persistence import import_into_repository
+
+logger = logging.getLogger(__name__)
+
+# Parsing shortcuts, launching and the database layer are imported where
+# they are first used, so they don't delay the window appearing. See
+# benchmarks/bench_startup.py for the startup import budget.
+
+class _FolderScanTask(QRunnable):
+    """Parses the shortcuts under a folder on the thread pool"""
+
+    def __init__(self, window: "MainWindow", folder, known_keys, notify):
+        super().__init__()
+        self.window = window
+        self.folder = folder
+        self.known_keys = known_keys
+        self.notify = notify
+
+    def run(self):
+        from gacha_hub.core.shortcuts import collect_shortcuts
+        try:
+            records = collect_shortcuts(self.folder, self.known_keys.__contains__)
+        except Exception as e:
+            logger.exception("Failed to scan %s: %s", self.folder, e)
+            records = []
+        self.window._folderScanned.emit(self.folder, records, self.notify)
 
 class MainWindow(QMainWindow):
+    # Emitted on the GUI thread once a folder import has added its games
+    folderImported = Signal(str, object)  # folder, list of the new game records
+    _folderScanned = Signal(str, object, bool)  # from _FolderScanTask: folder, parsed records, notify
+
     DEFAULT_TRASH_STYLE = (
         "background: #b2bec3; color: #2d3436; border: 2px solid #636e72; border-radius: 8px; font-size: 20px;"
     )
@@ -94,11 +48,29 @@ class MainWindow(QMainWindow):
         "background: #e74c3c; color: white; border: 2px solid #b03a2e; border-radius: 8px; font-size: 20px;"
     )
 
-    def __init__(self):
+    def __init__(self, repository=None, save_path=None, load=True, icon_cache_dir=None):
+        """
+        Args:
+            repository: GameRepository to show, defaults to the app database
+            save_path: Legacy games.json to import, None for the default
+            load: Open the library straight away. Pass False to show the
+                window first and call load_library() afterwards.
+            icon_cache_dir: Where decoded icons are cached, defaults to the
+                app data dir
+        """
         super().__init__()
+        self.repository = None
+        self.game_model = None
+        self.session_factory = None
+        self.playtime_buffer = None
+        self.launch_service = None
+        self.import_pool = QThreadPool(self)
+        self.import_pool.setMaxThreadCount(1)
+        self._folderScanned.connect(self._on_folder_scanned)
+        self._closed = False
+        self.save_path = save_path  # legacy games.json to import, None for the default
         self.setWindowTitle("Gacha Game Hub")
         self.setMinimumSize(900, 600)
-        self.games = []  # List of dicts: {name, path, icon, type, launch_target, unique_key, exe, args}
         self.icon_path = os.path.join(os.path.dirname(__file__), "assets", "icons", "game.png")
         self.browser_icon_path = os.path.join(os.path.dirname(__file__), "assets", "icons", "browser.png")
         # Set the window icon to logo.jpg
@@ -106,8 +78,31 @@ class MainWindow(QMainWindow):
         if os.path.exists(logo_path):
             self.setWindowIcon(QIcon(logo_path))
         self.delete_mode = False
+        self.placeholder_icon = QIcon(self.icon_path)
+        self.icon_loader = IconLoader(cache_dir=icon_cache_dir, parent=self)
         self.setup_ui()
         self.apply_styles()
+        if load:
+            self.load_library(repository)
+
+    def load_library(self, repository=None):
+        """Open the game library and fill the list"""
+        with span("library.load"):
+            from gacha_hub.database.engine import create_session_factory, get_engine
+            if repository is None:
+                from gacha_hub.database.repository import GameRepository
+                repository = GameRepository(get_engine())
+            self.repository = repository
+            self.session_factory = create_session_factory(repository.engine)
+            from gacha_hub.core.stats import PlaytimeBuffer
+            # Its own session, the buffer flushes from a background thread
+            self.playtime_buffer = PlaytimeBuffer(self.session_factory())
+            self.playtime_buffer.start()
+            self.game_model = GameListModel(self.repository, self.icon_loader, self.placeholder_icon, self.icon_path, self)
+            self.game_list.setModel(self.game_model)
+            self.load_games_from_file()
+        self.add_game_btn.setEnabled(True)
+        self.import_folder_btn.setEnabled(True)
 
     def setup_ui(self):
         main_widget = QWidget()
@@ -122,29 +117,32 @@ class MainWindow(QMainWindow):
         self.trash_btn.setStyleSheet(self.DEFAULT_TRASH_STYLE)
         self.trash_btn.clicked.connect(self.toggle_delete_mode)
         sidebar.addWidget(self.trash_btn)
-        print("[DEBUG] Trash button added to sidebar")
 
-        self.game_list = RemovableListWidget(self)
+        self.game_list = RemovableListView(self)
         self.game_list.setFixedWidth(220)
-        self.game_list.itemClicked.connect(self.launch_selected_game)
+        self.game_list.clicked.connect(self.launch_selected_game)
         self.game_list.longPressed.connect(self.enable_reorder_mode)
         self.game_list.itemClickedForDelete.connect(self.on_long_press_item)
-        self.game_list.model().rowsMoved.connect(self.on_games_reordered)
         sidebar.addWidget(self.game_list)
 
         self.add_game_btn = QPushButton("+ Add Game")
         self.add_game_btn.setMaximumWidth(220)
         self.add_game_btn.setMinimumWidth(220)
         self.add_game_btn.clicked.connect(self.add_game)
+        self.add_game_btn.setEnabled(False)  # until the library is loaded
         sidebar.addWidget(self.add_game_btn)
 
+        self.import_folder_btn = QPushButton("Import Folder")
+        self.import_folder_btn.setMaximumWidth(220)
+        self.import_folder_btn.setMinimumWidth(220)
+        self.import_folder_btn.clicked.connect(self.import_folder)
+        self.import_folder_btn.setEnabled(False)
+        sidebar.addWidget(self.import_folder_btn)
+
         main_layout.addLayout(sidebar)
         self.main_area = QWidget()
         main_layout.addWidget(self.main_area)
 
-        # Load games from persistence
-        self.load_games_from_file()
-
     def apply_styles(self):
         qss_path = os.path.join(os.path.dirname(__file__), "assets", "styles.qss")
         if os.path.exists(qss_path):
@@ -152,123 +150,172 @@ class MainWindow(QMainWindow):
                 self.setStyleSheet(f.read())
 
     def is_duplicate(self, unique_key):
-        for game in self.games:
-            if game["unique_key"] == unique_key:
-                return True
-        return False
+        return self.repository.get_by_key(unique_key) is not None
 
     def add_game(self):
         file_dialog = QFileDialog(self, "Select Game Executable, Shortcut, or Internet Shortcut")
         file_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
         file_dialog.setNameFilter("Executables (*.exe *.bat *.sh *.app *.lnk *.url);;All Files (*)")
         if file_dialog.exec():
-            file_path = file_dialog.selectedFiles()[0]
-            ext = os.path.splitext(file_path)[1].lower()
-            print(f"[DEBUG] Adding game: {file_path} (ext: {ext})")
-            game_name = None
-            icon = None
-            launch_target = file_path
-            game_type = "file"
-            unique_key = None
-            exe = None
-            args = None
-
-            if ext == ".lnk" and sys.platform.startswith("win"):
-                try:
-                    game_name, exe, args, icon, unique_key = extract_shortcut_info(file_path, self.icon_path)
-                    launch_target = (exe, args)
-                    game_type = "shortcut"
-                    # Try to get the icon path from the shortcut, fallback to default
-                    icon_path = None
-                    if hasattr(icon, 'name') and icon.name():
-                        icon_path = icon.name()
-                    elif os.path.exists(file_path):
-                        icon_path = file_path
-                    else:
-                        icon_path = self.icon_path
-                    print(f"[DEBUG] Shortcut extracted: exe={exe}, args={args}, icon={icon}, unique_key={unique_key}")
-                except Exception as e:
-                    print(f"Failed to extract shortcut info: {e}")
-                    game_name = os.path.splitext(os.path.basename(file_path))[0]
-                    icon = QIcon(self.icon_path)
-                    icon_path = self.icon_path
-                    unique_key = file_path
-                    launch_target = (file_path, "")
-                    exe = file_path
-                    args = ""
-            elif ext == ".exe":
-                game_name = os.path.splitext(os.path.basename(file_path))[0]
-                icon = get_valid_icon(file_path, self.icon_path)
-                icon_path = file_path if not icon.isNull() else self.icon_path
-                print(f"[DEBUG] EXE icon: {file_path}, icon.isNull={icon.isNull()}")
-                if icon.isNull():
-                    print(f"[DEBUG] Icon for {file_path} is null, using default icon: {self.icon_path}")
-                launch_target = file_path
-                game_type = "exe"
-                unique_key = file_path
-            elif ext == ".url":
-                game_name, url, icon, unique_key = extract_url_info(file_path, self.browser_icon_path, self.icon_path)
-                icon_path = self.browser_icon_path if not icon.isNull() else self.icon_path
-                print(f"[DEBUG] URL extracted: url={url}, icon={icon}, unique_key={unique_key}")
-                launch_target = url
-                game_type = "url"
-            else:
+            self.add_game_from_path(file_dialog.selectedFiles()[0])
+
+    def import_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select a Folder of Shortcuts")
+        if folder:
+            self.import_games_from_folder(folder, notify=True)
+
+    def import_games_from_folder(self, folder, notify=False):
+        """
+        Add every new shortcut, internet shortcut and executable under a folder.
+
+        The files are parsed on a worker thread, so this returns straight
+        away. The games are added on the GUI thread afterwards and announced
+        with folderImported.
+
+        Args:
+            folder: Folder to import, searched recursively
+            notify: Show a message box with the result when done
+        """
+        self.import_folder_btn.setEnabled(False)
+        known_keys = {game.unique_key for game in self.repository.all() if game.unique_key}
+        self.import_pool.start(_FolderScanTask(self, folder, known_keys, notify))
+
+    def _on_folder_scanned(self, folder, records, notify):
+        self.import_folder_btn.setEnabled(True)
+        if self._closed:
+            return
+        # The library may have changed while the folder was scanned
+        records = [record for record in records if not self.is_duplicate(record["unique_key"])]
+        for record in records:
+            if not record["icon_path"]:
+                record["icon_path"] = self.browser_icon_path if record["type"] == "url" else self.icon_path
+        games = self.game_model.add_games(records)
+        self.save_games_to_file()
+        logger.info("Imported %d games from %s", len(games), folder)
+        self.folderImported.emit(folder, games)
+        if notify:
+            QMessageBox.information(self, "Import Folder", f"Imported {len(games)} new games.")
+
+    def add_game_from_path(self, file_path):
+        """Add a game from an executable, shortcut or internet shortcut. Returns the new record, or None."""
+        from gacha_hub.core.shortcuts import parse_lnk_file
+        from .icon_utils import extract_url_info
+        ext = os.path.splitext(file_path)[1].lower()
+        logger.debug("Adding game: %s (ext: %s)", file_path, ext)
+        game_name = None
+        launch_target = file_path
+        game_type = "file"
+        unique_key = None
+        exe = None
+        args = None
+
+        if ext == ".lnk":
+            try:
+                shortcut = parse_lnk_file(file_path)
+                game_name = shortcut["name"]
+                exe, args = shortcut["exe"], shortcut["args"]
+                unique_key = shortcut["unique_key"]
+                launch_target = (exe, args)
+                game_type = "shortcut"
+                icon_path = shortcut["icon_path"]
+                logger.debug("Shortcut extracted: exe=%s, args=%s, icon=%s, unique_key=%s", exe, args, icon_path, unique_key)
+            except Exception as e:
+                logger.warning("Failed to extract shortcut info from %s: %s", file_path, e)
                 game_name = os.path.splitext(os.path.basename(file_path))[0]
-                icon = QIcon(self.icon_path)
                 icon_path = self.icon_path
-                print(f"[DEBUG] Other file: {file_path}, using default icon: {self.icon_path}")
-                launch_target = file_path
-                game_type = "file"
                 unique_key = file_path
+                launch_target = (file_path, "")
+                exe = file_path
+                args = ""
+        elif ext == ".exe":
+            game_name = os.path.splitext(os.path.basename(file_path))[0]
+            # Extracted by the IconLoader when the row is shown, the
+            # placeholder stays if the executable has no icon
+            icon_path = file_path
+            launch_target = file_path
+            game_type = "exe"
+            unique_key = file_path
+        elif ext == ".url":
+            game_name, url, icon, unique_key = extract_url_info(file_path, self.browser_icon_path, self.icon_path)
+            icon_path = self.browser_icon_path if not icon.isNull() else self.icon_path
+            logger.debug("URL extracted: url=%s, unique_key=%s", url, unique_key)
+            launch_target = url
+            game_type = "url"
+        else:
+            game_name = os.path.splitext(os.path.basename(file_path))[0]
+            icon_path = self.icon_path
+            logger.debug("Other file: %s, using default icon: %s", file_path, self.icon_path)
+            launch_target = file_path
+            game_type = "file"
+            unique_key = file_path
 
-            if not launch_target or self.is_duplicate(unique_key):
-                print(f"[Duplicate] Attempted unique_key: {unique_key}")
-                print(f"[Duplicate] Current unique_keys: {[g['unique_key'] for g in self.games]}")
-                QMessageBox.warning(self, "Duplicate Game", f"This game or shortcut is already in your list.")
-                return
-
-            self.games.append({
-                "name": game_name,
-                "path": file_path,
-                "icon_path": icon_path,
-                "type": game_type,
-                "launch_target": launch_target,
-                "unique_key": unique_key,
-                "exe": exe,
-                "args": args
-            })
-            item = QListWidgetItem(icon, game_name)
-            self.game_list.addItem(item)
-            print(f"[DEBUG] Game added: {game_name}, icon.isNull={icon.isNull()}, type={game_type}, unique_key={unique_key}")
-            self.save_games_to_file()
-
-    def launch_selected_game(self, item):
-        idx = self.game_list.row(item)
-        game = self.games[idx]
-        try:
-            if sys.platform.startswith("win"):
-                if game["type"] == "shortcut":
-                    exe = game.get("exe")
-                    args = game.get("args", "")
-                    if exe:  # Normal shortcut
-                        import subprocess
-                        subprocess.Popen([exe] + shlex.split(args))
-                    else:  # Protocol shortcut, launch the .lnk file itself
-                        os.startfile(game["path"])
-                else:
-                    os.startfile(game["launch_target"])
-            else:
-                import subprocess
-                if game["type"] == "url":
-                    subprocess.Popen(["xdg-open" if sys.platform.startswith("linux") else "open", game["launch_target"]])
-                else:
-                    subprocess.Popen([game["launch_target"]])
-        except Exception as e:
-            print(f"[Launch Failed] {game}")
-            print(f"[Launch Failed] Exception: {e}")
-            QMessageBox.warning(self, "Launch Failed", f"Could not launch {game['name']}.\n{e}")
+        if not launch_target or self.is_duplicate(unique_key):
+            logger.info("Duplicate game, unique_key: %s", unique_key)
+            QMessageBox.warning(self, "Duplicate Game", f"This game or shortcut is already in your list.")
+            return None
+
+        game = self.game_model.add_game({
+            "name": game_name,
+            "path": file_path,
+            "icon_path": icon_path,
+            "type": game_type,
+            "launch_target": launch_target,
+            "unique_key": unique_key,
+            "exe": exe,
+            "args": args
+        })
+        logger.debug("Game added: %s, type=%s, unique_key=%s", game_name, game_type, unique_key)
+        return game
+
+    def launch_selected_game(self, index):
+        self.get_launch_service().launch(self.game_model.game_at(index))
+
+    def get_launch_service(self):
+        """
+        The LaunchService, created on the first launch.
 
-    def enable_reorder_mode(self, item):
+        When a tracking daemon is running the window attaches to it instead,
+        and the daemon records the sessions.
+        """
+        if self.launch_service is None:
+            from .launch_service import DaemonLaunchService, LaunchService
+            self.launch_service = DaemonLaunchService.attach(self) or LaunchService(self)
+            self.launch_service.launchFailed.connect(self.on_launch_failed)
+            if not self.launch_service.records_sessions:
+                self.launch_service.sessionEnded.connect(self.on_session_ended)
+        return self.launch_service
+
+    def start_process_scanner(self, interval=None):
+        """
+        Track playtime of library games started outside the hub.
+
+        The scanner's lookup table is rebuilt shortly after the list changes.
+        """
+        service = self.get_launch_service()
+        service.start_scanning(self.repository.all(), interval)
+        self._scanner_refresh = QTimer(self)
+        self._scanner_refresh.setSingleShot(True)
+        self._scanner_refresh.setInterval(1000)
+        self._scanner_refresh.timeout.connect(lambda: service.update_games(self.repository.all()))
+        for changed in (self.game_model.rowsInserted, self.game_model.rowsRemoved, self.game_model.modelReset):
+            changed.connect(self._scanner_refresh.start)
+
+    def on_launch_failed(self, game_id, message):
+        game = self.repository.get(game_id)
+        name = game["name"] if game else game_id
+        QMessageBox.warning(self, "Launch Failed", f"Could not launch {name}.\n{message}")
+
+    def on_session_ended(self, game_id, seconds):
+        """Add a finished play session to the session log and the game's total playtime"""
+        from datetime import datetime, timedelta
+        from gacha_hub.core.sessions import SessionLog
+        from gacha_hub.database.engine import session_scope
+        ended_at = datetime.utcnow()
+        with session_scope(self.session_factory, write=True) as session:
+            SessionLog(session).record_session(game_id, ended_at - timedelta(seconds=seconds), ended_at)
+        self.playtime_buffer.add(game_id, int(seconds), ended_at)
+
+    def enable_reorder_mode(self, index):
         if not self.delete_mode:
             self.game_list.enable_reorder_mode()
 
@@ -280,53 +327,57 @@ class MainWindow(QMainWindow):
         else:
             self.trash_btn.setStyleSheet(self.DEFAULT_TRASH_STYLE)
         if not self.delete_mode:
-            self.game_list.setDragDropMode(QListWidget.NoDragDrop)
+            self.game_list.setDragDropMode(QAbstractItemView.DragDropMode.NoDragDrop)
             self.game_list.setDragEnabled(False)
 
-    def on_long_press_item(self, item):
+    def on_long_press_item(self, index):
         if self.delete_mode:
-            idx = self.game_list.row(item)
-            game = self.games[idx]
+            game = self.game_model.game_at(index)
             reply = QMessageBox.question(self, "Remove Game", f"Remove '{game['name']}' from your list?", QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.games.pop(idx)
-                self.game_list.takeItem(idx)
-                self.save_games_to_file()
+                self.game_model.remove_game(index.row())
 
     # Remove mouseReleaseEvent override from MainWindow
-    # Drag/drop logic should be handled in RemovableListWidget only
-
-    def on_games_reordered(self, *args):
-        # Update self.games order to match QListWidget
-        new_games = []
-        for i in range(self.game_list.count()):
-            item = self.game_list.item(i)
-            name = item.text()
-            # Find the matching game by name and add in new order
-            for game in self.games:
-                if game["name"] == name:
-                    new_games.append(game)
-                    break
-        self.games = new_games
-        self.save_games_to_file()
+    # Drag/drop logic is handled by RemovableListView and GameListModel.moveRows
 
     def load_games_from_file(self):
         try:
-            loaded_games = load_games()
-            print(f"[DEBUG] Loaded games from file: {loaded_games}")
-            self.games.clear()
-            self.game_list.clear()
-            for game in loaded_games:
-                icon = get_valid_icon(game.get("icon_path", self.icon_path), self.icon_path)
-                item = QListWidgetItem(icon, game["name"])
-                self.games.append(game)
-                self.game_list.addItem(item)
+            imported = import_into_repository(self.repository, self.save_path)
+            if imported:
+                logger.info("Imported %d games from games.json", imported)
+            logger.info("Loaded %d games", len(self.repository))
+            # The model reads rows from the repository on demand
+            self.game_model.reload()
         except Exception as e:
-            print(f"[DEBUG] Failed to load games: {e}")
+            logger.exception("Failed to load games: %s", e)
 
     def save_games_to_file(self):
-        try:
-            save_games(self.games)
-            print(f"[DEBUG] Games saved to file at: {get_save_path()}")
-        except Exception as e:
-            print(f"[DEBUG] Failed to save games: {e}") 
\ No newline at end of file
+        """Write out any pending changes, blocking until they are stored"""
+        with span("library.save"):
+            saved = self.repository.flush(timeout=5)
+        if saved:
+            return
+        if self.repository.write_failed:
+            # Show what the database actually holds
+            self.game_model.beginResetModel()
+            self.repository.reload()
+            self.game_model.endResetModel()
+        else:
+            logger.warning("Timed out saving games")
+
+    def closeEvent(self, event):
+        self._closed = True
+        self.import_pool.clear()
+        self.import_pool.waitForDone(5000)
+        if self.playtime_buffer is not None:
+            self.playtime_buffer.close(timeout=5)
+            self.playtime_buffer.session.close()
+        if self.launch_service is not None:
+            self.launch_service.shutdown(timeout=5)
+        if self.repository is not None:
+            self.repository.close(timeout=5)
+            from gacha_hub.database.engine import dispose_engine
+            dispose_engine()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Timings:\n%s", recorder.report())
+        super().closeEvent(event) 
\ No newline at end of file
@@ -1,24 +1,49 @@
 import os
 import json
-from pathlib import Path
+
+# The game list used to be saved to games.json. The library lives in the
+# database now, this module only reads that file for the one-time
+# import_into_repository().
 
 def get_save_path():
     # Always use project root for games.json
     project_root = os.path.dirname(os.path.abspath(__file__))
-    save_path = os.path.join(project_root, 'games.json')
-    print(f"[DEBUG] Using games.json path: {save_path}")
-    return save_path
-
-def save_games(games):
-    save_path = get_save_path()
-    tmp_path = save_path + ".tmp"
-    with open(tmp_path, 'w', encoding='utf-8') as f:
-        json.dump(games, f, ensure_ascii=False, indent=2)
-    os.replace(tmp_path, save_path)
+    return os.path.join(project_root, 'games.json')
 
-def load_games():
-    save_path = get_save_path()
+def load_games(save_path=None):
+    """Read the games saved in games.json, an empty list if there is none"""
+    save_path = save_path or get_save_path()
     if not os.path.exists(save_path):
         return []
     with open(save_path, 'r', encoding='utf-8') as f:
-        return json.load(f) 
\ No newline at end of file
+        return json.load(f)
+
+def import_into_repository(repository, save_path=None):
+    """
+    One-time import of games.json into a GameRepository.
+
+    Games whose unique_key is already in the repository are skipped, games
+    without one are always imported. Once imported the file is renamed to
+    games.json.imported so it is not read again.
+
+    Returns:
+        int: Number of games imported
+    """
+    save_path = save_path or get_save_path()
+    games = load_games(save_path)
+    if not games:
+        return 0
+    new_games = []
+    keys = set()
+    for game in games:
+        key = game.get("unique_key")
+        if key is None:
+            new_games.append(game)
+        elif key not in keys and repository.get_by_key(key) is None:
+            keys.add(key)
+            new_games.append(game)
+    repository.add_many(new_games)
+    repository.flush()
+    if os.path.exists(save_path):
+        os.replace(save_path, save_path + ".imported")
+    return len(new_games)
@@ -1,13 +1,19 @@
+import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
 def format_playtime(seconds: int) -> str:
     """Format playtime in seconds to a human-readable string"""
-    time = timedelta(seconds=seconds)
-    hours = time.seconds // 3600
-    minutes = (time.seconds % 3600) // 60
+    # Whole hours, timedelta.seconds would drop every full day
+    total = int(timedelta(seconds=seconds).total_seconds())
+    hours = total // 3600
+    minutes = (total % 3600) // 60
     
     if hours > 0:
         return f"{hours}h {minutes}m"
@@ -30,4 +36,81 @@ def get_database_path() -> Optional[Path]:
     db_path = os.getenv("DB_PATH")
     if not db_path:
         return None
-    return get_app_data_dir() / db_path 
\ No newline at end of file
+    return get_app_data_dir() / db_path 
+
+class DebouncedWriter:
+    """
+    Collect items from any thread and write them in batches on a background thread.
+
+    A batch is handed to write_batch once no new item has arrived for `delay`
+    seconds, or `max_delay` seconds after the first item of the batch,
+    whichever comes first. flush() forces the pending batch out and waits.
+    A batch that raises is handed to on_error, or logged if there is none.
+    """
+
+    def __init__(self, write_batch: Callable[[list], None], delay: float = 0.5, max_delay: float = 5.0,
+                 name: str = "DebouncedWriter", on_error: Optional[Callable[[list, Exception], None]] = None):
+        self.write_batch = write_batch
+        self.on_error = on_error
+        self.delay = delay
+        self.max_delay = max_delay
+        self._items: list = []
+        self._submitted = 0
+        self._written = 0
+        self._last_submit = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DebouncedWriter is closed")
+            self._items.append(item)
+            self._submitted += 1
+            self._last_submit = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything submitted so far, returns False on timeout"""
+        with self._cond:
+            target = self._submitted
+            if self._items:
+                self._flush_requested = True
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending items and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return
+                first = time.monotonic()
+                while not (self._closed or self._flush_requested):
+                    deadline = min(self._last_submit + self.delay, first + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._items = self._items, []
+                self._flush_requested = False
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                if self.on_error is None:
+                    logger.exception("Error writing batch: %s", e)
+                else:
+                    self.on_error(batch, e)
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
@@ -0,0 +1,68 @@
+import gc
+import os
+import pytest
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Create the QApplication for GUI tests, without needing a display"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
+
+@pytest.fixture(autouse=True)
+def isolated_app_data(tmp_path, monkeypatch):
+    """
+    Point the app data dir at a temporary home, so tests never meet a real
+    daemon, database, icon cache or log of the developer's. Child processes
+    inherit it through the environment.
+    """
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("LOCALAPPDATA", str(home / "AppData" / "Local"))
+    monkeypatch.delenv("DB_PATH", raising=False)
+    return home
+
+@pytest.fixture(autouse=True)
+def collect_qt_garbage(request):
+    """
+    Collect Qt objects a GUI test left in reference cycles while still on the
+    main thread. Otherwise a later collection may run on a worker thread,
+    where destroying them crashes the interpreter.
+    """
+    yield
+    if "qapp" in request.fixturenames:
+        gc.collect()
+
+@pytest.fixture
+def make_dummy_game(tmp_path):
+    """Factory writing executable shell scripts that stand in for games, returns their path"""
+    def make(body="exit 0", name="game.sh"):
+        path = tmp_path / name
+        path.write_text(f"#!/bin/sh\n{body}\n")
+        path.chmod(0o755)
+        return str(path)
+    return make
+
+@pytest.fixture
+def capture_selects():
+    """
+    Helper that runs a query and records the SELECTs it sends against some
+    tables, as capture_selects(session, run_query, tables) -> (result, [(statement, parameters)])
+    """
+    from sqlalchemy import event
+
+    def capture(session, run_query, tables):
+        statements = []
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and any(f"FROM {table}" in statement for table in tables):
+                statements.append((statement, parameters))
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", before_execute)
+        try:
+            result = run_query()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_execute)
+        return result, statements
+    return capture
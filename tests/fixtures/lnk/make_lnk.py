@@ -0,0 +1,138 @@
+"""
+Build the .lnk fixture corpus following [MS-SHLLINK].
+
+The files in this folder are committed; rerun this only to regenerate them:
+python tests/fixtures/lnk/make_lnk.py
+"""
+import struct
+from pathlib import Path
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+
+HAS_LINK_TARGET_ID_LIST = 1 << 0
+HAS_LINK_INFO = 1 << 1
+HAS_NAME = 1 << 2
+HAS_WORKING_DIR = 1 << 4
+HAS_ARGUMENTS = 1 << 5
+HAS_ICON_LOCATION = 1 << 6
+IS_UNICODE = 1 << 7
+HAS_EXP_STRING = 1 << 9
+
+
+def _ansi(text):
+    return text.encode("cp1252") + b"\0"
+
+
+def _wide(text):
+    return text.encode("utf-16-le") + b"\0\0"
+
+
+def _id_list():
+    # A single opaque item is enough, the parser only skips over it
+    item = b"\x1f\x50" + bytes(range(16))
+    return struct.pack("<H", len(item) + 2 + 2) + struct.pack("<H", len(item) + 2) + item + b"\0\0"
+
+
+def _link_info(local_path=None, network_share=None, suffix="", unicode_paths=False):
+    header_size = 0x24 if unicode_paths else 0x1C
+    body = b""
+    offsets = {}
+    if local_path is not None:
+        flags = 1
+        offsets["volume"] = header_size + len(body)
+        body += struct.pack("<IIII", 0x11, 3, 0x1234ABCD, 0x10) + b"\0"
+        offsets["base"] = header_size + len(body)
+        body += _ansi(local_path) if not unicode_paths else b"\0"
+    else:
+        flags = 2
+        offsets["network"] = header_size + len(body)
+        name = _ansi(network_share)
+        body += struct.pack("<IIIII", 0x14 + len(name), 0, 0x14, 0, 0) + name
+    offsets["suffix"] = header_size + len(body)
+    body += _ansi(suffix)
+    if unicode_paths:
+        offsets["base_unicode"] = header_size + len(body)
+        body += _wide(local_path)
+        offsets["suffix_unicode"] = header_size + len(body)
+        body += _wide(suffix)
+    header = struct.pack(
+        "<IIIIIII", header_size + len(body), header_size, flags, offsets.get("volume", 0),
+        offsets.get("base", 0), offsets.get("network", 0), offsets["suffix"])
+    if unicode_paths:
+        header += struct.pack("<II", offsets["base_unicode"], offsets["suffix_unicode"])
+    return header + body
+
+
+def _string(text, unicode):
+    data = text.encode("utf-16-le") if unicode else text.encode("cp1252")
+    return struct.pack("<H", len(text)) + data
+
+
+def _environment_block(path):
+    ansi = path.encode("cp1252").ljust(260, b"\0")
+    wide = path.encode("utf-16-le").ljust(520, b"\0")
+    return struct.pack("<II", 0x314, 0xA0000001) + ansi + wide
+
+
+def build_lnk(local_path=None, network_share=None, suffix="", unicode_paths=False, id_list=True,
+              name=None, working_dir=None, arguments=None, icon_location=None, icon_index=0,
+              unicode=True, env_target=None):
+    """Build the bytes of a shell link"""
+    flags = IS_UNICODE if unicode else 0
+    body = b""
+    if id_list:
+        flags |= HAS_LINK_TARGET_ID_LIST
+        body += _id_list()
+    if local_path is not None or network_share is not None:
+        flags |= HAS_LINK_INFO
+        body += _link_info(local_path, network_share, suffix, unicode_paths)
+    for flag, text in ((HAS_NAME, name), (HAS_WORKING_DIR, working_dir),
+                       (HAS_ARGUMENTS, arguments), (HAS_ICON_LOCATION, icon_location)):
+        if text is not None:
+            flags |= flag
+            body += _string(text, unicode)
+    if env_target is not None:
+        flags |= HAS_EXP_STRING
+        body += _environment_block(env_target)
+    body += b"\0\0\0\0"  # TerminalBlock
+    header = struct.pack("<I16sII24sIiIH10x", 0x4C, LINK_CLSID, flags, 0x20, bytes(24), 0, icon_index, 1, 0)
+    return header + body
+
+
+FIXTURES = {
+    "Genshin Impact.lnk": dict(
+        local_path="C:\\Program Files\\Genshin Impact\\launcher.exe",
+        working_dir="C:\\Program Files\\Genshin Impact",
+        icon_location="C:\\Program Files\\Genshin Impact\\launcher.exe",
+    ),
+    "Star Rail.lnk": dict(
+        local_path="C:\\Games\\崩坏星穹铁道\\StarRail.exe", unicode_paths=True,
+        arguments="--launcher -popupwindow", icon_index=2,
+        icon_location="C:\\Games\\崩坏星穹铁道\\StarRail.ico",
+    ),
+    "Arknights.lnk": dict(
+        network_share="\\\\nas\\games", suffix="Arknights\\arknights.exe", id_list=False,
+        arguments="-windowed",
+    ),
+    "Blue Archive.lnk": dict(
+        local_path="C:\\Program Files\\Blue Archive\\BlueArchive.exe",
+        env_target="%GACHA_GAMES%\\Blue Archive\\BlueArchive.exe",
+    ),
+    "Legacy ANSI.lnk": dict(
+        local_path="C:\\Games\\Old\\old.exe", unicode=False, name="Old game",
+        arguments="/fullscreen /lang=fr",
+    ),
+    "Store App.lnk": dict(),
+}
+
+
+def main():
+    folder = Path(__file__).parent
+    for filename, options in FIXTURES.items():
+        (folder / filename).write_bytes(build_lnk(**options))
+    # A header that promises more than the file holds
+    (folder / "Truncated.lnk").write_bytes(build_lnk(**FIXTURES["Genshin Impact.lnk"])[:120])
+
+
+if __name__ == "__main__":
+    main()
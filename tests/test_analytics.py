@@ -0,0 +1,155 @@
+import random
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+from gacha_hub.core.analytics import PlaytimeAnalytics, Streaks
+from gacha_hub.database.models import Game, PlaySession
+
+@pytest.fixture
+def session():
+    """Create a test database session"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture
+def games(session):
+    games = [Game(name=f"Game {i}", executable_path=f"game{i}.exe") for i in range(3)]
+    session.add_all(games)
+    session.commit()
+    return [game.id for game in games]
+
+@pytest.fixture(params=["python", "numpy"])
+def use_numpy(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        return True
+    return False
+
+def add_sessions(session, sessions):
+    """Store (game_id, started_at, seconds) tuples as play sessions"""
+    session.add_all(
+        PlaySession(game_id=game_id, started_at=started, ended_at=started + timedelta(seconds=seconds), duration=seconds)
+        for game_id, started, seconds in sessions
+    )
+    session.commit()
+
+def test_totals_share_and_heatmap(session, games, use_numpy):
+    # 2024-01-01 was a Monday
+    add_sessions(session, [
+        (games[0], datetime(2024, 1, 1, 20, 15), 3600),
+        (games[0], datetime(2024, 1, 3, 9, 0), 1800),
+        (games[1], datetime(2024, 1, 7, 23, 59), 1800),
+    ])
+    analytics = PlaytimeAnalytics(session, use_numpy=use_numpy)
+    assert analytics.totals_by_game() == {games[0]: 5400, games[1]: 1800}
+    assert analytics.share_by_game() == {games[0]: 0.75, games[1]: 0.25}
+
+    heatmap = analytics.weekday_heatmap()
+    assert len(heatmap) == 7 and all(len(row) == 24 for row in heatmap)
+    assert heatmap[0][20] == 3600 and heatmap[2][9] == 1800 and heatmap[6][23] == 1800
+    assert sum(map(sum, heatmap)) == 7200
+    assert sum(map(sum, analytics.weekday_heatmap(games[1]))) == 1800
+
+def test_streaks(session, games, use_numpy):
+    days = [date(2024, 3, d) for d in (1, 2, 3, 4, 10, 11, 20, 21, 22)]
+    add_sessions(session, [(games[0], datetime.combine(d, datetime.min.time()) + timedelta(hours=12), 600) for d in days])
+    add_sessions(session, [(games[1], datetime(2024, 3, 22, 1), 60)])
+    analytics = PlaytimeAnalytics(session, use_numpy=use_numpy)
+    assert analytics.streaks(games[0], today=date(2024, 3, 23)) == Streaks(3, 4, date(2024, 3, 22))
+    assert analytics.streaks(games[0], today=date(2024, 3, 24)) == Streaks(0, 4, date(2024, 3, 22))
+    assert analytics.streaks(games[1], today=date(2024, 3, 22)) == Streaks(1, 1, date(2024, 3, 22))
+    assert analytics.streaks(games[2]) == Streaks(0, 0, None)
+
+def test_rolling_average(session, games, use_numpy):
+    today = date(2024, 5, 10)
+    add_sessions(session, [
+        (games[0], datetime(2024, 5, 10, 8), 700),
+        (games[0], datetime(2024, 5, 8, 8), 1400),
+        (games[1], datetime(2024, 5, 1, 8), 7000),  # before the first window
+    ])
+    analytics = PlaytimeAnalytics(session, use_numpy=use_numpy)
+    averages = analytics.rolling_average(window=7, days=3, today=today)
+    assert [day for day, _ in averages] == [date(2024, 5, 8), date(2024, 5, 9), date(2024, 5, 10)]
+    assert [value for _, value in averages] == [1400 / 7, 1400 / 7, 2100 / 7]
+    assert analytics.rolling_average(window=1, days=1, game_id=games[1], today=today) == [(today, 0.0)]
+    with pytest.raises(ValueError):
+        analytics.rolling_average(window=0)
+
+def test_backends_agree(session, games):
+    """Test that the numpy and pure Python passes give the same results"""
+    pytest.importorskip("numpy")
+    for game_id, zone in zip(games, ("UTC", "Europe/Berlin", "Australia/Adelaide")):
+        session.get(Game, game_id).reset_timezone = zone
+    session.commit()
+    rng = random.Random(3)
+    start = datetime(2023, 1, 1)
+    add_sessions(session, [
+        (rng.choice(games), start + timedelta(seconds=rng.randint(0, 400 * 86400)), rng.randint(60, 14400))
+        for _ in range(3000)
+    ])
+    today = date(2024, 1, 20)
+    def summary(analytics):
+        return (
+            analytics.totals_by_game(),
+            analytics.weekday_heatmap(),
+            analytics.weekday_heatmap(games[1]),
+            analytics.streaks(today=today),
+            analytics.streaks(games[2], today=today),
+            analytics.rolling_average(window=14, days=60, today=today),
+        )
+    assert summary(PlaytimeAnalytics(session, use_numpy=False)) == summary(PlaytimeAnalytics(session, use_numpy=True))
+
+def test_buckets_follow_game_timezone(session, games, use_numpy):
+    """Test that sessions fall on the day and hour of their game's reset timezone"""
+    shanghai, new_york = (session.get(Game, game_id) for game_id in games[:2])
+    shanghai.reset_timezone = "Asia/Shanghai"
+    new_york.reset_timezone = "America/New_York"
+    session.commit()
+    add_sessions(session, [
+        # Monday 20:00 UTC is Tuesday 04:00 in Shanghai
+        (games[0], datetime(2024, 1, 1, 20), 600),
+        # Monday 02:00 UTC is Sunday 22:00 in New York (EDT), 21:00 in winter (EST)
+        (games[1], datetime(2024, 7, 1, 2), 300),
+        (games[1], datetime(2024, 1, 8, 2), 60),
+        (games[2], datetime(2024, 1, 1, 20), 30),
+    ])
+    analytics = PlaytimeAnalytics(session, use_numpy=use_numpy)
+    assert analytics.weekday_heatmap(games[0])[1][4] == 600
+    heatmap = analytics.weekday_heatmap(games[1])
+    assert heatmap[6][22] == 300 and heatmap[6][21] == 60
+    assert analytics.weekday_heatmap(games[2])[0][20] == 30
+    assert analytics.streaks(games[1], today=date(2024, 6, 30)) == Streaks(1, 1, date(2024, 6, 30))
+    assert analytics.rolling_average(window=1, days=2, game_id=games[0], today=date(2024, 1, 2)) == [
+        (date(2024, 1, 1), 0.0), (date(2024, 1, 2), 600.0),
+    ]
+
+    # Moving a game to another timezone is picked up without a new session
+    shanghai.reset_timezone = "UTC"
+    session.commit()
+    assert analytics.weekday_heatmap(games[0])[0][20] == 600
+
+def test_results_cached_until_new_session(session, games):
+    """Test that repeated reads cost the max(id) and timezone queries and new sessions are loaded incrementally"""
+    add_sessions(session, [(games[0], datetime(2024, 1, 1, 10), 60)])
+    analytics = PlaytimeAnalytics(session)
+    assert analytics.totals_by_game() == {games[0]: 60}
+
+    statements = []
+    engine = session.get_bind()
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        first = analytics.weekday_heatmap()
+        statements.clear()
+        assert analytics.weekday_heatmap() is first
+        assert len(statements) == 2 and "max" in statements[0] and "reset_timezone" in statements[1]
+
+        add_sessions(session, [(games[1], datetime(2024, 1, 2, 10), 30)])
+        assert analytics.totals_by_game() == {games[0]: 60, games[1]: 30}
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    # Only the new session was appended
+    assert list(analytics.columns.ids) == [1, 2]
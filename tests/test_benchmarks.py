@@ -0,0 +1,44 @@
+import copy
+from benchmarks import suite, synthetic
+from gacha_hub.core.shortcuts import collect_shortcuts
+
+def test_synthetic_library_is_reproducible(tmp_path):
+    """Test that a seed always gives the same games and importable shortcut files"""
+    games = synthetic.make_games(300, seed=4)
+    assert games == synthetic.make_games(300, seed=4)
+    assert len({game["unique_key"] for game in games}) == 300
+    assert {game["type"] for game in games} == set(synthetic.GAME_TYPES)
+
+    written = synthetic.write_shortcut_files(tmp_path, 40, seed=4)
+    assert written == {".url": 20, ".lnk": 20}
+    records = collect_shortcuts(str(tmp_path))
+    assert len(records) == 40
+    assert all(record["launch_target"] for record in records)
+
+def test_run_writes_every_metric():
+    """Test that a suite run reports the settings and a timing per selected case"""
+    result = suite.run(scales=[50], cases=["persistence", "tracker"], repeats=1)
+    assert result["settings"]["scales"] == [50]
+    assert set(result["results"]) == {"persistence", "tracker"}
+    timings = result["results"]["persistence"]["50"]
+    assert set(timings) == {"load_games_ms"}
+    assert all(value >= 0 for value in timings.values())
+
+def test_compare_flags_regressions():
+    """Test that compare reports slower and faster metrics but not changes below the noise floor"""
+    baseline = {"machine": {"commit": "a"}, "results": {
+        "stats": {"1000": {"get_overview_ms": 10.0, "update_playtime_x100_ms": 50.0, "tiny_ms": 0.01}},
+        "icon_utils": {"1000": {"error": "boom"}},
+    }}
+    current = copy.deepcopy(baseline)
+    current["machine"]["commit"] = "b"
+    stats = current["results"]["stats"]["1000"]
+    stats["get_overview_ms"] = 20.0  # twice as slow
+    stats["update_playtime_x100_ms"] = 20.0  # faster
+    stats["tiny_ms"] = 0.05  # five times as slow, but below the noise floor
+    current["results"]["icon_utils"]["1000"] = {"extract_url_info_ms": 3.0}
+
+    report = suite.compare(baseline, current, threshold=0.25)
+    assert [(entry["metric"], entry["ratio"]) for entry in report["regressions"]] == [("get_overview_ms", 2.0)]
+    assert [entry["metric"] for entry in report["improvements"]] == ["update_playtime_x100_ms"]
+    assert (report["baseline_commit"], report["current_commit"]) == ("a", "b")
@@ -0,0 +1,120 @@
+import json
+import subprocess
+import sys
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from sqlmodel import Session, select
+from gacha_hub.daemon import EVENT_SESSION_ENDED, DaemonClient, DaemonError, TrackingDaemon, ping
+from gacha_hub.database.engine import create_db_engine
+from gacha_hub.database.models import Game, PlaySession
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def next_session(client):
+    return next(event for event in client.events() if event["event"] == EVENT_SESSION_ENDED)
+
+@pytest.fixture
+def daemon(tmp_path):
+    engine = create_db_engine(tmp_path / "hub.db")
+    with Session(engine) as session:
+        session.add(Game(name="Game", executable_path="game.sh"))
+        session.commit()
+    engine.dispose()
+    daemon = TrackingDaemon(str(tmp_path / "daemon.sock"), tmp_path / "hub.db", scan_interval=0, poll_interval=0.05)
+    daemon.start()
+    assert daemon.wait_ready(10)
+    yield daemon
+    daemon.stop(timeout=5)
+
+def test_sessions_recorded_and_sent_to_every_client(daemon, tmp_path, make_dummy_game):
+    """Test that a launch by one client is recorded once and announced to all of them"""
+    clients = [DaemonClient.connect(daemon.address) for _ in range(3)]
+    subscribers = [DaemonClient.connect(daemon.address) for _ in range(3)]
+    for subscriber in subscribers:
+        subscriber.subscribe()
+    try:
+        assert all(client.ping()["games"] == 1 for client in clients)
+        game = {"id": 1, "type": "exe", "launch_target": make_dummy_game("sleep 0.3")}
+        with ThreadPoolExecutor(len(subscribers)) as pool:
+            pending = [pool.submit(next_session, subscriber) for subscriber in subscribers]
+            assert clients[1].launch(game) > 0
+            events = [future.result(5) for future in pending]
+    finally:
+        for client in clients + subscribers:
+            client.close()
+    assert [event["game_id"] for event in events] == [1, 1, 1]
+
+    engine = create_db_engine(tmp_path / "hub.db")
+    with Session(engine) as session:
+        assert len(session.exec(select(PlaySession)).all()) == 1
+        assert session.get(Game, 1).total_playtime == int(events[0]["seconds"])
+    engine.dispose()
+
+def test_refused_requests(daemon, tmp_path):
+    """Test that failed launches and unknown ops are refused without dropping the connection"""
+    client = DaemonClient.connect(daemon.address)
+    try:
+        with pytest.raises(DaemonError):
+            client.launch({"id": 1, "type": "exe", "launch_target": str(tmp_path / "missing.exe")})
+        with pytest.raises(DaemonError):
+            client.request("reboot")
+        # The connection is still usable
+        assert client.ping()["running"] == []
+    finally:
+        client.close()
+
+def test_second_daemon_refused_and_stale_socket_replaced(daemon, tmp_path):
+    """Test that only one daemon serves an address and a dead one's socket is reused"""
+    with pytest.raises(DaemonError):
+        TrackingDaemon(daemon.address, tmp_path / "hub.db").start()
+    daemon.stop(timeout=5)
+    assert ping(daemon.address) is None
+    tmp_path.joinpath("daemon.sock").touch()
+    restarted = TrackingDaemon(daemon.address, tmp_path / "hub.db", scan_interval=0)
+    restarted.start()
+    try:
+        assert ping(daemon.address) is not None
+    finally:
+        restarted.stop(timeout=5)
+
+def test_daemon_starts_fast_without_qt(tmp_path):
+    """Test that python -m gacha_hub.daemon answers within a second and never imports Qt"""
+    address = str(tmp_path / "daemon.sock")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gacha_hub.daemon", "--address", address, "--db", str(tmp_path / "hub.db")],
+        cwd=ROOT,
+    )
+    try:
+        reply = None
+        while reply is None and time.perf_counter() - started < 10:
+            reply = ping(address)
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        assert reply is not None and reply["pid"] == process.pid
+        assert elapsed < 1.0
+        client = DaemonClient.connect(address)
+        client.shutdown()
+        client.close()
+        assert process.wait(10) == 0
+    finally:
+        process.kill()
+
+    script = textwrap.dedent(f"""
+        import json, sys
+        from gacha_hub.daemon import DaemonClient, TrackingDaemon
+        daemon = TrackingDaemon({str(tmp_path / "qt.sock")!r}, {str(tmp_path / "hub.db")!r}, poll_interval=0.05)
+        daemon.start()
+        daemon.wait_ready(10)
+        client = DaemonClient.connect(daemon.address)
+        client.launch({{"id": 1, "type": "exe", "launch_target": "/bin/true"}})
+        daemon.stop(timeout=5)
+        print(json.dumps(sorted(name for name in sys.modules if name.startswith("PySide6"))))
+    """)
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(output.stdout) == []
@@ -0,0 +1,90 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+from gacha_hub.core.daily_reset import DailyResetScheduler, reset_boundaries
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.models import Game, DailyTask
+
+@pytest.fixture
+def session():
+    """Create a test database session"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+def test_reset_boundaries_in_timezone():
+    """Test reset boundaries for a server reset at 04:00 UTC+8"""
+    last, following = reset_boundaries("04:00", "Asia/Shanghai", datetime(2024, 3, 10, 19, 30))
+    assert last == datetime(2024, 3, 9, 20, 0)
+    assert following == datetime(2024, 3, 10, 20, 0)
+
+def test_reset_boundaries_across_dst():
+    """Test that the local reset time is kept when DST starts"""
+    last, following = reset_boundaries("04:00", "America/New_York", datetime(2024, 3, 10, 0, 0))
+    assert last == datetime(2024, 3, 9, 9, 0)
+    assert following == datetime(2024, 3, 10, 8, 0)
+
+def test_apply_resets_only_due_tasks(session):
+    """Test that tasks completed before the last reset are rolled over"""
+    now = datetime(2024, 5, 1, 12, 0)
+    utc_game = Game(name="UTC", executable_path="a.exe", daily_reset_time="04:00")
+    late_game = Game(name="Late", executable_path="b.exe", daily_reset_time="20:00")
+    session.add_all([utc_game, late_game])
+    session.commit()
+    tasks = [
+        DailyTask(game_id=utc_game.id, name="Stale", completed=True, completed_at=now - timedelta(hours=9)),
+        DailyTask(game_id=utc_game.id, name="Fresh", completed=True, completed_at=now - timedelta(hours=1)),
+        DailyTask(game_id=late_game.id, name="Yesterday evening", completed=True, completed_at=now - timedelta(hours=15)),
+        DailyTask(game_id=late_game.id, name="Before that", completed=True, completed_at=now - timedelta(hours=17)),
+    ]
+    session.add_all(tasks)
+    session.commit()
+
+    scheduler = DailyResetScheduler(session)
+    assert scheduler.apply(now=now) == 2
+    assert [session.get(DailyTask, task.id).completed for task in tasks] == [False, True, True, False]
+
+def test_reads_skip_reset_until_next_boundary(session):
+    """Test that reading tasks only issues a reset UPDATE once per boundary"""
+    game = Game(name="Game", executable_path="a.exe")
+    session.add(game)
+    session.commit()
+    session.add(DailyTask(game_id=game.id, name="Login", completed=True, completed_at=datetime.utcnow()))
+    session.commit()
+
+    updates = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE"):
+            updates.append(statement)
+    event.listen(session.get_bind(), "before_cursor_execute", capture)
+
+    stats = StatsManager(session)
+    for _ in range(3):
+        assert stats.get_daily_tasks(game.id)[0].completed
+    stats.get_daily_tasks_by_game([game.id])
+    assert len(updates) == 1
+
+    stats.set_daily_reset(game.id, "04:00", "Asia/Tokyo")
+    stats.get_daily_tasks(game.id)
+    assert len(updates) == 3
+
+def test_malformed_reset_time(session, caplog):
+    """Test that bad reset times are refused, and a bad stored one only skips its game"""
+    good = Game(name="Good", executable_path="a.exe")
+    bad = Game(name="Bad", executable_path="b.exe", daily_reset_time="9am")
+    session.add_all([good, bad])
+    session.commit()
+    stats = StatsManager(session)
+    for reset_time in ("25:00", "9am", "4:00", ""):
+        assert not stats.set_daily_reset(good.id, reset_time, "UTC")
+    assert session.get(Game, good.id).daily_reset_time == "04:00"
+
+    yesterday = datetime(2024, 5, 1, 12, 0) - timedelta(days=1)
+    tasks = [DailyTask(game_id=game.id, name="Login", completed=True, completed_at=yesterday) for game in (good, bad)]
+    session.add_all(tasks)
+    session.commit()
+    assert DailyResetScheduler(session).apply(now=datetime(2024, 5, 1, 12, 0)) == 1
+    assert "Skipping daily reset of game" in caplog.text
+    assert [session.get(DailyTask, task.id).completed for task in tasks] == [False, True]
@@ -1,6 +1,10 @@
 import pytest
 from datetime import datetime
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateTable
 from sqlmodel import Session, SQLModel, create_engine
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.migrations import SCHEMA_VERSION, migrate
 from gacha_hub.database.models import Game, DailyTask, Event
 
 @pytest.fixture
@@ -39,4 +43,59 @@ def test_create_daily_task(session):
     
     assert task.id is not None
     assert not task.completed
-    assert task.completed_at is None 
\ No newline at end of file
+    assert task.completed_at is None
+
+
+def create_legacy_schema(engine):
+    """Create the tables without any of the indexes, like an old database"""
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            connection.exec_driver_sql(str(CreateTable(table).compile(engine)))
+
+def query_plans(session, statements):
+    """Return the EXPLAIN QUERY PLAN output for captured (statement, parameters) pairs"""
+    connection = session.connection()
+    return [
+        " ".join(row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+        for statement, parameters in statements
+    ]
+
+def test_migrate_adds_indexes():
+    """Test that migrating an old database adds the query indexes"""
+    engine = create_engine("sqlite:///:memory:")
+    create_legacy_schema(engine)
+    assert migrate(engine) == SCHEMA_VERSION
+    names = {index["name"] for table in ("event", "dailytask") for index in inspect(engine).get_indexes(table)}
+    assert {"ix_event_game_end", "ix_event_end_start", "ix_dailytask_game_completed"} <= names
+    # Running again is a no-op
+    assert migrate(engine) == SCHEMA_VERSION
+
+def test_active_events_query_uses_index(session, capture_selects):
+    """Test that get_active_events range-scans the per-game index"""
+    stats = StatsManager(session)
+    _, statements = capture_selects(session, lambda: stats.get_active_events(1), ("event",))
+    plans = query_plans(session, statements)
+    assert plans and all("USING INDEX ix_event_game_end" in plan for plan in plans)
+
+def test_daily_tasks_query_uses_index(session, capture_selects):
+    """Test that get_daily_tasks does not scan the whole table"""
+    stats = StatsManager(session)
+    _, statements = capture_selects(session, lambda: stats.get_daily_tasks(1), ("dailytask",))
+    plans = query_plans(session, statements)
+    assert plans and all("USING INDEX ix_dailytask_game_completed" in plan for plan in plans)
+
+def test_migrate_adds_reset_columns():
+    """Test that games from an old database get the default daily reset"""
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE game (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, executable_path VARCHAR NOT NULL, "
+            "total_playtime INTEGER NOT NULL, last_played DATETIME, created_at DATETIME NOT NULL)"
+        )
+        connection.exec_driver_sql("INSERT INTO game VALUES (1, 'Old', 'old.exe', 0, NULL, '2024-01-01 00:00:00')")
+    migrate(engine)
+    with Session(engine) as session:
+        game = session.get(Game, 1)
+        assert (game.daily_reset_time, game.reset_timezone) == ("04:00", "UTC")
+    sql = engine.connect().exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'game'").scalar()
+    assert "AUTOINCREMENT" in sql
@@ -0,0 +1,58 @@
+import threading
+import pytest
+from sqlalchemy import text
+from sqlmodel import select
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.engine import create_db_engine, create_session_factory, session_scope
+from gacha_hub.database.models import Game
+
+@pytest.fixture
+def factory(tmp_path):
+    engine = create_db_engine(tmp_path / "hub.db")
+    yield create_session_factory(engine)
+    engine.dispose()
+
+def test_pragmas_applied(factory):
+    with session_scope(factory) as session:
+        pragma = lambda name: session.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("mmap_size") > 0
+        assert pragma("busy_timeout") == 5000
+
+def test_session_scope_rolls_back_on_error(factory):
+    with pytest.raises(RuntimeError):
+        with session_scope(factory) as session:
+            session.add(Game(name="Lost", executable_path="lost.exe"))
+            session.flush()
+            raise RuntimeError("boom")
+    with session_scope(factory) as session:
+        assert session.exec(select(Game)).all() == []
+
+def test_concurrent_read_modify_write(factory):
+    """Test that threads updating the same row in write sessions lose no increments"""
+    with session_scope(factory) as session:
+        game = Game(name="Game", executable_path="game.exe")
+        session.add(game)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(25):
+                with session_scope(factory, write=True) as session:
+                    assert StatsManager(session).update_playtime(game.id, 1)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    # Readers carry on while the writers hold the lock
+    for _ in range(50):
+        with session_scope(factory) as session:
+            session.get(Game, game.id)
+    for thread in threads:
+        thread.join()
+    assert not errors
+    with session_scope(factory) as session:
+        assert session.get(Game, game.id).total_playtime == 150
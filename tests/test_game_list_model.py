@@ -0,0 +1,103 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtGui import QColor, QIcon, QImage
+from gacha_hub.database.engine import create_db_engine
+from gacha_hub.database.repository import GameRepository
+from gacha_hub.ui.game_list_model import GameListModel
+from gacha_hub.ui.icon_loader import IconLoader
+
+def make_game(key, icon_path=None):
+    """Build a game list record"""
+    return {"name": key, "path": f"{key}.exe", "icon_path": icon_path, "type": "exe",
+            "launch_target": f"{key}.exe", "unique_key": key, "exe": None, "args": None}
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = GameRepository(create_db_engine(tmp_path / "hub.db"), delay=0)
+    yield repository
+    repository.close()
+
+@pytest.fixture
+def model(qapp, tmp_path, repository):
+    loader = IconLoader(cache_dir=tmp_path / "cache")
+    return GameListModel(repository, loader, QIcon(), None)
+
+def names(model):
+    return [model.index(i).data() for i in range(model.rowCount())]
+
+def test_rows_follow_repository(model, repository):
+    """Test that adds and removes go through the repository"""
+    for key in "abc":
+        model.add_game(make_game(key))
+    assert names(model) == ["a", "b", "c"]
+    assert model.index(1).data(Qt.ItemDataRole.UserRole) == repository.get_by_key("b")["id"]
+
+    removed = model.remove_game(1)
+    assert removed["name"] == "b"
+    assert names(model) == ["a", "c"]
+    assert [game["name"] for game in repository.all()] == ["a", "c"]
+
+def test_refused_add_inserts_no_rows(model, repository):
+    """Test that a game the repository refuses is never announced to views"""
+    model.add_game(make_game("a"))
+    inserted = []
+    model.rowsAboutToBeInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    with pytest.raises(ValueError):
+        model.add_game(make_game("a"))
+    with pytest.raises(ValueError):
+        model.add_games([make_game("b"), make_game("b")])
+    assert inserted == [] and model.rowCount() == 1
+
+    model.add_games([make_game("b"), make_game("c")])
+    assert inserted == [(1, 2)] and names(model) == ["a", "b", "c"]
+
+def test_move_rows_updates_repository_order(model, repository):
+    """Test moving rows down and up, using the destination-before-removal convention"""
+    for key in "abcde":
+        model.add_game(make_game(key))
+    assert model.moveRows(QModelIndex(), 0, 2, QModelIndex(), 4)
+    assert names(model) == ["c", "d", "a", "b", "e"]
+    assert model.moveRow(QModelIndex(), 4, QModelIndex(), 0)
+    assert names(model) == ["e", "c", "d", "a", "b"]
+    assert [game["name"] for game in repository.all()] == names(model)
+
+def test_icons_are_requested_when_shown(model, qapp, tmp_path):
+    """Test that icons load lazily on first paint and trigger a repaint"""
+    image = QImage(16, 16, QImage.Format.Format_ARGB32)
+    image.fill(QColor(0, 120, 200))
+    icon_path = str(tmp_path / "icon.png")
+    assert image.save(icon_path)
+    model.add_game(make_game("a", icon_path))
+    assert model.icon_loader.cached(icon_path) is None
+
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(roles))
+    model.index(0).data(Qt.ItemDataRole.DecorationRole)
+    assert model.icon_loader.wait(5000)
+    qapp.processEvents()
+    model._icon_refresh.stop()
+    model._refresh_icons()
+    assert model.icon_loader.cached(icon_path) is not None
+    assert changed == [[Qt.ItemDataRole.DecorationRole]]
+
+def test_icon_refresh_covers_only_changed_rows(model, qapp, tmp_path):
+    """Test that a finished icon repaints just the rows showing it, one signal per run"""
+    image = QImage(16, 16, QImage.Format.Format_ARGB32)
+    image.fill(QColor(0, 120, 200))
+    icon_path = str(tmp_path / "icon.png")
+    assert image.save(icon_path)
+    for key, path in zip("abcde", (icon_path, icon_path, None, icon_path, None)):
+        model.add_game(make_game(key, path))
+
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append((first.row(), last.row())))
+    for row in range(model.rowCount()):
+        model.index(row).data(Qt.ItemDataRole.DecorationRole)
+    assert model.icon_loader.wait(5000)
+    qapp.processEvents()
+    model._icon_refresh.stop()
+    model._refresh_icons()
+    assert changed == [(0, 1), (3, 3)]
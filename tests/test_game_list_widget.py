@@ -0,0 +1,64 @@
+import time
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QItemSelectionModel, QStringListModel, QTimer
+from PySide6.QtWidgets import QAbstractItemView
+from gacha_hub.ui.game_list_widget import SHAKE_INTERVAL_MS, RemovableListView
+
+def paints_per_second(qapp, view, rows, seconds=0.5):
+    """Shake a list of the given size and measure delegate paint calls per second"""
+    model = QStringListModel([f"Game {i}" for i in range(rows)])
+    view.setModel(model)
+    view.resize(220, 200)
+    view.show()
+    qapp.processEvents()
+    view.set_delete_mode(True)
+    view.shake_delegate.paint_count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        qapp.processEvents()
+        time.sleep(0.005)
+    rate = view.shake_delegate.paint_count / (time.perf_counter() - start)
+    view.set_delete_mode(False)
+    return rate
+
+def test_shake_uses_a_single_clock(qapp):
+    """Test that delete mode doesn't create a timer per row"""
+    view = RemovableListView()
+    view.setModel(QStringListModel([f"Game {i}" for i in range(1000)]))
+    view.set_delete_mode(True)
+    assert len(view.findChildren(QTimer)) == 2  # long press + shake clock
+    view.set_delete_mode(False)
+    assert not view._shake_clock.isActive()
+
+def test_shake_paint_rate_is_bounded_by_viewport(qapp):
+    """Test that paint calls per second don't grow with the library size"""
+    view = RemovableListView()
+    small = paints_per_second(qapp, view, 20)
+    large = paints_per_second(qapp, view, 10_000)
+    visible_rows = 200 // view.sizeHintForRow(0) + 2
+    frames_per_second = 1000 / SHAKE_INTERVAL_MS
+    assert small > 0 and large > 0
+    assert large <= visible_rows * frames_per_second * 2
+    assert large < small * 3
+    view.close()
+
+@pytest.mark.parametrize("selected, destination, expected", [
+    ([1, 2], 5, "adebcf"),  # one run, moved down
+    ([1, 3], 5, "acebdf"),  # gap, moved down
+    ([0, 4], 2, "baecdf"),  # rows on both sides of the destination
+    ([2, 5], 0, "cfabde"),  # gap, moved to the top
+    ([0, 2], 6, "bdefac"),  # moved to the end
+])
+def test_move_selected_rows(qapp, selected, destination, expected):
+    """Test that dropped selections, contiguous or not, land together in order"""
+    view = RemovableListView()
+    view.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+    model = QStringListModel(list("abcdef"))
+    view.setModel(model)
+    for row in selected:
+        view.selectionModel().select(model.index(row), QItemSelectionModel.SelectionFlag.Select)
+    view.move_selected_rows(destination)
+    assert "".join(model.stringList()) == expected
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtGui import QColor, QImage
+from gacha_hub.ui.icon_loader import ICON_SIZE, IconLoader, icon_cache_key
+
+@pytest.fixture
+def icon_file(qapp, tmp_path):
+    """Write a large PNG to use as a game icon"""
+    image = QImage(256, 128, QImage.Format.Format_ARGB32)
+    image.fill(QColor(200, 40, 40))
+    path = str(tmp_path / "icon.png")
+    assert image.save(path)
+    return path
+
+def load(loader, qapp, path):
+    """Request an icon and wait until iconReady has been delivered"""
+    ready = []
+    loader.iconReady.connect(lambda p, icon: ready.append((p, icon)))
+    loader.request(path)
+    assert loader.wait(5000)
+    qapp.processEvents()
+    return ready
+
+def test_icon_cache_key_tracks_mtime_and_size(icon_file):
+    """Test that rewriting the file changes its cache key"""
+    key = icon_cache_key(icon_file)
+    assert key == icon_cache_key(icon_file)
+    with open(icon_file, "ab") as f:
+        f.write(b"\0")
+    assert icon_cache_key(icon_file) != key
+    assert icon_cache_key(icon_file + ".missing") is None
+
+def test_second_load_uses_disk_cache(qapp, tmp_path, icon_file):
+    """Test that a fresh loader reads the decoded icon back without decoding"""
+    first = IconLoader(cache_dir=tmp_path / "cache")
+    ready = load(first, qapp, icon_file)
+    assert [path for path, _ in ready] == [icon_file]
+    assert (first.decoded, first.cache_hits) == (1, 0)
+    size = ready[0][1].availableSizes()[0]
+    assert max(size.width(), size.height()) == ICON_SIZE
+
+    second = IconLoader(cache_dir=tmp_path / "cache")
+    ready = load(second, qapp, icon_file)
+    assert not ready[0][1].isNull()
+    assert (second.decoded, second.cache_hits) == (0, 1)
+    assert second.cached(icon_file) is not None
+
+def test_undecodable_file_is_not_reported(qapp, tmp_path):
+    """Test that files that are not images keep the placeholder"""
+    path = tmp_path / "notes.txt"
+    path.write_text("not an image")
+    loader = IconLoader(cache_dir=tmp_path / "cache")
+    assert load(loader, qapp, str(path)) == []
+    assert loader.cached(str(path)) is None
+
+def test_counters_from_many_workers(qapp, tmp_path, icon_file):
+    """Test that decodes and cache hits on parallel workers are all counted"""
+    with open(icon_file, "rb") as f:
+        data = f.read()
+    paths = []
+    for i in range(40):
+        # Trailing bytes give each copy its own cache key
+        path = tmp_path / f"icon{i}.png"
+        path.write_bytes(data + bytes([i]))
+        paths.append(str(path))
+    for expected in ((40, 0), (0, 40)):
+        loader = IconLoader(cache_dir=tmp_path / "cache", max_threads=8)
+        for path in paths:
+            loader.request(path)
+        assert loader.wait(10000)
+        assert (loader.decoded, loader.cache_hits) == expected
@@ -0,0 +1,67 @@
+import sys
+import time
+import pytest
+
+pytest.importorskip("PySide6")
+
+from gacha_hub.daemon import DaemonClient, TrackingDaemon
+from gacha_hub.ui.launch_service import DaemonLaunchService, LaunchService
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+
+def wait_for(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+def test_session_ended_signal(qapp, make_dummy_game):
+    """Test that a launch returns at once and sessionEnded arrives on the GUI thread"""
+    exe = make_dummy_game("sleep 0.3")
+    service = LaunchService(poll_interval=0.05)
+    launched, ended = [], []
+    service.launched.connect(lambda game_id, pid: launched.append((game_id, pid)))
+    service.sessionEnded.connect(lambda game_id, seconds: ended.append((game_id, seconds)))
+
+    start = time.perf_counter()
+    service.launch({"id": 5, "type": "exe", "launch_target": str(exe)})
+    assert time.perf_counter() - start < 0.1
+    assert wait_for(qapp, lambda: ended)
+    assert launched[0][0] == 5 and launched[0][1] > 0
+    assert ended[0][0] == 5 and ended[0][1] >= 0.25
+    service.shutdown(timeout=5)
+
+def test_launch_failed_signal(qapp, tmp_path):
+    """Test that a game that cannot be started is reported through launchFailed"""
+    service = LaunchService()
+    failures = []
+    service.launchFailed.connect(lambda game_id, message: failures.append((game_id, message)))
+    service.launch({"id": 9, "type": "exe", "launch_target": str(tmp_path / "missing")})
+    assert wait_for(qapp, lambda: failures)
+    assert failures[0][0] == 9
+    service.shutdown(timeout=5)
+
+def test_daemon_service_signals(qapp, tmp_path, make_dummy_game):
+    """Test that a service attached to a daemon launches through it and relays its events"""
+    daemon = TrackingDaemon(str(tmp_path / "daemon.sock"), tmp_path / "hub.db", scan_interval=0, poll_interval=0.05)
+    daemon.start()
+    try:
+        events = DaemonClient.connect(daemon.address)
+        events.subscribe()
+        service = DaemonLaunchService(DaemonClient.connect(daemon.address), events)
+        assert service.records_sessions
+        launched, ended, failures = [], [], []
+        service.launched.connect(lambda game_id, pid: launched.append((game_id, pid)))
+        service.sessionEnded.connect(lambda game_id, seconds: ended.append((game_id, seconds)))
+        service.launchFailed.connect(lambda game_id, message: failures.append((game_id, message)))
+        service.launch({"id": 5, "type": "exe", "launch_target": make_dummy_game("sleep 0.2")})
+        service.launch({"id": 9, "type": "exe", "launch_target": str(tmp_path / "missing")})
+        assert wait_for(qapp, lambda: ended and failures)
+        assert launched[0][0] == 5 and launched[0][1] > 0
+        assert ended[0][0] == 5 and failures[0][0] == 9
+        service.shutdown(timeout=5)
+        # Detaching leaves the daemon running for other windows
+        assert DaemonClient.connect(daemon.address).ping()["ok"]
+    finally:
+        daemon.stop(timeout=5)
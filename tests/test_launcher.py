@@ -1,3 +1,4 @@
+import sys
 import pytest
 from pathlib import Path
 from gacha_hub.core.launcher import GameLauncher
@@ -12,4 +13,25 @@ def test_launch_game_invalid_path():
     """Test launching a game with invalid path"""
     launcher = GameLauncher()
     result = launcher.launch_game("")
-    assert result is None 
\ No newline at end of file
+    assert result is None
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+def test_launch_game_on_posix(make_dummy_game):
+    """Test that launching works without Windows-only creation flags"""
+    process = GameLauncher.launch_game(make_dummy_game("exit 7"))
+    assert process is not None
+    assert process.wait(timeout=5) == 7
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+def test_launch_record_shortcut_arguments(tmp_path, make_dummy_game):
+    """Test that shortcut records pass their arguments through"""
+    out = tmp_path / "args.txt"
+    exe = make_dummy_game(f'echo "$@" > "{out}"')
+    game = {"id": 1, "type": "shortcut", "path": "game.desktop", "exe": exe, "args": "--server asia 'two words'"}
+    assert GameLauncher.launch_record(game).wait(timeout=5) == 0
+    assert out.read_text().strip() == "--server asia two words"
+
+def test_launch_record_missing_target(tmp_path):
+    """Test that records that can't be started raise instead of failing silently"""
+    with pytest.raises(OSError):
+        GameLauncher.launch_record({"id": 1, "type": "exe", "launch_target": str(tmp_path / "missing.exe")})
@@ -0,0 +1,57 @@
+import pytest
+from pathlib import Path
+from gacha_hub.core.lnk import LnkError, parse_lnk, read_lnk
+from gacha_hub.core.shortcuts import collect_shortcuts, parse_lnk_file
+
+FIXTURES = Path(__file__).parent / "fixtures" / "lnk"
+
+def test_local_target_and_strings():
+    """Test a link with an ID list, local base path and string data"""
+    link = read_lnk(str(FIXTURES / "Genshin Impact.lnk"))
+    assert link.target == "C:\\Program Files\\Genshin Impact\\launcher.exe"
+    assert link.working_dir == "C:\\Program Files\\Genshin Impact"
+    assert link.icon_location == link.target
+    assert link.arguments == ""
+
+def test_unicode_link_info():
+    """Test that Unicode base paths and the icon index are read"""
+    link = read_lnk(str(FIXTURES / "Star Rail.lnk"))
+    assert link.target == "C:\\Games\\崩坏星穹铁道\\StarRail.exe"
+    assert link.arguments == "--launcher -popupwindow"
+    assert link.icon_index == 2
+
+def test_network_and_ansi_links():
+    """Test network share targets and links without IsUnicode"""
+    assert read_lnk(str(FIXTURES / "Arknights.lnk")).target == "\\\\nas\\games\\Arknights\\arknights.exe"
+    legacy = read_lnk(str(FIXTURES / "Legacy ANSI.lnk"))
+    assert (legacy.description, legacy.arguments) == ("Old game", "/fullscreen /lang=fr")
+
+def test_environment_target_is_expanded(monkeypatch):
+    """Test that the environment variable form of the target wins and is expanded"""
+    monkeypatch.setenv("GACHA_GAMES", "D:\\Gacha")
+    link = read_lnk(str(FIXTURES / "Blue Archive.lnk"))
+    assert link.target == "D:\\Gacha\\Blue Archive\\BlueArchive.exe"
+
+def test_invalid_data():
+    """Test that non-links and truncated links raise LnkError"""
+    with pytest.raises(LnkError):
+        parse_lnk(b"[InternetShortcut]\nURL=https://example.com\n" * 3)
+    with pytest.raises(LnkError):
+        read_lnk(str(FIXTURES / "Truncated.lnk"))
+
+def test_parse_lnk_file_records():
+    """Test game records built from links, including protocol shortcuts"""
+    record = parse_lnk_file(str(FIXTURES / "Star Rail.lnk"))
+    assert record["type"] == "shortcut"
+    assert record["launch_target"] == ("C:\\Games\\崩坏星穹铁道\\StarRail.exe", "--launcher -popupwindow")
+    assert record["unique_key"] == "C:\\Games\\崩坏星穹铁道\\StarRail.exe --launcher -popupwindow"
+
+    store_app = parse_lnk_file(str(FIXTURES / "Store App.lnk"))
+    assert store_app["unique_key"] == str(FIXTURES / "Store App.lnk")
+    assert store_app["launch_target"] == ("", "")
+
+def test_collect_shortcuts_reads_links():
+    """Test that a folder import picks up every readable link"""
+    names = [record["name"] for record in collect_shortcuts(FIXTURES)]
+    assert "Truncated" not in names
+    assert len(names) == 6
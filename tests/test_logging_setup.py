@@ -0,0 +1,57 @@
+import logging
+from logging.handlers import QueueHandler
+import pytest
+from gacha_hub.logging_setup import get_log_level, setup_logging, shutdown_logging
+
+@pytest.fixture
+def log_dir(tmp_path):
+    yield tmp_path / "logs"
+    shutdown_logging()
+    logging.getLogger("gacha_hub").setLevel(logging.NOTSET)
+
+def test_level_from_environment(monkeypatch):
+    """Test that LOG_LEVEL picks the level and an unknown name falls back to INFO"""
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    assert get_log_level() == logging.DEBUG
+    assert get_log_level("warning") == logging.WARNING
+    monkeypatch.setenv("LOG_LEVEL", "chatty")
+    assert get_log_level() == logging.INFO
+
+def test_records_reach_rotating_file(log_dir):
+    """Test that records are written by the listener thread, filtered by level"""
+    setup_logging("INFO", log_dir)
+    handlers = logging.getLogger("gacha_hub").handlers
+    assert any(isinstance(handler, QueueHandler) for handler in handlers)
+
+    logger = logging.getLogger("gacha_hub.ui.main_window")
+    logger.debug("Adding game: %s", "hidden.exe")
+    logger.info("Loaded %d games", 5000)
+    shutdown_logging()
+    text = (log_dir / "gacha_hub.log").read_text(encoding="utf-8")
+    assert "Loaded 5000 games" in text
+    assert "hidden.exe" not in text
+
+def test_disabled_messages_are_not_formatted(log_dir):
+    """Test that arguments of filtered records are never turned into strings"""
+    setup_logging("WARNING", log_dir)
+    formatted = []
+
+    class Expensive:
+        def __str__(self):
+            formatted.append(self)
+            return "games"
+
+    logger = logging.getLogger("gacha_hub.core.stats")
+    assert not logger.isEnabledFor(logging.DEBUG)
+    logger.debug("games: %s", Expensive())
+    shutdown_logging()
+    assert formatted == []
+
+def test_log_file_rotates(log_dir):
+    """Test that the log file rolls over at max_bytes and keeps backup_count old files"""
+    setup_logging("INFO", log_dir, max_bytes=2000, backup_count=2)
+    logger = logging.getLogger("gacha_hub.test")
+    for i in range(200):
+        logger.info("line %d %s", i, "x" * 50)
+    shutdown_logging()
+    assert sorted(path.name for path in log_dir.iterdir()) == ["gacha_hub.log", "gacha_hub.log.1", "gacha_hub.log.2"]
@@ -0,0 +1,119 @@
+import time
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QModelIndex, Qt
+from sqlalchemy import event
+from gacha_hub.database.engine import create_db_engine
+from gacha_hub.database.repository import GameRepository
+
+LIBRARY_SIZE = 5000
+
+@pytest.fixture
+def window(qapp, tmp_path):
+    """Create a MainWindow on a temporary database"""
+    from gacha_hub.ui.main_window import MainWindow
+    repository = GameRepository(create_db_engine(tmp_path / "hub.db"))
+    window = MainWindow(repository, save_path=str(tmp_path / "games.json"), icon_cache_dir=tmp_path / "icons")
+    yield window
+    window.close()
+
+def item_ids(window):
+    model = window.game_model
+    return [model.index(i).data(Qt.ItemDataRole.UserRole) for i in range(model.rowCount())]
+
+def test_large_library_add_and_reorder(window, tmp_path):
+    """Test add and reorder latency with 5,000 games that all share one name"""
+    # Every game is called "game", only the folder differs
+    paths = [str(tmp_path / str(i) / "game.bat") for i in range(LIBRARY_SIZE)]
+    start = time.perf_counter()
+    for path in paths:
+        assert window.add_game_from_path(path) is not None
+    add_latency = (time.perf_counter() - start) / LIBRARY_SIZE
+    assert add_latency < 0.005
+    assert window.is_duplicate(paths[-1])
+
+    ids = item_ids(window)
+    start = time.perf_counter()
+    window.game_model.moveRow(QModelIndex(), LIBRARY_SIZE - 1, QModelIndex(), 0)
+    reorder_latency = time.perf_counter() - start
+    assert reorder_latency < 0.5
+
+    expected = [ids[-1]] + ids[:-1]
+    assert item_ids(window) == expected
+    assert [game["id"] for game in window.repository.all()] == expected
+    assert window.game_model.game_at(window.game_model.index(0))["path"] == paths[-1]
+
+def test_import_folder_saves_once(window, qapp, tmp_path):
+    """Test that a bulk import adds every new shortcut and writes them in one batch"""
+    folder = tmp_path / "Start Menu"
+    folder.mkdir()
+    for i in range(200):
+        (folder / f"game{i}.url").write_text(f"[InternetShortcut]\nURL=https://example.com/{i}\n")
+    window.add_game_from_path(str(folder / "game0.url"))
+    window.save_games_to_file()
+
+    commits, imported = [], []
+    event.listen(window.repository.engine, "commit", lambda conn: commits.append(1))
+    window.folderImported.connect(lambda folder, games: imported.append(games))
+    window.import_games_from_folder(str(folder))
+    assert not window.import_folder_btn.isEnabled()
+    deadline = time.monotonic() + 10
+    while not imported and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    added = imported[0]
+    assert window.import_folder_btn.isEnabled()
+    assert len(added) == 199
+    assert window.game_model.rowCount() == 200
+    assert len(commits) == 1
+    assert added[0]["icon_path"] == window.browser_icon_path
+
+def test_session_end_is_logged(window, tmp_path):
+    """Test that a finished launch lands in the play session log and the total playtime"""
+    from sqlmodel import Session
+    from gacha_hub.database.models import Game
+    from gacha_hub.core.sessions import SessionLog
+    game = window.add_game_from_path(str(tmp_path / "game.bat"))
+    window.save_games_to_file()
+    window.on_session_ended(game["id"], 90.0)
+    window.playtime_buffer.flush()
+    with Session(window.repository.engine) as session:
+        sessions = SessionLog(session).get_sessions(game["id"])
+        assert session.get(Game, game["id"]).total_playtime == 90
+    assert [s.duration for s in sessions] == [90]
+
+def test_process_scanner_follows_library(window, qapp, tmp_path):
+    """Test that games added after the scanner started end up in its lookup table"""
+    from gacha_hub.core.scanner import normalize_exe_path
+    window.start_process_scanner(interval=60)
+    scanner = window.launch_service.scanner
+    path = str(tmp_path / "Game.exe")
+    window.add_game_from_path(path)
+    window._scanner_refresh.setInterval(0)
+    window._scanner_refresh.start()
+    deadline = time.monotonic() + 5
+    while normalize_exe_path(path) not in scanner._lookup and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert normalize_exe_path(path) in scanner._lookup
+
+def test_exe_icon_left_to_icon_loader(window, tmp_path, monkeypatch):
+    """Test that adding an executable does not extract its icon, the row asks the IconLoader"""
+    from PySide6.QtCore import Qt
+    path = tmp_path / "Game.exe"
+    path.write_bytes(b"MZ")
+    requested = []
+    monkeypatch.setattr(window.icon_loader, "request", requested.append)
+    game = window.add_game_from_path(str(path))
+    assert game["icon_path"] == str(path) and requested == []
+    window.game_model.index(0).data(Qt.ItemDataRole.DecorationRole)
+    assert requested == [str(path)]
+
+def test_add_percent_encoded_url(window):
+    """Test that an internet shortcut with %20 in its URL is added as is"""
+    from pathlib import Path
+    game = window.add_game_from_path(str(Path(__file__).parent / "fixtures" / "shortcuts" / "Genshin Impact.url"))
+    assert game["launch_target"] == "https://example.com/play?server=os%20asia"
+    assert game["type"] == "url"
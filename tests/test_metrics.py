@@ -0,0 +1,69 @@
+import threading
+import time
+import pytest
+from gacha_hub.core import metrics
+from gacha_hub.core.launcher import GameLauncher
+from gacha_hub.core.metrics import SpanRecorder
+
+def test_percentiles_from_ring_buffer():
+    """Test nearest-rank percentiles over the most recent samples only"""
+    recorder = SpanRecorder(capacity=100)
+    for ms in range(1, 201):
+        recorder.record("save", ms * 1_000_000)
+    stats = recorder.stats()["save"]
+    assert stats.count == 100
+    assert (stats.p50, stats.p95, stats.p99, stats.max) == (150, 195, 199, 200)
+    assert stats.mean == pytest.approx(150.5)
+
+def test_span_counts_errors():
+    """Test that a failing block is timed, counted as an error and re-raised"""
+    recorder = SpanRecorder()
+
+    @recorder.timed("load")
+    def load(fail):
+        if fail:
+            raise OSError("disk gone")
+
+    load(False)
+    with pytest.raises(OSError):
+        load(True)
+    stats = recorder.stats("load")["load"]
+    assert (stats.count, stats.errors) == (2, 1)
+    assert "load" in recorder.report()
+
+def test_disabled_recorder_records_nothing():
+    recorder = SpanRecorder()
+    recorder.enabled = False
+    with recorder.span("launch"):
+        pass
+    assert recorder.stats() == {}
+
+def test_span_overhead_is_small():
+    """Test that an empty span costs microseconds, not milliseconds"""
+    recorder = SpanRecorder()
+    runs = 20_000
+    start = time.perf_counter()
+    for _ in range(runs):
+        with recorder.span("noop"):
+            pass
+    assert (time.perf_counter() - start) / runs < 20e-6
+
+def test_record_from_many_threads():
+    recorder = SpanRecorder(capacity=10_000)
+    def work():
+        for _ in range(1000):
+            with recorder.span("icon.resolve"):
+                pass
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert recorder.stats()["icon.resolve"].count == 8000
+
+def test_failed_launch_is_recorded():
+    """Test that the shared recorder sees launch failures"""
+    metrics.recorder.clear()
+    assert GameLauncher.launch_game("nonexistent.exe") is None
+    stats = metrics.recorder.stats("launch")["launch"]
+    assert (stats.count, stats.errors) == (1, 1)
@@ -0,0 +1,220 @@
+import math
+import random
+import threading
+import pytest
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from sqlmodel import Session, SQLModel, create_engine
+from gacha_hub.core import notifications
+from gacha_hub.core.notifications import (
+    EVENT_ENDED, EVENT_ENDING, EVENT_STARTED, EventNotice, EventScheduler,
+)
+from gacha_hub.core.stats import StatsManager
+from gacha_hub.database.models import Event, Game
+
+START = datetime(2024, 6, 1)
+EVENT_COUNT = 30_000
+# Events in the edit-while-running test, with a tenth of them edited and a tenth deleted
+EDITED_EVENT_COUNT = 600
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def session():
+    """Create a test database session"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Game(name="Game", executable_path="game.exe"))
+        session.commit()
+        yield session
+
+class EventRow(NamedTuple):
+    """Plain copy of an Event row, cheap to build by the ten thousand"""
+    id: int
+    game_id: int
+    name: str
+    start_date: datetime
+    end_date: datetime
+
+def make_events(count, rng):
+    events = []
+    for event_id in range(1, count + 1):
+        start = START + timedelta(minutes=rng.randint(-5 * 1440, 60 * 1440))
+        end = start + timedelta(hours=rng.randint(1, 30 * 24))
+        events.append(EventRow(event_id, 1, f"Event {event_id}", start, end))
+    return events
+
+def expected_notices(scheduler, events, now):
+    """Every boundary after now, the way the scheduler should deliver them"""
+    notices = []
+    for event in events:
+        for when, kind in scheduler._boundaries(event):
+            if when > now:
+                notices.append(EventNotice(event.id, event.game_id, event.name, kind, when))
+    return notices
+
+def drain(scheduler, clock):
+    """Jump the fake clock from one boundary to the next, the way the thread sleeps"""
+    delivered, wakeups = [], 0
+    while (next_due := scheduler.next_due()) is not None:
+        clock.now = next_due
+        due = scheduler.pop_due()
+        assert due and all(notice.at == next_due for notice in due)
+        delivered.extend(due)
+        wakeups += 1
+    return delivered, wakeups
+
+def test_boundaries_in_order(session):
+    clock = FakeClock(START)
+    scheduler = EventScheduler(clock, warn_before=timedelta(hours=24))
+    stats = StatsManager(session, event_scheduler=scheduler)
+    long_event = stats.add_event(1, "Banner", START + timedelta(hours=1), START + timedelta(days=3))
+    short_event = stats.add_event(1, "Login bonus", START + timedelta(hours=2), START + timedelta(hours=5))
+    assert stats.add_event(1, "Broken", START, START - timedelta(hours=1)) is None
+
+    clock.now = START + timedelta(days=10)
+    due = scheduler.pop_due()
+    assert [(notice.event_id, notice.kind) for notice in due] == [
+        (long_event.id, EVENT_STARTED),
+        (short_event.id, EVENT_STARTED),
+        # Too short for a warning a day ahead
+        (short_event.id, EVENT_ENDED),
+        (long_event.id, EVENT_ENDING),
+        (long_event.id, EVENT_ENDED),
+    ]
+    assert due[3].at == START + timedelta(days=2)
+    assert scheduler.pop_due() == [] and scheduler.next_due() is None
+
+def test_load_skips_past_boundaries(session):
+    clock = FakeClock(START)
+    session.add_all([
+        Event(game_id=1, name="Over", start_date=START - timedelta(days=9), end_date=START - timedelta(days=2)),
+        Event(game_id=1, name="Running", start_date=START - timedelta(days=1), end_date=START + timedelta(hours=5)),
+    ])
+    session.commit()
+    scheduler = EventScheduler(clock)
+    # Only the end of the running event is still to come, its warning has passed
+    assert scheduler.load(session) == 1
+    clock.now = START + timedelta(days=1)
+    assert [(notice.name, notice.kind) for notice in scheduler.pop_due()] == [("Running", EVENT_ENDED)]
+
+def test_edits_and_removals_update_incrementally(session):
+    clock = FakeClock(START)
+    scheduler = EventScheduler(clock, warn_before=None)
+    stats = StatsManager(session, event_scheduler=scheduler)
+    moved = stats.add_event(1, "Moved", START + timedelta(hours=1), START + timedelta(hours=2))
+    removed = stats.add_event(1, "Removed", START + timedelta(hours=1), START + timedelta(hours=2))
+    assert stats.update_event(moved.id, end_date=START + timedelta(hours=8))
+    assert stats.remove_event(removed.id)
+    assert not stats.update_event(moved.id, colour="red")
+    assert len(scheduler) == 2
+
+    delivered, _ = drain(scheduler, clock)
+    assert [(notice.name, notice.kind, notice.at) for notice in delivered] == [
+        ("Moved", EVENT_STARTED, START + timedelta(hours=1)),
+        ("Moved", EVENT_ENDED, START + timedelta(hours=8)),
+    ]
+
+def test_readded_id_does_not_revive_deleted_event(session):
+    """Test that an event given a deleted event's id only delivers its own notices"""
+    clock = FakeClock(START)
+    scheduler = EventScheduler(clock, warn_before=None)
+    stats = StatsManager(session, event_scheduler=scheduler)
+    old = stats.add_event(1, "Old", START + timedelta(hours=1), START + timedelta(hours=2))
+    assert stats.remove_event(old.id)
+    new = stats.add_event(1, "New", START + timedelta(hours=3), START + timedelta(hours=4))
+    assert new.id == old.id
+    assert len(scheduler) == 2
+
+    delivered, _ = drain(scheduler, clock)
+    assert [(notice.name, notice.kind) for notice in delivered] == [("New", EVENT_STARTED), ("New", EVENT_ENDED)]
+    assert len(scheduler) == 0
+
+def test_no_event_missed_with_many_events(session):
+    """Test that events edited and deleted while running all arrive exactly once"""
+    rng = random.Random(5)
+    clock = FakeClock(START)
+    events = make_events(EDITED_EVENT_COUNT, rng)
+    session.execute(Event.__table__.insert(), [{**event._asdict(), "created_at": START} for event in events])
+    session.commit()
+    scheduler = EventScheduler(clock)
+    scheduler.load(session)
+
+    # Halfway through, move some events and delete others
+    clock.now = START + timedelta(days=20)
+    delivered = scheduler.pop_due()
+    order = lambda notice: (notice.at, notice.event_id, notice.kind)
+    expected = expected_notices(scheduler, events, START)
+    assert [notice.at for notice in delivered] == sorted(notice.at for notice in delivered)
+    assert sorted(delivered, key=order) == sorted((notice for notice in expected if notice.at <= clock.now), key=order)
+    stats = StatsManager(session, event_scheduler=scheduler)
+    events = {event.id: event for event in events}
+    for event in rng.sample(list(events.values()), EDITED_EVENT_COUNT // 10):
+        end_date = event.end_date + timedelta(days=rng.randint(1, 5))
+        stats.update_event(event.id, end_date=end_date)
+        events[event.id] = event._replace(end_date=end_date)
+    deleted = set(rng.sample(list(events), EDITED_EVENT_COUNT // 10))
+    for event_id in deleted:
+        stats.remove_event(event_id)
+    survivors = [event for event_id, event in events.items() if event_id not in deleted]
+    later = expected_notices(scheduler, survivors, clock.now)
+
+    rest, wakeups = drain(scheduler, clock)
+    assert sorted(rest, key=order) == sorted(later, key=order)
+    assert wakeups == len({notice.at for notice in later})
+    assert len(scheduler) == 0
+
+def test_wakeups_cost_log_n_comparisons(monkeypatch):
+    """Test that taking the next boundary compares O(log n) heap entries"""
+    comparisons = 0
+    compare = notifications._Entry.__lt__
+    def counting_lt(self, other):
+        nonlocal comparisons
+        comparisons += 1
+        return compare(self, other)
+    monkeypatch.setattr(notifications._Entry, "__lt__", counting_lt)
+
+    clock = FakeClock(START - timedelta(days=30))
+    scheduler = EventScheduler(clock, warn_before=None)
+    for event in make_events(EVENT_COUNT, random.Random(9)):
+        scheduler.schedule(event)
+    size = len(scheduler)
+    bound = 3 * math.log2(size) + 3
+    worst = 0
+    for _ in range(1000):
+        comparisons = 0
+        clock.now = scheduler.next_due()
+        due = scheduler.pop_due()
+        worst = max(worst, comparisons / len(due))
+    assert worst <= bound
+
+    # Edits are pushes, also O(log n)
+    comparisons = 0
+    scheduler.schedule(Event(id=1, game_id=1, name="Edited", start_date=clock.now + timedelta(days=1),
+                             end_date=clock.now + timedelta(days=2)))
+    assert comparisons <= 2 * bound
+
+def test_thread_sleeps_until_next_boundary():
+    """Test that the scheduler thread wakes for a new, earlier event instead of polling"""
+    received = []
+    done = threading.Event()
+    scheduler = EventScheduler(warn_before=None)
+    scheduler.start(lambda notice: (received.append(notice), done.set()))
+    try:
+        now = datetime.utcnow()
+        scheduler.schedule(Event(id=1, game_id=1, name="Later", start_date=now + timedelta(hours=1),
+                                 end_date=now + timedelta(hours=2)))
+        scheduler.schedule(Event(id=2, game_id=1, name="Soon", start_date=now + timedelta(milliseconds=200),
+                                 end_date=now + timedelta(hours=3)))
+        assert done.wait(5)
+    finally:
+        scheduler.stop(timeout=5)
+    assert [(notice.name, notice.kind) for notice in received] == [("Soon", EVENT_STARTED)]
+    # Woken by the two schedule() calls and the due boundary, nothing more
+    assert scheduler.wakeups <= 4
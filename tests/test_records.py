@@ -0,0 +1,56 @@
+import json
+import pickle
+import pytest
+from benchmarks import bench_records
+from gacha_hub.core.records import ROW_FIELDS, GameRecord, GameType
+
+def make_shortcut():
+    return {"id": 3, "name": "Star Rail", "path": "Star Rail.lnk", "icon_path": None, "type": "shortcut",
+            "launch_target": ("StarRail.exe", "-popupwindow"), "unique_key": "StarRail.exe -popupwindow",
+            "exe": "StarRail.exe", "args": "-popupwindow"}
+
+def test_reads_like_a_game_dict():
+    """Test that a record answers item, get, in and dict() like the game dict it came from"""
+    record = GameRecord.from_dict(make_shortcut())
+    assert record["name"] == record.name == "Star Rail"
+    assert record.get("exe") == "StarRail.exe" and record.get("colour", "red") == "red"
+    assert record["type"] == "shortcut" and record.type is GameType.SHORTCUT
+    assert dict(record) == make_shortcut()
+    assert "unique_key" in record and "colour" not in record
+    with pytest.raises(KeyError):
+        record["colour"]
+    with pytest.raises(AttributeError):
+        record.colour = "red"
+
+def test_json_and_pickle_round_trips():
+    """Test that the shortcut tuple survives JSON, which turns it into a list"""
+    record = GameRecord.from_dict(make_shortcut())
+    from_dict = GameRecord.from_dict(json.loads(json.dumps(record.to_dict())))
+    from_row = GameRecord.from_row(json.loads(json.dumps(record.to_row())))
+    assert from_dict == from_row == pickle.loads(pickle.dumps(record)) == record
+    assert from_row.launch_target == ("StarRail.exe", "-popupwindow")
+    assert json.loads(json.dumps(record.to_dict()))["type"] == "shortcut"
+
+def test_types_and_shared_strings():
+    """Test that types are parsed into GameType and exe records share one path string"""
+    exe = GameRecord("Game", path="C:\\Game.exe", type="exe", launch_target="C:\\Game.exe",
+                     unique_key="C:\\Game.exe")
+    assert exe.launch_target is exe.path and exe.unique_key is exe.path
+    assert GameRecord("Notes", type=None).type is GameType.FILE
+    assert GameRecord("Old link", type="shortcut", launch_target="game.exe").launch_target == ("game.exe", "")
+    with pytest.raises(ValueError):
+        GameRecord("Game", type="rom")
+
+def test_update():
+    """Test that update() sets known fields, parses the type and refuses unknown ones"""
+    record = GameRecord.from_dict(make_shortcut())
+    record.update({"name": "HSR", "type": "exe", "launch_target": "StarRail.exe"})
+    assert (record.name, record.type, record.launch_target) == ("HSR", GameType.EXE, "StarRail.exe")
+    with pytest.raises(KeyError):
+        record.update({"colour": "red"})
+    assert len(record.to_row()) == len(ROW_FIELDS)
+
+def test_records_take_less_memory_than_dicts():
+    """Test that records retain noticeably less memory than the dicts they replace"""
+    result = bench_records.run(games=200, repeats=1)
+    assert result["memory_saved_ratio"] > 0.25
@@ -0,0 +1,140 @@
+import json
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from sqlmodel import Session, select
+from gacha_hub.core.sessions import SessionLog
+from gacha_hub.database.engine import create_db_engine
+from gacha_hub.database.models import DailyPlaytime, Game, PlaySession
+from gacha_hub.database.repository import GameRepository
+from gacha_hub.ui.persistence import import_into_repository
+
+def make_game(key, game_type="exe"):
+    """Build a game list record"""
+    return {"name": key, "path": f"{key}.exe", "icon_path": None, "type": game_type,
+            "launch_target": f"{key}.exe", "unique_key": key, "exe": None, "args": None}
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "hub.db"
+
+def reopen(repository, db_path):
+    """Close a repository and load a fresh one from the same database"""
+    repository.close()
+    return GameRepository(create_db_engine(db_path))
+
+def names(repository):
+    return [game["name"] for game in repository.all()]
+
+def test_changes_persist(db_path):
+    """Test that adds, removes and moves survive reopening"""
+    repository = GameRepository(create_db_engine(db_path), delay=0)
+    added = repository.add_many(make_game(key) for key in "abcde")
+    repository.remove(added[1]["id"])
+    repository.move(added[4]["id"], 0)
+    repository.update(added[2]["id"], name="C")
+    assert names(repository) == ["e", "a", "C", "d"]
+
+    repository = reopen(repository, db_path)
+    assert names(repository) == ["e", "a", "C", "d"]
+    assert repository.get_by_key("e")["id"] == added[4]["id"]
+    assert repository.get(added[1]["id"]) is None
+    repository.close()
+
+def test_ids_are_never_reused(db_path):
+    """Test that a removed game's id is not handed out again, even after reopening"""
+    repository = GameRepository(create_db_engine(db_path))
+    first, last = repository.add_many([make_game("a"), make_game("b")])
+    repository.remove(last["id"])
+    repository = reopen(repository, db_path)
+    assert repository.add(make_game("b"))["id"] > last["id"] > first["id"]
+    repository.close()
+
+def test_remove_deletes_game_rows(db_path):
+    """Test that removing a game also drops its sessions and playtime rollups"""
+    engine = create_db_engine(db_path)
+    repository = GameRepository(engine)
+    kept, removed = repository.add_many([make_game("a"), make_game("b")])
+    with Session(engine) as session:
+        log = SessionLog(session)
+        for game in (kept, removed):
+            log.record_session(game["id"], datetime(2024, 5, 1, 12), datetime(2024, 5, 1, 13))
+        session.commit()
+    repository.remove(removed["id"])
+    repository.flush()
+    with Session(engine) as session:
+        for model in (PlaySession, DailyPlaytime):
+            assert {row.game_id for row in session.exec(select(model))} == {kept["id"]}
+    repository.close()
+
+def test_failed_write_is_surfaced(db_path):
+    """Test that flush reports a failed batch and reload brings back the stored games"""
+    repository = GameRepository(create_db_engine(db_path))
+    game = repository.add(make_game("a"))
+    write = repository._writer.write_batch
+    repository._writer.write_batch = lambda operations: 1 / 0
+    repository.update(game["id"], name="A")
+    assert repository.flush() is False
+    repository._writer.write_batch = write
+    repository.reload()
+    assert names(repository) == ["a"]
+    assert repository.flush() is True
+    repository.close()
+
+def test_shortcut_launch_target_round_trip(db_path):
+    """Test that shortcut records keep their (exe, args) launch target as a tuple"""
+    repository = GameRepository(create_db_engine(db_path))
+    shortcut = dict(make_game("s", "shortcut"), exe="game.exe", args="-fast", launch_target=("game.exe", "-fast"))
+    repository.add(shortcut)
+    repository = reopen(repository, db_path)
+    assert repository.get_by_key("s")["launch_target"] == ("game.exe", "-fast")
+    repository.close()
+
+def test_duplicate_keys_rejected(db_path):
+    """Test that adding a unique_key twice fails without changing anything"""
+    repository = GameRepository(create_db_engine(db_path))
+    repository.add(make_game("a"))
+    with pytest.raises(ValueError):
+        repository.add_many([make_game("b"), make_game("a")])
+    assert names(repository) == ["a"]
+    repository.close()
+
+def test_batch_is_one_transaction(db_path):
+    """Test that queued writes are applied in a single commit"""
+    engine = create_db_engine(db_path)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    repository = GameRepository(engine, delay=10)
+    games = repository.add_many(make_game(str(i)) for i in range(50))
+    assert len(commits) == 1  # adding inserts straight away
+    commits.clear()
+    repository.reorder([game["id"] for game in reversed(games)])
+    repository.flush()
+    assert len(commits) == 1
+    with Session(engine) as session:
+        assert session.get(Game, games[0]["id"]).position > session.get(Game, games[-1]["id"]).position
+    repository.close()
+
+def test_import_games_json(db_path, tmp_path):
+    """Test the one-time import of an existing games.json"""
+    save_path = str(tmp_path / "games.json")
+    with open(save_path, "w", encoding="utf-8") as f:
+        json.dump([make_game("a"), make_game("b"), make_game("c")], f)
+    repository = GameRepository(create_db_engine(db_path))
+    repository.add(make_game("b"))
+
+    assert import_into_repository(repository, save_path) == 2
+    assert names(repository) == ["b", "a", "c"]
+    assert import_into_repository(repository, save_path) == 0
+    assert (tmp_path / "games.json.imported").exists()
+    repository.close()
+
+def test_import_keeps_games_without_key(db_path, tmp_path):
+    """Test that games without a unique_key are not merged into one"""
+    save_path = str(tmp_path / "games.json")
+    with open(save_path, "w", encoding="utf-8") as f:
+        json.dump([dict(make_game(key), unique_key=None) for key in "ab"], f)
+    repository = GameRepository(create_db_engine(db_path))
+    assert import_into_repository(repository, save_path) == 2
+    assert names(repository) == ["a", "b"]
+    repository.close()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import psutil
+import pytest
+from gacha_hub.core import scanner as scanner_module
+from gacha_hub.core.scanner import ProcessScanner, build_lookup, normalize_exe_path
+from gacha_hub.core.supervisor import ProcessSupervisor
+from gacha_hub.core.watcher import ProcessWatcher
+
+class FakeProcess:
+    """Stands in for a cached psutil.Process, counting exe() reads"""
+    reads = 0
+
+    def __init__(self, pid, exe):
+        self.pid = pid
+        self._exe = exe
+
+    def exe(self):
+        FakeProcess.reads += 1
+        if self._exe is None:
+            raise psutil.AccessDenied(self.pid)
+        return self._exe
+
+@pytest.fixture
+def fake_processes(monkeypatch):
+    processes = []
+    monkeypatch.setattr(scanner_module.psutil, "process_iter", lambda: iter(list(processes)))
+    FakeProcess.reads = 0
+    return processes
+
+@pytest.fixture
+def watcher(monkeypatch):
+    watcher = ProcessWatcher()
+    monkeypatch.setattr(watcher.tracker, "_get_create_time", lambda process_id: None)
+    monkeypatch.setattr(watcher, "_wake", lambda: None)
+    return watcher
+
+def test_build_lookup():
+    games = [
+        {"id": 1, "type": "exe", "path": "/games/a/A.exe", "launch_target": "/games/a/A.exe"},
+        {"id": 2, "type": "shortcut", "exe": "/games/b/../b/B.exe", "launch_target": ["/games/b/B.exe", ""]},
+        {"id": 3, "type": "url", "launch_target": "https://example.com"},
+        {"id": 4, "type": "shortcut", "exe": None, "launch_target": ["", ""]},
+    ]
+    lookup = build_lookup(games)
+    assert lookup[normalize_exe_path("/games/a/A.exe")] == 1
+    assert lookup[normalize_exe_path("/games/b/B.exe")] == 2
+    assert set(lookup.values()) == {1, 2}
+
+def test_scan_only_inspects_new_processes(fake_processes, watcher):
+    """Test that processes seen by an earlier scan are not looked at again"""
+    scanner = ProcessScanner(watcher, [{"id": 1, "type": "exe", "launch_target": "/games/A.exe"}])
+    fake_processes.extend(FakeProcess(pid, f"/usr/bin/tool{pid}") for pid in range(100, 1100))
+    assert scanner.scan() == []
+    assert scanner.last_new_count == 1000 and FakeProcess.reads == 1000
+
+    FakeProcess.reads = 0
+    assert scanner.scan() == []
+    assert scanner.last_new_count == 0 and FakeProcess.reads == 0
+
+    fake_processes.append(FakeProcess(5000, "/games/A.exe"))
+    assert scanner.scan() == [(5000, 1)]
+    assert scanner.last_new_count == 1 and FakeProcess.reads == 1
+    assert watcher.tracker.tracked_processes[5000]["game_id"] == 1
+
+def test_reused_pid_is_inspected_again(fake_processes, watcher):
+    """A fresh Process object for a known PID means psutil saw the PID reused"""
+    scanner = ProcessScanner(watcher, [{"id": 1, "type": "exe", "launch_target": "/games/A.exe"}])
+    fake_processes.append(FakeProcess(200, "/usr/bin/tool"))
+    scanner.scan()
+    fake_processes[0] = FakeProcess(200, "/games/A.exe")
+    assert scanner.scan() == [(200, 1)]
+
+def test_game_is_tracked_once(fake_processes, watcher):
+    """Test that a launcher re-exec'ing itself doesn't start a second session"""
+    scanner = ProcessScanner(watcher, [{"id": 1, "type": "exe", "launch_target": "/games/A.exe"}])
+    fake_processes.extend([FakeProcess(300, "/games/A.exe"), FakeProcess(301, "/games/A.exe"),
+                           FakeProcess(302, None)])
+    assert scanner.scan() == [(300, 1)]
+    assert list(watcher.tracker.tracked_processes) == [300]
+
+def test_set_games_rescans_running_processes(fake_processes, watcher):
+    """Test that a game added while it is running is found by the next scan"""
+    scanner = ProcessScanner(watcher)
+    fake_processes.append(FakeProcess(400, "/games/B.exe"))
+    assert scanner.scan() == []
+    scanner.set_games([{"id": 2, "type": "shortcut", "exe": "/games/B.exe"}])
+    assert scanner.scan() == [(400, 2)]
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="copies a POSIX binary as the dummy game")
+def test_externally_started_game_is_reported(tmp_path):
+    """Test that the exit of a game the hub didn't launch reaches on_exit"""
+    exe = tmp_path / "Game"
+    shutil.copy(shutil.which("sleep"), exe)
+    exits = []
+    done = threading.Event()
+    supervisor = ProcessSupervisor(on_exit=lambda *args: (exits.append(args), done.set()), poll_interval=0.05)
+    scanner = ProcessScanner(supervisor.watcher, [{"id": 8, "type": "exe", "launch_target": str(exe)}])
+    supervisor.start()
+    try:
+        scanner.scan()
+        process = subprocess.Popen([str(exe), "0.3"])
+        assert scanner.scan() == [(process.pid, 8)]
+        process.wait()
+        assert done.wait(5)
+    finally:
+        supervisor.stop(timeout=5)
+    game_id, elapsed, returncode = exits[0]
+    assert game_id == 8 and elapsed > 0 and returncode is None
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+def test_launched_game_found_by_scanner_is_still_reaped(make_dummy_game):
+    """Test that a launched game picked up by the scanner first is reaped by the supervisor"""
+    exe = make_dummy_game("sleep 0.3\nexit 4")
+    done = threading.Event()
+    exits = []
+    supervisor = ProcessSupervisor(on_exit=lambda *args: (exits.append(args), done.set()), poll_interval=0.05)
+    try:
+        process = subprocess.Popen([exe])
+        supervisor.start()
+        supervisor.watcher.watch(process.pid, 3)
+        assert supervisor.adopt(process, 3)
+        assert done.wait(5)
+    finally:
+        supervisor.stop(timeout=5)
+    assert exits[0][0] == 3 and exits[0][2] == 4
+    with pytest.raises(ChildProcessError):
+        os.waitpid(process.pid, os.WNOHANG)
@@ -0,0 +1,66 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlmodel import Session, SQLModel, create_engine, select
+from gacha_hub.core.sessions import SessionLog, split_by_day
+from gacha_hub.core.tracker import GameTracker
+from gacha_hub.database.models import DailyPlaytime, Game
+
+@pytest.fixture
+def session():
+    """Create a test database session"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture
+def games(session):
+    """Create a couple of games to record sessions for"""
+    games = [Game(name=f"Game {i}", executable_path=f"game{i}.exe") for i in range(2)]
+    session.add_all(games)
+    session.commit()
+    return [game.id for game in games]
+
+def test_split_by_day():
+    """Test that a session crossing midnight is split per day"""
+    pieces = list(split_by_day(datetime(2024, 1, 1, 23, 0), datetime(2024, 1, 2, 0, 30)))
+    assert pieces == [(date(2024, 1, 1), 3600), (date(2024, 1, 2), 1800)]
+
+    # Fractions of a second on each side of midnight still add up to the duration
+    started_at, ended_at = datetime(2024, 1, 1, 23, 59, 59, 600_000), datetime(2024, 1, 3, 0, 0, 0, 700_000)
+    pieces = list(split_by_day(started_at, ended_at))
+    assert [day for day, _ in pieces] == [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)]
+    assert sum(seconds for _, seconds in pieces) == int((ended_at - started_at).total_seconds()) == 86401
+
+def test_record_session_updates_rollups(session, games):
+    """Test that recorded sessions accumulate into daily and weekly totals"""
+    log = SessionLog(session)
+    sunday_night = datetime(2024, 1, 7, 23, 0)  # Sunday, the week of Monday 2024-01-01
+    log.record_session(games[0], sunday_night, sunday_night + timedelta(hours=2))
+    log.record_session(games[0], datetime(2024, 1, 8, 12, 0), datetime(2024, 1, 8, 12, 30))
+    log.record_session(games[1], datetime(2024, 1, 3, 10, 0), datetime(2024, 1, 3, 10, 10))
+
+    assert log.get_daily_playtime(date(2024, 1, 8)) == {games[0]: 3600 + 1800}
+    assert log.get_weekly_playtime(date(2024, 1, 5)) == {games[0]: 3600, games[1]: 600}
+    assert log.get_weekly_playtime(date(2024, 1, 8)) == {games[0]: 3600 + 1800}
+    assert len(log.get_sessions(games[0])) == 2
+    assert log.record_session(games[0], sunday_night, sunday_night - timedelta(hours=1)) is None
+
+def test_rebuild_rollups(session, games):
+    """Test that rebuilding reproduces the incrementally maintained rollups"""
+    log = SessionLog(session)
+    start = datetime(2024, 2, 1, 20, 0)
+    for i in range(20):
+        log.record_session(games[i % 2], start + timedelta(hours=7 * i), start + timedelta(hours=7 * i + 3))
+    before = sorted((row.game_id, row.day, row.seconds) for row in session.exec(select(DailyPlaytime)))
+    assert log.rebuild_rollups(batch_size=3) == 20
+    after = sorted((row.game_id, row.day, row.seconds) for row in session.exec(select(DailyPlaytime)))
+    assert after == before
+
+def test_tracker_feeds_session_log(session, games):
+    """Test that stopping a tracked process records a session"""
+    log = SessionLog(session)
+    tracker = GameTracker(on_session_end=log.record_session)
+    tracker.start_tracking(12345, games[0])
+    assert tracker.stop_tracking(12345) is not None
+    assert len(log.get_sessions(games[0])) == 1
@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+from gacha_hub.core.shortcuts import collect_shortcuts, iter_shortcut_files, parse_desktop_file, parse_url_file
+
+FIXTURES = Path(__file__).parent / "fixtures" / "shortcuts"
+GAME_URL = "https://example.com/play?server=os%20asia"
+
+def test_parse_url_file():
+    """Test reading a percent-encoded internet shortcut"""
+    record = parse_url_file(str(FIXTURES / "Genshin Impact.url"))
+    assert record["name"] == "Genshin Impact"
+    assert record["type"] == "url"
+    assert record["launch_target"] == GAME_URL
+    assert record["unique_key"] == GAME_URL
+    assert parse_url_file(str(FIXTURES / "Broken.url")) is None
+
+def test_parse_desktop_file():
+    """Test splitting Exec and dropping field codes from a desktop entry"""
+    record = parse_desktop_file(str(FIXTURES / "Games" / "Star Rail.desktop"))
+    assert record["name"] == "Honkai: Star Rail"
+    assert record["type"] == "shortcut"
+    assert record["exe"] == "/opt/star rail/launcher"
+    assert record["args"] == "--fullscreen"
+    assert record["unique_key"] == "/opt/star rail/launcher --fullscreen"
+    assert record["icon_path"] is None  # theme icon names aren't files
+
+    link = parse_desktop_file(str(FIXTURES / "Games" / "Wiki.desktop"))
+    assert (link["type"], link["launch_target"]) == ("url", "https://wiki.example.com/")
+    assert parse_desktop_file(str(FIXTURES / "Uninstall.desktop")) is None
+
+def test_iter_shortcut_files_filters_extensions():
+    """Test that scanning recurses and skips unsupported files"""
+    found = sorted(os.path.relpath(path, FIXTURES) for path in iter_shortcut_files(FIXTURES))
+    assert "readme.txt" not in found
+    assert os.path.join("Games", "Star Rail.desktop") in found
+    assert sorted(os.path.relpath(path, FIXTURES) for path in iter_shortcut_files(FIXTURES, recursive=False)) == [
+        "Broken.url", "Genshin Impact.url", "Uninstall.desktop"]
+
+def test_collect_shortcuts_dedupes_in_one_pass():
+    """Test that duplicates within the folder and the library are skipped"""
+    records = collect_shortcuts(FIXTURES, max_workers=4)
+    assert [record["name"] for record in records] == [
+        "Blue Archive", "Genshin Impact (copy)", "Honkai: Star Rail", "Game Wiki"]
+
+    known = {GAME_URL}
+    records = collect_shortcuts(FIXTURES, is_duplicate=known.__contains__)
+    assert GAME_URL not in [record["unique_key"] for record in records]
+
+def test_collect_shortcuts_large_folder(tmp_path):
+    """Test a 200-entry folder where every shortcut exists twice"""
+    for i in range(200):
+        folder = tmp_path / f"group{i % 10}"
+        folder.mkdir(exist_ok=True)
+        for copy in ("a", "b"):
+            (folder / f"game{i}{copy}.url").write_text(f"[InternetShortcut]\nURL=https://example.com/{i}\n")
+    records = collect_shortcuts(tmp_path)
+    assert len(records) == 200
+    assert len({record["unique_key"] for record in records}) == 200
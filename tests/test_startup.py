@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+pytest.importorskip("PySide6")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_startup_within_import_budget():
+    """Test that gacha_hub.main imports within budget and defers the heavy modules"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--repeats", "1"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output)
+    assert result["deferred_modules_imported"] == []
+    assert result["import_ms"] <= result["import_budget_ms"]
+
+def test_window_shows_before_library_loads(qapp, tmp_path):
+    """Test that the window can be shown without opening the database"""
+    from gacha_hub.database.engine import create_db_engine
+    from gacha_hub.database.repository import GameRepository
+    from gacha_hub.ui.main_window import MainWindow
+    window = MainWindow(save_path=str(tmp_path / "games.json"), load=False, icon_cache_dir=tmp_path / "icons")
+    window.show()
+    assert window.game_model is None
+    assert not window.add_game_btn.isEnabled()
+
+    window.load_library(GameRepository(create_db_engine(tmp_path / "hub.db")))
+    assert window.game_list.model() is window.game_model
+    assert window.add_game_btn.isEnabled()
+    window.close()
@@ -0,0 +1,116 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlmodel import Session, SQLModel, create_engine
+from gacha_hub.core.stats import MAX_IN_PARAMS, StatsManager, PlaytimeBuffer
+from gacha_hub.database.engine import create_db_engine
+from gacha_hub.database.models import DailyTask, Event, Game
+
+@pytest.fixture
+def session():
+    """Create a test database session"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture
+def games(session):
+    """Create a couple of games to record playtime for"""
+    games = [Game(name=f"Game {i}", executable_path=f"game{i}.exe") for i in range(3)]
+    session.add_all(games)
+    session.commit()
+    return [game.id for game in games]
+
+def test_update_playtime(session, games):
+    """Test adding playtime directly"""
+    stats = StatsManager(session)
+    assert stats.update_playtime(games[0], 60)
+    assert not stats.update_playtime(999, 60)
+    game = session.get(Game, games[0])
+    assert game.total_playtime == 60
+    assert game.last_played is not None
+
+def test_buffer_combines_increments(session, games):
+    """Test that buffered increments are combined into one flush"""
+    buffer = PlaytimeBuffer(session, max_pending=1000, flush_interval=3600)
+    start = datetime(2024, 1, 1, 12, 0)
+    for tick in range(10):
+        for game_id in games[:2]:
+            buffer.add(game_id, 5, played_at=start + timedelta(seconds=tick))
+    assert buffer.pending == 20
+    assert session.get(Game, games[0]).total_playtime == 0
+
+    assert buffer.flush() == 2
+    assert buffer.pending == 0
+    first, second, untouched = (session.get(Game, game_id) for game_id in games)
+    assert first.total_playtime == second.total_playtime == 50
+    assert first.last_played == start + timedelta(seconds=9)
+    assert untouched.total_playtime == 0
+    assert untouched.last_played is None
+
+def test_buffer_flushes_on_size(session, games):
+    """Test that reaching max_pending triggers a flush"""
+    buffer = PlaytimeBuffer(session, max_pending=3, flush_interval=3600)
+    for _ in range(3):
+        buffer.add(games[0], 10)
+    assert buffer.pending == 0
+    assert session.get(Game, games[0]).total_playtime == 30
+
+def test_buffer_flushes_on_timer(tmp_path):
+    """Test that a started buffer flushes a quiet backlog without another add"""
+    session = Session(create_db_engine(tmp_path / "hub.db"))
+    game = Game(name="Game", executable_path="game.exe")
+    session.add(game)
+    session.commit()
+    buffer = PlaytimeBuffer(session, max_pending=1000, flush_interval=0.05)
+    buffer.add(game.id, 10)
+    buffer.start()
+    deadline = time.monotonic() + 5
+    while buffer.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    buffer.close(timeout=5)
+    assert buffer.pending == 0
+    session.expire_all()
+    assert session.get(Game, game.id).total_playtime == 10
+    session.close()
+
+def test_buffer_keeps_newer_last_played(session, games):
+    """Test that a flush never moves last_played backwards"""
+    stats = StatsManager(session)
+    stats.update_playtime(games[0], 1)
+    newest = session.get(Game, games[0]).last_played
+    stats.playtime_buffer.add(games[0], 10, played_at=newest - timedelta(hours=1))
+    stats.playtime_buffer.close()
+    game = session.get(Game, games[0])
+    assert game.total_playtime == 11
+    assert game.last_played == newest
+
+def test_overview_groups_by_game(session, games, capture_selects):
+    """Test that the overview returns tasks and active events per game in two queries"""
+    now = datetime.utcnow()
+    session.add_all([
+        DailyTask(game_id=games[0], name="Login"),
+        DailyTask(game_id=games[0], name="Stamina"),
+        DailyTask(game_id=games[1], name="Login"),
+        Event(game_id=games[0], name="Live", start_date=now - timedelta(days=1), end_date=now + timedelta(days=1)),
+        Event(game_id=games[1], name="Ended", start_date=now - timedelta(days=9), end_date=now - timedelta(days=2)),
+    ])
+    session.commit()
+    stats = StatsManager(session)
+
+    overview, queries = capture_selects(session, lambda: stats.get_overview(games), ("dailytask", "event"))
+    assert len(queries) == 2
+    assert [len(overview[game_id].tasks) for game_id in games] == [2, 1, 0]
+    assert [len(overview[game_id].events) for game_id in games] == [1, 0, 0]
+
+    everything = stats.get_overview()
+    assert sorted(everything) == games[:2]
+
+def test_bulk_queries_chunk_large_id_sets(session, games, capture_selects):
+    """Test that id sets larger than the parameter limit are split into chunks"""
+    stats = StatsManager(session)
+    ids = list(range(1, MAX_IN_PARAMS * 2 + 2))
+    tasks, queries = capture_selects(session, lambda: stats.get_daily_tasks_by_game(ids), ("dailytask", "event"))
+    assert len(queries) == 3
+    assert len(tasks) == len(ids)
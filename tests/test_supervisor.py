@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import pytest
+from gacha_hub.core.supervisor import ProcessSupervisor
+from gacha_hub.core.watcher import _pidfd_supported
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shell scripts as dummy games")
+
+BACKENDS = [False] + ([True] if _pidfd_supported() else [])
+
+@pytest.fixture
+def supervisor():
+    exits = []
+    done = threading.Event()
+    def on_exit(game_id, elapsed, returncode):
+        exits.append((game_id, elapsed, returncode))
+        done.set()
+    supervisor = ProcessSupervisor(on_exit=on_exit, poll_interval=0.05)
+    supervisor.exits = exits
+    supervisor.done = done
+    yield supervisor
+    supervisor.stop(timeout=5)
+
+@pytest.mark.parametrize("use_pidfd", BACKENDS)
+def test_exit_is_reported_and_reaped(supervisor, make_dummy_game, use_pidfd):
+    """Test that a game's exit code and session length are reported and the child reaped"""
+    # Without pidfds psutil.wait_procs reaps the child before the supervisor can
+    supervisor.watcher.use_pidfd = use_pidfd
+    game = {"id": 42, "type": "exe", "launch_target": make_dummy_game("sleep 0.2; exit 3")}
+    process = supervisor.launch(game)
+    assert supervisor.done.wait(5)
+    game_id, elapsed, returncode = supervisor.exits[0]
+    assert (game_id, returncode) == (42, 3)
+    assert 0.15 < elapsed < 5
+    assert supervisor.running_count == 0
+    with pytest.raises(ChildProcessError):
+        os.waitpid(process.pid, os.WNOHANG)
+
+def test_session_callback_receives_times(make_dummy_game):
+    """Test that finished sessions reach on_session_end, e.g. SessionLog.record_session"""
+    sessions = []
+    done = threading.Event()
+    supervisor = ProcessSupervisor(on_session_end=lambda *session: (sessions.append(session), done.set()),
+                                   poll_interval=0.05)
+    try:
+        supervisor.launch({"id": 7, "type": "exe", "launch_target": make_dummy_game("exit 0")})
+        assert done.wait(5)
+    finally:
+        supervisor.stop(timeout=5)
+    game_id, started_at, ended_at = sessions[0]
+    assert game_id == 7 and started_at <= ended_at
+
+def test_many_games_at_once(supervisor, make_dummy_game):
+    """Test that concurrently running games are all reported"""
+    exe = make_dummy_game("sleep 0.1")
+    for game_id in range(10):
+        supervisor.launch({"id": game_id, "type": "exe", "launch_target": exe})
+    for _ in range(100):
+        if len(supervisor.exits) == 10:
+            break
+        supervisor.done.wait(0.1)
+        supervisor.done.clear()
+    assert sorted(game_id for game_id, _, _ in supervisor.exits) == list(range(10))
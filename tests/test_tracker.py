@@ -0,0 +1,105 @@
+import subprocess
+import sys
+import threading
+import pytest
+from gacha_hub.core.tracker import GameTracker
+from gacha_hub.core.watcher import ProcessWatcher, _pidfd_supported
+
+BACKENDS = [False] + ([True] if _pidfd_supported() else [])
+
+def spawn_sleeper(seconds):
+    """Start a child process that exits after the given number of seconds"""
+    return subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({seconds})"])
+
+def test_reused_pid_is_not_running():
+    """Test that a PID with a different create time counts as exited"""
+    process = spawn_sleeper(5)
+    try:
+        tracker = GameTracker()
+        tracker.start_tracking(process.pid, game_id=1)
+        assert tracker.is_process_running(process.pid)
+        tracker.tracked_processes[process.pid]['create_time'] -= 100
+        assert not tracker.is_process_running(process.pid)
+    finally:
+        process.kill()
+        process.wait()
+
+@pytest.mark.parametrize("use_pidfd", BACKENDS)
+def test_watcher_reports_exits(use_pidfd):
+    """Test that every watched process reports its elapsed time on exit"""
+    results = {}
+    done = threading.Event()
+    processes = [spawn_sleeper(0.1 * (i % 3)) for i in range(6)]
+
+    def on_exit(pid, game_id, elapsed, returncode):
+        results[pid] = (game_id, elapsed)
+        if len(results) == len(processes):
+            done.set()
+
+    watcher = ProcessWatcher(on_exit=on_exit, poll_interval=0.05, use_pidfd=use_pidfd)
+    watcher.start()
+    try:
+        for game_id, process in enumerate(processes):
+            assert watcher.watch(process.pid, game_id)
+        assert done.wait(10)
+    finally:
+        watcher.stop(timeout=5)
+        for process in processes:
+            process.wait()
+
+    assert {game_id for game_id, _ in results.values()} == set(range(len(processes)))
+    assert all(elapsed >= 0 for _, elapsed in results.values())
+    assert watcher.watched_count == 0
+
+@pytest.mark.parametrize("use_pidfd", BACKENDS)
+def test_restart_keeps_watching_tracked_processes(use_pidfd):
+    """Test that a process watched before stop() still has its exit reported after start()"""
+    exits = []
+    done = threading.Event()
+    watcher = ProcessWatcher(on_exit=lambda *args: (exits.append(args), done.set()), poll_interval=0.05,
+                             use_pidfd=use_pidfd)
+    process = spawn_sleeper(0.5)
+    try:
+        watcher.start()
+        assert watcher.watch(process.pid, 3)
+        watcher.stop(timeout=5)
+        watcher.start()
+        assert done.wait(10)
+    finally:
+        watcher.stop(timeout=5)
+        process.wait()
+    assert [(pid, game_id) for pid, game_id, _, _ in exits] == [(process.pid, 3)]
+    assert watcher.watched_count == 0
+
+def test_watch_same_process_twice():
+    """Test that a process cannot be watched twice"""
+    process = spawn_sleeper(5)
+    watcher = ProcessWatcher()
+    try:
+        assert watcher.watch(process.pid, 1)
+        assert not watcher.watch(process.pid, 1)
+    finally:
+        process.kill()
+        process.wait()
+
+@pytest.mark.parametrize("use_pidfd", BACKENDS)
+def test_concurrent_start_and_stop(use_pidfd):
+    """Test that racing start() calls run one watcher thread and stop() closes its wake pipe"""
+    watcher = ProcessWatcher(poll_interval=0.05, use_pidfd=use_pidfd)
+    watcher_threads = lambda: sum(thread.name == "ProcessWatcher" for thread in threading.enumerate())
+    others = watcher_threads()  # e.g. left running by other tests
+    for _ in range(20):
+        barrier = threading.Barrier(8)
+        threads = [threading.Thread(target=lambda: (barrier.wait(), watcher.start())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert watcher_threads() == others + 1
+        stoppers = [threading.Thread(target=watcher.stop, args=(5,)) for _ in range(4)]
+        for thread in stoppers:
+            thread.start()
+        for thread in stoppers:
+            thread.join()
+        assert watcher._wake_r is None and watcher._wake_w is None
+    assert watcher_threads() == others
@@ -0,0 +1,22 @@
+import threading
+from gacha_hub.utils import DebouncedWriter, format_playtime
+
+def test_format_playtime():
+    assert format_playtime(59) == "0m"
+    assert format_playtime(3 * 3600 + 5 * 60) == "3h 5m"
+    # More than a day must not lose the full days
+    assert format_playtime(2 * 86400 + 3600 + 60) == "49h 1m"
+
+def test_debounced_writer_batches_items():
+    """Test that items submitted in quick succession are written together"""
+    batches = []
+    writer = DebouncedWriter(batches.append, delay=0.2)
+    threads = [threading.Thread(target=writer.submit, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.flush(timeout=5)
+    writer.close()
+    assert sorted(item for batch in batches for item in batch) == list(range(10))
+    assert len(batches) == 1